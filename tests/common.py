@@ -3,6 +3,8 @@
 import asyncio
 import datetime
 
+from zhaquirks.tasks import DEVICE_TASK_GROUPS
+
 ZCL_IAS_MOTION_COMMAND = b"\t!\x00\x01\x00\x00\x00\x00\x00"
 ZCL_OCC_ATTR_RPT_OCC = b"\x18d\n\x00\x00\x18\x01"
 
@@ -43,6 +45,10 @@ class MockDatetime(datetime.datetime):
 
 async def wait_for_zigpy_tasks() -> None:
     """Wait for all running zigpy tasks to finish."""
+    # tasks of quirks using a device task group
+    for group in list(DEVICE_TASK_GROUPS.values()):
+        await group.join()
+
     tasks = []
 
     for task in asyncio.all_tasks():
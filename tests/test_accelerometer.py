@@ -0,0 +1,166 @@
+"""Tests for the batched accelerometer stream."""
+
+import asyncio
+import math
+from unittest import mock
+
+import pytest
+
+from zhaquirks import accelerometer
+from zhaquirks.accelerometer import AccelerometerStream, tilt_angles
+import zhaquirks.smartthings.multi
+import zhaquirks.thirdreality.vibrate
+import zhaquirks.xiaomi.aqara.vibration_aq1
+
+zhaquirks.setup()
+
+SAMPLES = [(1000, 20, -980), (0, 0, 1024), (65, 1022, 3), (-512, 512, 512)]
+
+
+def _reference_angles(x, y, z):
+    return (
+        round(math.atan(x / math.sqrt(z * z + y * y)) * 180 / math.pi),
+        round(math.atan(y / math.sqrt(x * x + z * z)) * 180 / math.pi),
+        round(math.atan(z / math.sqrt(x * x + y * y)) * 180 / math.pi),
+    )
+
+
+def test_tilt_angles():
+    """Test the tilt angles match the per report computation."""
+    assert tilt_angles(SAMPLES[2:]) == [_reference_angles(*s) for s in SAMPLES[2:]]
+
+    # samples on an axis don't divide by zero
+    assert tilt_angles([(0, 0, 1024)]) == [(0, 0, 90)]
+
+
+def test_tilt_angles_numpy():
+    """Test the NumPy implementation matches the pure Python one."""
+    pytest.importorskip("numpy")
+
+    samples = SAMPLES * accelerometer.NUMPY_MIN_BATCH
+    assert accelerometer._tilt_angles_numpy(
+        samples
+    ) == accelerometer._tilt_angles_python(samples)
+
+
+async def test_accelerometer_stream():
+    """Test samples are summarized in batches."""
+    callback = mock.MagicMock()
+    stream = AccelerometerStream(callback, summary_interval=0.01, max_samples=3)
+
+    stream.append(*SAMPLES[2])
+    stream.append(*SAMPLES[3])
+    assert len(stream) == 2
+    assert callback.call_count == 0
+
+    await asyncio.sleep(0.02)
+    assert len(stream) == 0
+    assert callback.call_count == 1
+    assert callback.mock_calls[0].args[0] == {
+        "samples": 2,
+        "rawValueX": -512,
+        "rawValueY": 512,
+        "rawValueZ": 512,
+        "X": -35,
+        "Y": 35,
+        "Z": 35,
+        "min": {"X": -35, "Y": 35, "Z": 0},
+        "max": {"X": 4, "Y": 86, "Z": 35},
+    }
+
+    # a full buffer is flushed right away
+    for sample in SAMPLES[2:] * 2:
+        stream.append(*sample)
+    assert callback.call_count == 2
+    assert callback.mock_calls[1].args[0]["samples"] == 3
+    assert len(stream) == 1
+
+    stream.close()
+    assert len(stream) == 0
+    assert stream.flush() is None
+    assert stream.summaries_sent == 2
+
+
+async def test_vibration_aq1_orientation_stream(zigpy_device_from_quirk):
+    """Test orientation reports of the Aqara vibration sensor are batched."""
+    device = zigpy_device_from_quirk(zhaquirks.xiaomi.aqara.vibration_aq1.VibrationAQ1)
+    multistate_cluster = device.endpoints[1].multistate_input
+    motion_cluster = device.endpoints[1].ias_zone
+    motion_listener = mock.MagicMock()
+    motion_cluster.add_listener(motion_listener)
+
+    value = 1000 | 20 << 16 | 50 << 32
+
+    # one event per report by default
+    multistate_cluster.update_attribute(0x0508, value)
+    assert motion_listener.zha_send_event.mock_calls == [
+        mock.call(
+            "current_orientation",
+            {
+                "rawValueX": 1000,
+                "rawValueY": 20,
+                "rawValueZ": 50,
+                "X": 87,
+                "Y": 1,
+                "Z": 3,
+            },
+        )
+    ]
+
+    multistate_cluster.enable_stream(summary_interval=60, max_samples=4)
+    for _ in range(4):
+        multistate_cluster.update_attribute(0x0508, value)
+
+    assert len(motion_listener.zha_send_event.mock_calls) == 2
+    summary = motion_listener.zha_send_event.mock_calls[1].args[1]
+    assert summary["samples"] == 4
+    assert summary["min"] == summary["max"] == {"X": 87, "Y": 1, "Z": 3}
+
+    multistate_cluster.disable_stream()
+    assert multistate_cluster.stream is None
+
+
+@pytest.mark.parametrize(
+    "quirk, axes",
+    (
+        (zhaquirks.thirdreality.vibrate.Vibrate, (0x0001, 0x0002, 0x0003)),
+        (zhaquirks.smartthings.multi.SmartthingsMultiPurposeSensor, (18, 19, 20)),
+    ),
+)
+async def test_accelerometer_axis_stream(zigpy_device_from_quirk, quirk, axes):
+    """Test raw axis attributes are added to the stream once all three arrive."""
+    device = zigpy_device_from_quirk(quirk)
+    cluster = next(
+        cluster
+        for cluster in device.endpoints[1].in_clusters.values()
+        if isinstance(cluster, accelerometer.AccelerometerStreamCluster)
+    )
+    listener = mock.MagicMock()
+    cluster.add_listener(listener)
+
+    stream = cluster.enable_stream(summary_interval=0.01)
+    for sample in SAMPLES[2:]:
+        for axis, value in zip(axes, sample):
+            cluster.update_attribute(axis, value)
+
+    # the x axis of the next sample is kept until the others arrive
+    cluster.update_attribute(axes[0], 100)
+    assert len(stream) == 2
+
+    await asyncio.sleep(0.02)
+    assert listener.zha_send_event.mock_calls == [
+        mock.call(
+            accelerometer.ACCELERATION_SUMMARY,
+            {
+                "samples": 2,
+                "rawValueX": -512,
+                "rawValueY": 512,
+                "rawValueZ": 512,
+                "X": -35,
+                "Y": 35,
+                "Z": 35,
+                "min": {"X": -35, "Y": 35, "Z": 0},
+                "max": {"X": 4, "Y": 86, "Z": 35},
+            },
+        )
+    ]
@@ -0,0 +1,140 @@
+"""Tests for the multi-press detector."""
+
+import asyncio
+import time
+from unittest import mock
+
+import pytest
+from zigpy.zcl.foundation import ZCLHeader
+
+import zhaquirks
+from zhaquirks.multipress import MultiPressDetector
+from zhaquirks.philips.rwl022 import PhilipsRWL022
+
+zhaquirks.setup()
+
+
+@pytest.mark.parametrize("button_presses", (1, 2, 4))
+async def test_multi_press_without_pause(button_presses):
+    """Test presses without pause in between are counted as one sequence."""
+    loop = asyncio.get_running_loop()
+    cb = mock.MagicMock()
+    detector = MultiPressDetector(cb, press_threshold=0.01)
+
+    with mock.patch.object(loop, "call_at", wraps=loop.call_at) as call_at:
+        for i in range(button_presses):
+            detector.click(1, i)
+
+    # pressing again only moves the deadline of the pending timer
+    assert call_at.call_count == 1
+    assert len(detector) == 1
+
+    await asyncio.sleep(0.05)
+    cb.assert_called_once_with(1, button_presses, button_presses - 1)
+    assert len(detector) == 0
+
+
+@pytest.mark.parametrize("press_sequence", ((2, 3), (3, 1)))
+async def test_multi_press_with_pause(press_sequence):
+    """Test pauses in between presses start a new sequence."""
+    cb = mock.MagicMock()
+    detector = MultiPressDetector(cb, press_threshold=0.01)
+
+    for seq in press_sequence:
+        for _ in range(seq):
+            detector.click("on")
+        await asyncio.sleep(0.05)
+
+    assert cb.mock_calls == [mock.call("on", res, None) for res in press_sequence]
+    assert detector.sequences_reported == len(press_sequence)
+
+
+async def test_multi_press_buttons():
+    """Test buttons are counted separately and flushed at once."""
+    cb = mock.MagicMock()
+    detector = MultiPressDetector(cb, max_presses=3)
+
+    detector.click("on")
+    detector.click("off")
+    detector.click("on")
+    assert len(detector) == 2
+
+    detector.flush()
+    assert cb.mock_calls == [mock.call("on", 2, None), mock.call("off", 1, None)]
+    assert len(detector) == 0
+
+    # the sequence ends right away once the maximum is reached
+    for _ in range(3):
+        detector.click("on")
+    assert cb.mock_calls[-1] == mock.call("on", 3, None)
+
+    detector.click("off")
+    detector.cancel()
+    assert len(detector) == 0
+    assert cb.call_count == 3
+
+
+async def test_multi_press_hold():
+    """Test press and release of buttons reporting both."""
+    presses = mock.MagicMock()
+    hold = mock.MagicMock()
+    detector = MultiPressDetector(
+        presses, on_hold=hold, press_threshold=0.01, hold_threshold=0.02
+    )
+
+    # a quick press and release is a click
+    detector.press("on", "down")
+    assert detector.release("on", "up") is True
+    await asyncio.sleep(0.05)
+    assert presses.mock_calls == [mock.call("on", 1, "up")]
+    assert hold.call_count == 0
+
+    # a click followed by holding the button reports both
+    detector.press("on")
+    detector.release("on")
+    detector.press("on", "held")
+    await asyncio.sleep(0.05)
+    assert presses.mock_calls[-1] == mock.call("on", 1, "held")
+    assert hold.mock_calls == [mock.call("on", "held")]
+
+    # releasing a held button isn't a click
+    assert detector.release("on") is False
+    assert len(detector) == 0
+    assert presses.call_count == 2
+
+
+async def test_multi_press_many_remotes(zigpy_device_from_quirk, record_property):
+    """Benchmark many remotes being double pressed at once."""
+    remotes = 200
+    clusters = []
+    listener = mock.MagicMock()
+
+    for _ in range(remotes):
+        cluster = (
+            zigpy_device_from_quirk(PhilipsRWL022).endpoints[1].philips_remote_cluster
+        )
+        cluster.multi_press.press_threshold = 0.05
+        cluster.add_listener(listener)
+        clusters.append(cluster)
+
+    tasks = len(asyncio.all_tasks())
+    start = time.perf_counter()
+
+    for _ in range(2):
+        for cluster in clusters:
+            for button in (1, 4):
+                cluster.handle_cluster_request(ZCLHeader(), [button, 0, 0, 0, 0])
+                cluster.handle_cluster_request(ZCLHeader(), [button, 0, 2, 0, 0])
+
+    elapsed = time.perf_counter() - start
+    record_property("presses_per_second", 4 * remotes / elapsed)
+
+    # no task is created per press
+    assert len(asyncio.all_tasks()) == tasks
+
+    await asyncio.sleep(0.2)
+
+    actions = [call.args[0] for call in listener.zha_send_event.mock_calls]
+    assert actions.count("on_double_press") == remotes
+    assert actions.count("off_double_press") == remotes
+    assert all(len(cluster.multi_press) == 0 for cluster in clusters)
@@ -33,7 +33,7 @@ from zhaquirks.const import (
     TURN_ON,
 )
 import zhaquirks.philips
-from zhaquirks.philips import Button, ButtonPressQueue, PhilipsRemoteCluster, PressType
+from zhaquirks.philips import Button, PhilipsRemoteCluster, PressType
 from zhaquirks.philips.rdm002 import PhilipsRDM002
 from zhaquirks.philips.rom001 import PhilipsROM001
 from zhaquirks.philips.rwl022 import PhilipsRWL022
@@ -299,31 +299,6 @@ def test_generate_device_automation_triggers(cls, expected_value):
     assert cls.generate_device_automation_triggers() == expected_value
 
 
-class ManuallyFiredButtonPressQueue:
-    """Philips button queue to derive multiple press events."""
-
-    def __init__(self):
-        """Init."""
-        self.reset()
-
-    def fire(self):
-        """Fire the callback. Trigger after all inputs, before running assertions."""
-
-        if self._callback is not None:
-            self._callback(self._click_counter)
-
-    def reset(self):
-        """Reset the button press queue."""
-
-        self._click_counter = 0
-        self._callback = None
-
-    def press(self, callback):
-        """Process a button press."""
-        self._click_counter += 1
-        self._callback = callback
-
-
 @pytest.mark.parametrize(
     "dev, ep, button, events",
     (
@@ -359,7 +334,7 @@ class ManuallyFiredButtonPressQueue:
         ),
     ),
 )
-def test_PhilipsRemoteCluster_short_press(
+async def test_PhilipsRemoteCluster_short_press(
     zigpy_device_from_quirk, dev, ep, button, events
 ):
     """Test PhilipsRemoteCluster short button press logic."""
@@ -369,14 +344,10 @@ def test_PhilipsRemoteCluster_short_press(
     cluster = device.endpoints[ep].philips_remote_cluster
     listener = mock.MagicMock()
     cluster.add_listener(listener)
-    cluster.button_press_queue = {
-        k: ManuallyFiredButtonPressQueue() for k in cluster.BUTTONS
-    }
 
     cluster.handle_cluster_request(ZCLHeader(), [1, 0, 0, 0, 0])
     cluster.handle_cluster_request(ZCLHeader(), [1, 0, 2, 0, 0])
-    for q in cluster.button_press_queue.values():
-        q.fire()
+    cluster.multi_press.flush()
 
     assert listener.zha_send_event.call_count == 2
 
@@ -445,7 +416,7 @@ def test_PhilipsRemoteCluster_short_press(
         (5, "quintuple_press"),
     ),
 )
-def test_PhilipsRemoteCluster_multi_press(
+async def test_PhilipsRemoteCluster_multi_press(
     zigpy_device_from_quirk,
     dev,
     ep,
@@ -460,17 +431,13 @@ def test_PhilipsRemoteCluster_multi_press(
     cluster = device.endpoints[ep].philips_remote_cluster
     listener = mock.MagicMock()
     cluster.add_listener(listener)
-    cluster.button_press_queue = {
-        k: ManuallyFiredButtonPressQueue() for k in cluster.BUTTONS
-    }
 
     for _ in range(0, count):
         # btn1 short press
         cluster.handle_cluster_request(ZCLHeader(), [1, 0, 0, 0, 0])
         # btn1 short release
         cluster.handle_cluster_request(ZCLHeader(), [1, 0, 2, 0, 0])
-    for q in cluster.button_press_queue.values():
-        q.fire()
+    cluster.multi_press.flush()
 
     assert listener.zha_send_event.call_count == 1
     args_button_id = count + 2
@@ -560,7 +527,7 @@ def test_PhilipsRemoteCluster_ignore_unknown_buttons(zigpy_device_from_quirk, de
         (3),
     ),
 )
-def test_PhilipsRemoteCluster_long_press(
+async def test_PhilipsRemoteCluster_long_press(
     zigpy_device_from_quirk,
     dev,
     ep,
@@ -577,7 +544,6 @@ def test_PhilipsRemoteCluster_long_press(
     cluster = device.endpoints[ep].philips_remote_cluster
     listener = mock.MagicMock()
     cluster.add_listener(listener)
-    cluster.button_press_queue = ManuallyFiredButtonPressQueue()
 
     cluster.handle_cluster_request(ZCLHeader(), [1, 0, 0, 0, 0])
     for i in range(0, count):
@@ -586,7 +552,7 @@ def test_PhilipsRemoteCluster_long_press(
 
     # btn1 long release
     cluster.handle_cluster_request(ZCLHeader(), [1, 0, 3, 0, count * 40 + 10])
-    cluster.button_press_queue.fire()
+    cluster.multi_press.flush()
 
     assert listener.zha_send_event.call_count == count + 1
 
@@ -620,62 +586,6 @@ def test_PhilipsRemoteCluster_long_press(
     listener.zha_send_event.assert_has_calls(calls)
 
 
-@pytest.mark.parametrize(
-    "button_presses",
-    (
-        (1),
-        (2),
-        (4),
-    ),
-)
-async def test_ButtonPressQueue_presses_without_pause(button_presses):
-    """Test ButtonPressQueue presses without pause in between presses."""
-
-    q = ButtonPressQueue()
-    q._ms_threshold = 50
-    cb = mock.MagicMock()
-    for _ in range(button_presses):
-        q.press(cb)
-
-    # await cluster.button_press_queue._task
-    # Instead of awaiting the job, significantly extending the time
-    # these tests need, we just abort it and call the callback
-    # ourselves.
-    assert q._task is not None
-    q._task.cancel()
-    q._ms_last_click = 0
-    q._callback(q._click_counter)
-    cb.assert_called_once_with(button_presses)
-
-
-@pytest.mark.parametrize(
-    "press_sequence",
-    (
-        ((2, 3)),
-        ((3, 1)),
-    ),
-)
-async def test_ButtonPressQueue_presses_with_pause(press_sequence):
-    """Test ButtonPressQueue with pauses in between button press sequences."""
-
-    q = ButtonPressQueue()
-    q._ms_threshold = 50
-    cb = mock.MagicMock()
-
-    for seq in press_sequence:
-        for _ in range(seq):
-            q.press(cb)
-        await q._task
-
-    assert cb.call_count == len(press_sequence)
-
-    calls = []
-    for res in press_sequence:
-        calls.append(mock.call(res))
-
-    cb.assert_has_calls(calls)
-
-
 def test_rdm002_triggers():
     """Ensure RDM002 triggers won't break."""
 
@@ -766,7 +676,7 @@ def test_contact_sensor(zigpy_device_from_v2_quirk):
         ),
     ),
 )
-def test_PhilipsRemoteCluster_multi_button_press(
+async def test_PhilipsRemoteCluster_multi_button_press(
     zigpy_device_from_quirk, dev, ep, button_events, expected_actions
 ):
     """Test PhilipsRemoteCluster short button press logic."""
@@ -774,9 +684,6 @@ def test_PhilipsRemoteCluster_multi_button_press(
     device = zigpy_device_from_quirk(dev)
 
     remote_cluster = device.endpoints[ep].philips_remote_cluster
-    remote_cluster.button_press_queue = {
-        k: ManuallyFiredButtonPressQueue() for k in remote_cluster.BUTTONS
-    }
     remote_listener = mock.MagicMock()
     remote_cluster.add_listener(remote_listener)
 
@@ -787,8 +694,7 @@ def test_PhilipsRemoteCluster_multi_button_press(
             remote_cluster.handle_message(hdr, args)
             expected_event_count += 1
 
-    for q in remote_cluster.button_press_queue.values():
-        q.fire()
+    remote_cluster.multi_press.flush()
 
     assert remote_listener.zha_send_event.call_count == expected_event_count
 
@@ -0,0 +1,126 @@
+"""Tests for the device task groups."""
+
+import asyncio
+from unittest import mock
+
+import zhaquirks
+from zhaquirks.tasks import DeviceTaskGroup, get_device_task_group
+import zhaquirks.tuya.ts0601_switch
+
+zhaquirks.setup()
+
+
+async def test_device_task_group_concurrency():
+    """Test the number of concurrently running tasks is capped."""
+    group = DeviceTaskGroup(mock.sentinel.ieee, max_concurrency=2)
+    release = asyncio.Event()
+    running = []
+
+    async def job(i):
+        running.append(i)
+        await release.wait()
+        return i
+
+    tasks = [group.create_task(job(i)) for i in range(5)]
+    await asyncio.sleep(0)
+
+    assert running == [0, 1]
+    assert group.in_flight == 5
+    assert group.running == 2
+    assert group.waiting == 3
+
+    release.set()
+    await group.join()
+
+    assert running == [0, 1, 2, 3, 4]
+    assert [task.result() for task in tasks] == list(range(5))
+    assert group.in_flight == 0
+    assert group.started == group.completed == 5
+    assert group.queue_wait_max > 0
+    assert group.queue_wait_total >= group.queue_wait_max
+    assert group.run_time_total > 0
+
+
+async def test_device_task_group_cancel():
+    """Test cancelling running and waiting tasks."""
+    group = DeviceTaskGroup(mock.sentinel.ieee, max_concurrency=1)
+    started = mock.MagicMock()
+
+    async def job():
+        started()
+        await asyncio.sleep(10)
+
+    for _ in range(3):
+        group.create_task(job())
+    await asyncio.sleep(0)
+
+    group.cancel()
+    await group.join()
+
+    # the waiting coroutines are closed without ever running
+    assert started.call_count == 1
+    assert group.cancelled == 3
+    assert group.in_flight == 0
+
+
+async def test_device_task_group_cluster(zigpy_device_from_quirk, MockAppController):
+    """Test cluster tasks run in the task group of their device."""
+    device = zigpy_device_from_quirk(zhaquirks.tuya.ts0601_switch.TuyaSingleSwitchTI)
+    tuya_cluster = device.endpoints[1].tuya_manufacturer
+    group = get_device_task_group(device)
+    assert get_device_task_group(device) is group
+
+    async def failing():
+        raise RuntimeError("failed")
+
+    with mock.patch.object(tuya_cluster, "exception") as exception:
+        tuya_cluster.create_catching_task(failing())
+        assert group.in_flight == 1
+        await group.join()
+
+    # exceptions are still handled by the cluster
+    assert exception.call_count == 1
+    assert group.completed == 1
+
+    tuya_cluster.create_catching_task(asyncio.sleep(10))
+    await asyncio.sleep(0)
+    other_device = mock.MagicMock(ieee=mock.sentinel.other_ieee)
+    MockAppController.listener_event("device_removed", other_device)
+    assert group.in_flight == 1
+
+    # tasks are cancelled once the device is removed, without logging an error
+    with mock.patch.object(tuya_cluster, "exception") as exception:
+        MockAppController.listener_event("device_removed", device)
+        await group.join()
+    assert exception.call_count == 0
+    assert group.cancelled == 1
+    assert group not in [
+        listener for listener, _ in MockAppController._listeners.values()
+    ]
+    assert get_device_task_group(device) is not group
+
+
+async def test_device_task_group_device_replaced(
+    zigpy_device_from_quirk, MockAppController
+):
+    """Test the tasks of a device are cancelled once it is replaced."""
+    device = zigpy_device_from_quirk(zhaquirks.tuya.ts0601_switch.TuyaSingleSwitchTI)
+    group = get_device_task_group(device)
+    device.endpoints[1].tuya_manufacturer.create_catching_task(asyncio.sleep(10))
+    await asyncio.sleep(0)
+
+    # initialization of the device itself keeps the tasks
+    MockAppController.listener_event("device_initialized", device)
+    assert not group.closed
+
+    new_device = zigpy_device_from_quirk(
+        zhaquirks.tuya.ts0601_switch.TuyaSingleSwitchTI
+    )
+    MockAppController.listener_event("device_initialized", new_device)
+    await group.join()
+    assert group.closed
+    assert group.cancelled == 1
+    assert group not in [
+        listener for listener, _ in MockAppController._listeners.values()
+    ]
+    assert get_device_task_group(new_device) is not group
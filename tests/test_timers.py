@@ -0,0 +1,142 @@
+"""Tests for the shared timer wheel."""
+
+import asyncio
+import math
+from unittest import mock
+
+from zigpy.zcl.clusters.general import OnOff
+
+from tests.common import ClusterListener
+import zhaquirks
+from zhaquirks.const import COMMAND_CLICK, COMMAND_HOLD, ZONE_STATUS_CHANGE_COMMAND
+from zhaquirks.timers import TimerWheel, get_timer_wheel
+import zhaquirks.xiaomi.aqara.motion_aq2
+import zhaquirks.xiaomi.mija.sensor_switch
+
+zhaquirks.setup()
+
+
+async def test_timer_wheel_retrigger():
+    """Test rescheduling a timer only updates its deadline."""
+    loop = asyncio.get_running_loop()
+    wheel = TimerWheel(loop, resolution=0.01)
+    callback = mock.MagicMock()
+
+    with mock.patch.object(loop, "call_at", wraps=loop.call_at) as call_at:
+        for _ in range(100):
+            wheel.schedule("motion", 0.02, callback)
+
+    assert call_at.call_count == 1
+    assert len(wheel) == 1
+    assert "motion" in wheel
+
+    await asyncio.sleep(0.05)
+    assert callback.call_count == 1
+    assert len(wheel) == 0
+    assert wheel.expired == 1
+
+
+async def test_timer_wheel_batches():
+    """Test timers of the same slot expire together in deadline order."""
+    loop = asyncio.get_running_loop()
+    wheel = TimerWheel(loop, resolution=0.05)
+    fired = []
+
+    # schedule early in a slot, so all deadlines fall into the middle of the next one
+    start = math.floor(loop.time() / wheel.resolution) * wheel.resolution + 0.02
+
+    with (
+        mock.patch.object(loop, "time", return_value=start),
+        mock.patch.object(loop, "call_at", wraps=loop.call_at) as call_at,
+    ):
+        for key in range(10):
+            wheel.schedule(key, 0.05 - key / 1000, lambda key=key: fired.append(key))
+
+    assert call_at.call_count == 1
+    assert len(wheel) == 10
+
+    await asyncio.sleep(0.15)
+    assert fired == list(reversed(range(10)))
+    assert len(wheel) == 0
+
+
+async def test_timer_wheel_cancel():
+    """Test cancelled and moved timers don't fire."""
+    loop = asyncio.get_running_loop()
+    wheel = TimerWheel(loop, resolution=0.01)
+    callback = mock.MagicMock()
+
+    wheel.schedule("cancelled", 0.01, callback)
+    wheel.schedule("moved", 0.01, callback)
+    assert wheel.cancel("cancelled") is True
+    assert wheel.cancel("cancelled") is False
+    wheel.schedule("moved", 0.05, callback)
+
+    await asyncio.sleep(0.03)
+    assert callback.call_count == 0
+    assert len(wheel) == 1
+
+    await asyncio.sleep(0.05)
+    assert callback.call_count == 1
+
+
+async def test_timer_wheel_errors(caplog):
+    """Test a failing callback doesn't stop the others of the batch."""
+    wheel = TimerWheel(asyncio.get_running_loop())
+    callback = mock.MagicMock()
+
+    wheel.schedule("failing", 0, mock.MagicMock(side_effect=RuntimeError))
+    wheel.schedule("working", 0, callback)
+
+    # timers without a delay don't wait for the end of their slot
+    await asyncio.sleep(0.01)
+    assert callback.call_count == 1
+    assert "Error calling timer callback" in caplog.text
+
+
+async def test_timer_wheel_shared(zigpy_device_from_quirk):
+    """Test self resetting clusters share the timer wheel of the event loop."""
+    wheel = get_timer_wheel()
+    assert get_timer_wheel() is wheel
+
+    devices = [
+        zigpy_device_from_quirk(zhaquirks.xiaomi.aqara.motion_aq2.MotionAQ2)
+        for _ in range(5)
+    ]
+    listeners = []
+
+    for device in devices:
+        device.endpoints[1].ias_zone.reset_s = 0.01
+        device.endpoints[1].occupancy.reset_s = 0.01
+        listeners.append(ClusterListener(device.endpoints[1].ias_zone))
+        for _ in range(3):
+            device.endpoints[1].occupancy.update_attribute(0x0000, 1)
+
+    assert len(wheel) == 10
+
+    await asyncio.sleep(wheel.resolution + 0.1)
+    assert len(wheel) == 0
+    for listener in listeners:
+        assert [command[2][0] for command in listener.cluster_commands] == [1] * 3 + [0]
+        assert listener.cluster_commands[-1][1] == ZONE_STATUS_CHANGE_COMMAND
+
+
+async def test_mija_button_hold(zigpy_device_from_quirk):
+    """Test the hold timer of the Mija button."""
+    device = zigpy_device_from_quirk(zhaquirks.xiaomi.mija.sensor_switch.MijaButton)
+    on_off_cluster = device.endpoints[1].out_clusters[OnOff.cluster_id]
+    on_off_cluster.hold_duration = 0
+    listener = mock.MagicMock()
+    on_off_cluster.add_listener(listener)
+
+    # a short press is a single click
+    on_off_cluster.update_attribute(0x0000, 0)
+    on_off_cluster.update_attribute(0x0000, 1)
+    assert listener.zha_send_event.mock_calls == [
+        mock.call(COMMAND_CLICK, {"click_type": "single"})
+    ]
+
+    # a long press is a hold
+    on_off_cluster.update_attribute(0x0000, 0)
+    await asyncio.sleep(0.01)
+    assert listener.zha_send_event.mock_calls[-1] == mock.call(COMMAND_HOLD, [])
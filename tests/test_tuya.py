@@ -1,5 +1,6 @@
 """Tests for Tuya quirks."""
 
+import asyncio
 import base64
 import datetime
 import struct
@@ -1327,6 +1328,118 @@ async def test_moes(zigpy_device_from_quirk, quirk):
         datetime.datetime = origdatetime
 
 
+def test_moes_schedule_encoding():
+    """Test encoding and decoding Moes schedule datapoints."""
+    schedule_cls = zhaquirks.tuya.ts0601_trv.MoesSchedule
+    workday = zhaquirks.tuya.ts0601_trv.MOES_SCHEDULE_WORKDAY_ATTR
+    weekend = zhaquirks.tuya.ts0601_trv.MOES_SCHEDULE_WEEKEND_ATTR
+    # datapoint values are stored in reverse order of the payload
+    value = zhaquirks.tuya.ts0601_trv.data144(
+        reversed(ZCL_TUYA_VALVE_WORKDAY_SCHEDULE[9:])
+    )
+
+    points = schedule_cls.decode(workday, value)
+    assert len(points) == 18
+    assert points["workday_schedule_1_hour"] == 6
+    assert points["workday_schedule_5_temperature"] == 2000
+
+    schedule = schedule_cls(points)
+    assert schedule.encode(workday) == value
+
+    # current switch point indicator is ignored
+    value[17] |= 0x40
+    assert schedule_cls.decode(workday, value) == points
+
+    schedule = schedule_cls({**points, **schedule_cls.decode(weekend, value)})
+    assert schedule.diff(schedule.as_dict()) == {}
+    schedule["weekend_schedule_2_minute"] = 15
+    assert list(schedule.diff(points)) == [weekend]
+    with pytest.raises(KeyError):
+        schedule["weekend_schedule_7_hour"] = 1
+
+
+@pytest.mark.parametrize("quirk", (zhaquirks.tuya.ts0601_trv.MoesHY368_Type1,))
+async def test_moes_schedule_write(zigpy_device_from_quirk, quirk):
+    """Test writing only the changed Moes schedule datapoints."""
+
+    valve_dev = zigpy_device_from_quirk(quirk)
+    tuya_cluster = valve_dev.endpoints[1].tuya_manufacturer
+    thermostat_cluster = valve_dev.endpoints[1].thermostat
+
+    for frame in (ZCL_TUYA_VALVE_WORKDAY_SCHEDULE, ZCL_TUYA_VALVE_WEEKEND_SCHEDULE):
+        hdr, args = tuya_cluster.deserialize(frame)
+        tuya_cluster.handle_message(hdr, args)
+
+    with mock.patch.object(
+        tuya_cluster.endpoint, "request", return_value=foundation.Status.SUCCESS
+    ) as m1:
+        # several points of one program are sent in a single datapoint
+        (status,) = await thermostat_cluster.write_attributes(
+            {
+                "workday_schedule_1_temperature": 1700,
+                "workday_schedule_1_minute": 45,
+                "workday_schedule_1_hour": 5,
+                "weekend_schedule_1_hour": 6,
+            }
+        )
+        assert status == [
+            foundation.WriteAttributesStatusRecord(foundation.Status.SUCCESS)
+        ]
+        assert m1.call_count == 1
+        assert m1.call_args.kwargs["data"] == (
+            b"\x01\x01\x00\x00\x01\x70\x00\x00\x12\x05\x2d\x11\x08\x00\x0f"
+            b"\x0b\x1e\x0f\x0c\x1e\x0f\x11\x1e\x14\x16\x00\x0f"
+        )
+
+        # unchanged schedule is not sent
+        async with thermostat_cluster.edit_schedule() as schedule:
+            schedule["weekend_schedule_3_hour"] = 11
+        assert m1.call_count == 1
+
+        # both programs changed
+        async with thermostat_cluster.edit_schedule() as schedule:
+            schedule.update(
+                {"workday_schedule_6_hour": 23, "weekend_schedule_6_hour": 23}
+            )
+        assert m1.call_count == 3
+        assert [call.kwargs["data"][5] for call in m1.call_args_list[1:]] == [
+            0x70,
+            0x71,
+        ]
+
+        # mixed with other attributes
+        (status,) = await thermostat_cluster.write_attributes(
+            {"weekend_schedule_2_minute": 15, "operation_preset": 0x01}
+        )
+        assert status == [
+            foundation.WriteAttributesStatusRecord(foundation.Status.SUCCESS)
+        ]
+        assert [call.kwargs["data"][5] for call in m1.call_args_list[3:]] == [
+            0x71,
+            0x04,
+        ]
+
+        # attributes which cannot be mapped are reported in the same result
+        (status,) = await thermostat_cluster.write_attributes(
+            {"weekend_schedule_2_minute": 30, "occupied_cooling_setpoint": 2500}
+        )
+        assert status == [
+            foundation.WriteAttributesStatusRecord(
+                foundation.Status.FAILURE,
+                thermostat_cluster.attributes_by_name["occupied_cooling_setpoint"].id,
+            )
+        ]
+        assert m1.call_count == 6
+
+        # a failed request fails the schedule and the other attributes together
+        m1.side_effect = asyncio.TimeoutError
+        with pytest.raises(asyncio.TimeoutError):
+            await thermostat_cluster.write_attributes(
+                {"weekend_schedule_2_minute": 45, "operation_preset": 0x02}
+            )
+        assert m1.call_count == 7
+
+
 @pytest.mark.parametrize("quirk", (zhaquirks.tuya.ts0601_electric_heating.MoesBHT,))
 async def test_eheating_state_report(zigpy_device_from_quirk, quirk):
     """Test thermostatic valves standard reporting from incoming commands."""
@@ -1816,6 +1929,13 @@ async def test_ts1201_ir_blaster(zigpy_device_from_quirk):
             ("last_learned_ir_code",)
         )
         assert succ[0] == ir_code_to_learn
+        assert ts1201_transmit_cluster.transfer_stats.transfers == 1
+        assert ts1201_transmit_cluster.transfer_stats.bytes == 61
+        assert ts1201_transmit_cluster.transfer_stats.chunks == 2
+        # learned code is stored once in the library
+        assert len(ts1201_dev.learned_ir_codes) == 1
+        ts1201_dev.learned_ir_codes.add(ir_code_to_learn, "learned")
+        assert len(ts1201_dev.learned_ir_codes) == 1
 
         # test unknown attribute
         succ, fail = await ts1201_control_cluster.read_attributes(
@@ -1925,6 +2045,7 @@ async def test_ts1201_ir_blaster(zigpy_device_from_quirk):
             ts1201_transmit_listener.cluster_commands[7][2].command.name
             == "receive_ir_frame_04"
         )
+        assert not ts1201_dev.ir_msg_to_send
 
         # test raw data command
         rsp = await ts1201_control_cluster.command(
@@ -1955,6 +2076,150 @@ async def test_ts1201_ir_blaster(zigpy_device_from_quirk):
         )
 
 
+def test_ts1201_ir_checksum():
+    """Test the checksum of IR message parts."""
+    assert zhaquirks.tuya.ts1201.ir_checksum(b"") == 0
+    assert zhaquirks.tuya.ts1201.ir_checksum(b"\x01\x02\x03") == 6
+    assert zhaquirks.tuya.ts1201.ir_checksum(b"\xff\x02") == 1
+
+
+def test_ts1201_ir_receive_transfer_pipelined():
+    """Test reassembly of an IR code requested with a window of several parts."""
+    data = bytes(range(100))
+    transfer = zhaquirks.tuya.ts1201.ZosungIRReceiveTransfer(
+        seq=1, length=len(data), chunk_size=16, window=4, started=0.0
+    )
+
+    # part length is unknown until the first part has been received
+    assert transfer.next_positions() == [0]
+    assert transfer.next_positions() == []
+
+    # device sends less than requested
+    assert transfer.add_part(0, data[0:15]) == 15
+    assert transfer.next_positions() == [15, 30, 45, 60]
+
+    # out of order and a short part leaving a hole
+    assert transfer.add_part(30, data[30:45]) == 15
+    assert transfer.add_part(15, data[15:25]) == 10
+    assert transfer.next_positions() == [25, 75]
+    assert transfer.add_part(45, data[45:60]) == 15
+    assert transfer.add_part(60, data[60:75]) == 15
+    assert transfer.add_part(25, data[25:30]) == 5
+    # duplicate part
+    assert transfer.add_part(25, data[25:30]) == 0
+    assert transfer.next_positions() == [90]
+    assert transfer.add_part(75, data[75:90]) == 15
+    assert not transfer.complete
+    assert transfer.add_part(90, data[90:100]) == 10
+
+    assert transfer.complete
+    assert transfer.next_positions() == []
+    assert bytes(transfer.buffer) == data
+    assert transfer.chunks == 9
+
+
+def test_ts1201_ir_transfer_stats():
+    """Test IR transfer statistics."""
+    stats = zhaquirks.tuya.ts1201.ZosungIRTransferStats()
+    assert stats.rate is None
+
+    stats.add(100, 2, 0x38, 0.5)
+    stats.add(300, 6, 0x38, 1.5)
+    assert stats.transfers == 2
+    assert stats.chunks == 8
+    assert stats.rate == 200
+    assert stats.last_rate == 200
+    assert stats.last_chunk_size == 0x38
+
+
+def test_ts1201_ir_message_cache():
+    """Test the bounded cache of IR messages to send."""
+    cache = zhaquirks.tuya.ts1201.ZosungIRMessageCache(maxsize=3)
+    for seq in range(1, 4):
+        cache[seq] = b"msg%d" % seq
+    assert cache[1] == b"msg1"
+
+    cache[4] = b"msg4"
+    assert list(cache) == [3, 1, 4]
+    assert cache.get(2) is None
+    assert cache.get(3) == b"msg3"
+    assert list(cache) == [1, 4, 3]
+
+
+async def test_ts1201_ir_message_cache_lru(zigpy_device_from_quirk):
+    """Test IR messages requested by the device are kept as recently used."""
+    ts1201_dev = zigpy_device_from_quirk(zhaquirks.tuya.ts1201.ZosungIRBlaster)
+    ts1201_dev.ir_msg_to_send = zhaquirks.tuya.ts1201.ZosungIRMessageCache(maxsize=3)
+    for seq in range(1, 4):
+        ts1201_dev.ir_msg_to_send[seq] = b"msg%d" % seq
+
+    transmit_cluster = ts1201_dev.endpoints[1].zosung_irtransmit
+    with mock.patch.object(
+        transmit_cluster.endpoint, "request", return_value=foundation.Status.SUCCESS
+    ):
+        # device requests the first part of message 1
+        hdr, args = transmit_cluster.deserialize(b"\x11g\x02\x01\x00\x00\x00\x00\x00@")
+        transmit_cluster.handle_message(hdr, args)
+        await wait_for_zigpy_tasks()
+
+    ts1201_dev.ir_msg_to_send[4] = b"msg4"
+    assert list(ts1201_dev.ir_msg_to_send) == [3, 1, 4]
+
+
+def test_ts1201_ir_code_library():
+    """Test the learned IR code library."""
+    code1 = base64.b64encode(b"\x03\xf0\x04" * 20).decode()
+    code2 = base64.b64encode(b"\x07\x7c\x0f").decode()
+    code3 = base64.b64encode(b"\x01\x02").decode()
+
+    library = zhaquirks.tuya.ts1201.ZosungIRCodeLibrary(max_codes=2)
+    digest1 = library.add(code1, "tv_power")
+    assert library.add(code1, "tv_on") == digest1
+    assert len(library) == 1
+    assert library.size < 60
+    assert library.get("tv_power") == code1
+    assert library.get(digest1) == code1
+    assert library.names == {"tv_power": digest1, "tv_on": digest1}
+
+    # code is kept until no name refers to it
+    library.remove("tv_on")
+    assert "tv_power" in library
+    library.remove("tv_power")
+    assert digest1 not in library
+    assert library.get("tv_power") is None
+
+    # least recently used code is evicted with its names
+    library.add(code1, "tv_power")
+    library.add(code2, "amp_power")
+    assert library.get("tv_power") == code1
+    library.add(code3, "fan")
+    assert len(library) == 2
+    assert "amp_power" not in library
+    assert set(library.names) == {"tv_power", "fan"}
+
+    with pytest.raises(ValueError):
+        library.add("not base64!")
+
+
+async def test_ts1201_ir_send_learned_code(zigpy_device_from_quirk):
+    """Test sending learned IR codes by name and per device state."""
+    ts1201_dev = zigpy_device_from_quirk(zhaquirks.tuya.ts1201.ZosungIRBlaster)
+    other_dev = zigpy_device_from_quirk(zhaquirks.tuya.ts1201.ZosungIRBlaster)
+    code = "B3wPfA/5AcoH4AUDAeUDgAPAC+AHB+AHA+ADN+ALBw=="  # codespell:ignore
+    ts1201_dev.learned_ir_codes.add(code, "tv_power")
+
+    control_cluster = ts1201_dev.endpoints[1].zosung_ircontrol
+    with mock.patch.object(
+        control_cluster.endpoint, "request", return_value=foundation.Status.SUCCESS
+    ):
+        await control_cluster.command(0x0002, code="tv_power")
+        await wait_for_zigpy_tasks()
+
+    assert code.encode() in ts1201_dev.ir_msg_to_send[1]
+    assert not other_dev.ir_msg_to_send
+    assert "tv_power" not in other_dev.learned_ir_codes
+
+
 def test_ts601_door_sensor_signature(assert_signature_matches_quirk):
     """Test TS601 Vibration Door Sensor signature against quirk."""
     signature = {
@@ -2046,3 +2311,182 @@ async def test_ts601_door_sensor(
     attrs = await cluster.read_attributes(attributes=[attribute])
 
     assert attrs[0].get(attribute) == expected_value
+
+
+def _polled_plug(zigpy_device_from_quirk, scheduler, **kwargs):
+    """Create a TS011F plug polled by the given scheduler."""
+    plug = zigpy_device_from_quirk(zhaquirks.tuya.ts011f_plug.Plug, **kwargs)
+    em_cluster = plug.endpoints[1].electrical_measurement
+    em_cluster.poll_scheduler = scheduler
+    return plug, em_cluster
+
+
+@pytest.mark.parametrize(
+    "quirk, polled",
+    (
+        (zhaquirks.tuya.ts011f_plug.Plug, True),
+        (zhaquirks.tuya.ts011f_plug.Plug_TZ3210_1AC, True),
+        (zhaquirks.tuya.ts011f_plug.Plug_TZ3210_2AC, True),
+        (zhaquirks.tuya.ts011f_plug.Plug_4AC_2USB_Metering, True),
+        (zhaquirks.tuya.ts011f_plug.Plug_v2, False),
+        (zhaquirks.tuya.ts011f_plug.Plug_CB_Metering, False),
+    ),
+)
+def test_ts011f_plug_metering_poll_opt_in(zigpy_device_from_quirk, quirk, polled):
+    """Test only plugs which don't report are polled, without an event loop."""
+    plug = zigpy_device_from_quirk(quirk)
+    em_cluster = plug.endpoints[1].electrical_measurement
+    assert (
+        isinstance(em_cluster, zhaquirks.tuya.TuyaZBElectricalMeasurementPolled)
+        is polled
+    )
+    assert (
+        isinstance(
+            plug.endpoints[1].smartenergy_metering,
+            zhaquirks.tuya.TuyaZBMeteringClusterPolled,
+        )
+        is polled
+    )
+
+    scheduler = zhaquirks.tuya.TuyaMeteringPollScheduler()
+    em_cluster.poll_scheduler = scheduler
+    em_cluster._update_attribute(em_cluster.AttributeDefs.active_power.id, 10)
+    assert len(scheduler) == 0
+
+
+async def test_ts011f_plug_metering_poll_quirk(zigpy_device_from_quirk):
+    """Test a TS011F plug matching its signature is polled once bound."""
+    scheduler = zhaquirks.tuya.TuyaMeteringPollScheduler(jitter=0)
+    plug, em_cluster = _polled_plug(zigpy_device_from_quirk, scheduler)
+    metering_cluster = plug.endpoints[1].smartenergy_metering
+
+    with mock.patch("zigpy.zcl.Cluster.bind", return_value=[foundation.Status.SUCCESS]):
+        await em_cluster.bind()
+    state = scheduler.get_state(plug.ieee)
+    assert state.cluster is em_cluster
+
+    with mock.patch.object(plug.endpoints[1], "request", return_value=[[]]) as request:
+        await scheduler._read(state)
+    assert [call.kwargs["cluster"] for call in request.call_args_list] == [
+        em_cluster.cluster_id,
+        metering_cluster.cluster_id,
+    ]
+    assert state.polls == 1
+
+    # metering reports count as reports of the plug
+    metering_cluster._update_attribute(
+        metering_cluster.AttributeDefs.current_summ_delivered.id, 100
+    )
+    assert state.reports_since_poll == 1
+
+    scheduler.unregister(plug.ieee)
+
+
+async def test_ts011f_plug_metering_poll_start(zigpy_device_from_quirk):
+    """Test polling starts with the first attribute update or bind."""
+    scheduler = zhaquirks.tuya.TuyaMeteringPollScheduler(jitter=0)
+    plug, em_cluster = _polled_plug(zigpy_device_from_quirk, scheduler)
+    assert len(scheduler) == 0
+
+    em_cluster._update_attribute(em_cluster.AttributeDefs.active_power.id, 10)
+    state = scheduler.get_state(plug.ieee)
+    assert state.cluster is em_cluster
+    assert state.reports_since_poll == 0
+    assert state.timer_handle is not None
+
+    with mock.patch("zigpy.zcl.Cluster.bind", return_value=[foundation.Status.SUCCESS]):
+        await em_cluster.bind()
+    assert scheduler.get_state(plug.ieee) is state
+
+    scheduler.unregister(plug.ieee)
+    other, em_cluster = _polled_plug(
+        zigpy_device_from_quirk,
+        scheduler,
+        ieee=t.EUI64.convert("00:00:00:00:00:00:00:09"),
+    )
+    with mock.patch("zigpy.zcl.Cluster.bind", return_value=[foundation.Status.SUCCESS]):
+        await em_cluster.bind()
+    assert scheduler.get_state(other.ieee).cluster is em_cluster
+    scheduler.unregister(other.ieee)
+
+
+async def test_ts011f_plug_metering_poll(zigpy_device_from_quirk):
+    """Test adaptive polling of TS011F plug measurements."""
+    scheduler = zhaquirks.tuya.TuyaMeteringPollScheduler(
+        min_interval=10, max_interval=80, jitter=0, power_threshold=5
+    )
+    plug, em_cluster = _polled_plug(zigpy_device_from_quirk, scheduler)
+    metering_cluster = plug.endpoints[1].smartenergy_metering
+    state = scheduler.register(em_cluster)
+    assert len(scheduler) == 1
+    assert state.interval == 10
+
+    powers = iter((100, 200, 202, 202, 202, 202, 150))
+
+    async def read_power(attributes, allow_cache=False):
+        em_cluster._update_attribute(
+            em_cluster.AttributeDefs.active_power.id, next(powers)
+        )
+        return {}, {}
+
+    with (
+        mock.patch.object(
+            em_cluster, "read_attributes", side_effect=read_power
+        ) as em_read,
+        mock.patch.object(
+            metering_cluster, "read_attributes", return_value=({}, {})
+        ) as metering_read,
+    ):
+        intervals = []
+        for _ in range(7):
+            await scheduler._read(state)
+            intervals.append(state.interval)
+
+        # all attributes of a cluster are read at once
+        assert em_read.call_args.args[0] == (
+            "active_power",
+            "rms_current",
+            "rms_voltage",
+        )
+        assert metering_read.call_args.args[0] == ("current_summ_delivered",)
+        assert em_read.call_count == metering_read.call_count == state.polls == 7
+
+        # fast while power changes, backing off while it's stable
+        assert intervals == [10, 10, 20, 40, 80, 80, 10]
+
+        # plugs reporting on their own are polled rarely
+        em_cluster._update_attribute(em_cluster.AttributeDefs.active_power.id, 10)
+        assert state.reports_since_poll == 1
+        powers = iter((10,))
+        await scheduler._read(state)
+        assert state.interval == 80
+
+    scheduler.unregister(plug.ieee)
+    assert len(scheduler) == 0
+    assert state.timer_handle is None
+
+
+async def test_ts011f_plug_metering_poll_rate_limit(zigpy_device_from_quirk):
+    """Test polls of all plugs are spread out."""
+    scheduler = zhaquirks.tuya.TuyaMeteringPollScheduler(
+        min_interval=10, jitter=0, max_polls_per_second=10
+    )
+    states = []
+    for i in range(3):
+        _, em_cluster = _polled_plug(
+            zigpy_device_from_quirk,
+            scheduler,
+            ieee=t.EUI64.convert(f"00:00:00:00:00:00:00:0{i}"),
+        )
+        states.append(scheduler.register(em_cluster))
+
+    for state in states:
+        state.timer_handle.cancel()
+        scheduler._poll(state)
+
+    whens = [state.timer_handle.when() for state in states]
+    assert whens[1] - whens[0] == pytest.approx(0.1, abs=0.01)
+    assert whens[2] - whens[1] == pytest.approx(0.1, abs=0.01)
+
+    for state in states:
+        scheduler.unregister(state.cluster.endpoint.device.ieee)
@@ -1,5 +1,6 @@
 """Tests for TuyaQuirkBuilder."""
 
+import asyncio
 import datetime
 from unittest import mock
 
@@ -16,6 +17,11 @@ from zhaquirks.const import BatterySize
 from zhaquirks.tuya import (
     TUYA_QUERY_DATA,
     TUYA_SET_TIME,
+    TuyaCommand,
+    TuyaData,
+    TuyaDatapointData,
+    TuyaDataQueryScheduler,
+    TuyaManufCluster,
     TuyaPowerConfigurationCluster,
     TuyaPowerConfigurationCluster2AAA,
 )
@@ -395,3 +401,196 @@ async def test_tuya_quirkbuilder_force(device_mock, force):
         assert isinstance(ep.tuya_manufacturer, TuyaMCUCluster)
     else:
         assert not hasattr(ep, "tuya_manufacturer")
+
+
+async def test_tuya_data_query_refresh(device_mock):
+    """Test the adaptive data query refresh of enchanted Tuya devices."""
+
+    registry = DeviceRegistry()
+
+    (
+        TuyaQuirkBuilder(device_mock.manufacturer, device_mock.model, registry=registry)
+        .tuya_battery(dp_id=1)
+        .tuya_enchantment(data_query_refresh=True)
+        .skip_configuration()
+        .add_to_registry()
+    )
+
+    scheduler = TuyaDataQueryScheduler(
+        min_interval=10,
+        max_interval=40,
+        initial_interval=20,
+        jitter=0,
+        max_queries_per_second=1000,
+    )
+    with mock.patch("zhaquirks.tuya.TUYA_DATA_QUERY_SCHEDULER", scheduler):
+        quirked = registry.get_device(device_mock)
+    device_mock.application.devices[quirked.ieee] = quirked
+    tuya_cluster = quirked.endpoints[1].tuya_manufacturer
+
+    # refreshing starts once the device is configured, not when it's created
+    assert len(scheduler) == 0
+    with (
+        mock.patch("zhaquirks.tuya.TUYA_DATA_QUERY_SCHEDULER", scheduler),
+        mock.patch.object(quirked, "spell_attribute_reads", mock.AsyncMock()),
+    ):
+        await quirked.apply_custom_configuration()
+
+    state = scheduler.get_state(quirked.ieee)
+    assert len(scheduler) == 1
+    assert state.cluster is tuya_cluster
+    assert state.interval == 20
+    assert state.next_refresh is not None
+    assert state.last_report is None
+
+    request_patch = mock.patch("zigpy.zcl.Cluster.request", mock.AsyncMock())
+    with (
+        mock.patch("zhaquirks.tuya.TUYA_DATA_QUERY_SCHEDULER", scheduler),
+        request_patch as request_mock,
+    ):
+        # the device keeps reporting, so the interval grows up to the maximum
+        tuya_cluster.handle_get_data(
+            TuyaCommand(
+                status=0, tsn=1, datapoints=[TuyaDatapointData(1, TuyaData(50))]
+            )
+        )
+        assert state.last_report is not None
+        state.timer_handle.cancel()
+        scheduler._refresh(state)
+        await wait_for_zigpy_tasks()
+        assert state.interval == 40
+        assert state.last_refresh is not None
+        assert request_mock.call_count == 1
+        assert request_mock.mock_calls[0][1][1] == TUYA_QUERY_DATA
+
+        # the reply to the query isn't a report of the device
+        tuya_cluster.handle_get_data(
+            TuyaCommand(
+                status=0, tsn=2, datapoints=[TuyaDatapointData(1, TuyaData(50))]
+            )
+        )
+        assert state.reports_since_refresh == 0
+
+        # neither are acknowledgements of writes
+        state.query_sent -= scheduler.query_reply_window
+        tuya_cluster.handle_set_data_response(
+            TuyaCommand(
+                status=0, tsn=3, datapoints=[TuyaDatapointData(1, TuyaData(50))]
+            )
+        )
+        assert state.reports_since_refresh == 0
+
+        tuya_cluster.handle_get_data(
+            TuyaCommand(
+                status=0, tsn=2, datapoints=[TuyaDatapointData(1, TuyaData(50))]
+            )
+        )
+        state.timer_handle.cancel()
+        scheduler._refresh(state)
+        assert state.interval == 40
+
+        # the device went quiet, so the interval shrinks down to the minimum
+        for interval in (20, 10, 10):
+            state.timer_handle.cancel()
+            scheduler._refresh(state)
+            assert state.interval == interval
+        # rate limited queries are sent with a small delay
+        await asyncio.sleep(0.01)
+        await wait_for_zigpy_tasks()
+        assert request_mock.call_count == 5
+
+    # removed devices are no longer refreshed
+    del device_mock.application.devices[quirked.ieee]
+    state.timer_handle.cancel()
+    scheduler._refresh(state)
+    assert scheduler.get_state(quirked.ieee) is None
+
+
+def test_tuya_data_query_refresh_first_report(device_mock):
+    """Test the refresh starts with the first report, devices are built without a loop."""
+
+    registry = DeviceRegistry()
+
+    (
+        TuyaQuirkBuilder(device_mock.manufacturer, device_mock.model, registry=registry)
+        .tuya_battery(dp_id=1)
+        .tuya_enchantment(data_query_refresh=True)
+        .skip_configuration()
+        .add_to_registry()
+    )
+
+    scheduler = TuyaDataQueryScheduler()
+    with mock.patch("zhaquirks.tuya.TUYA_DATA_QUERY_SCHEDULER", scheduler):
+        quirked = registry.get_device(device_mock)
+        assert len(scheduler) == 0
+
+        async def report():
+            quirked.endpoints[1].tuya_manufacturer.handle_get_data(
+                TuyaCommand(
+                    status=0, tsn=1, datapoints=[TuyaDatapointData(1, TuyaData(50))]
+                )
+            )
+            state = scheduler.get_state(quirked.ieee)
+            scheduler.unregister(quirked.ieee)
+            return state
+
+        state = asyncio.run(report())
+
+    assert state.cluster is quirked.endpoints[1].tuya_manufacturer
+    assert state.reports_since_refresh == 0
+
+
+async def test_tuya_data_query_refresh_other_cluster(device_mock):
+    """Test configuring the refresh ignores devices without the new Tuya cluster."""
+
+    registry = DeviceRegistry()
+
+    (
+        TuyaQuirkBuilder(device_mock.manufacturer, device_mock.model, registry=registry)
+        .tuya_battery(dp_id=1)
+        .tuya_enchantment(data_query_refresh=True)
+        .skip_configuration()
+        .add_to_registry()
+    )
+
+    scheduler = TuyaDataQueryScheduler()
+    quirked = registry.get_device(device_mock)
+    endpoint = quirked.endpoints[1]
+    endpoint.add_input_cluster(
+        TuyaManufCluster.cluster_id, TuyaManufCluster(endpoint, is_server=True)
+    )
+    with (
+        mock.patch("zhaquirks.tuya.TUYA_DATA_QUERY_SCHEDULER", scheduler),
+        mock.patch.object(quirked, "spell_attribute_reads", mock.AsyncMock()),
+    ):
+        await quirked.apply_custom_configuration()
+
+    assert len(scheduler) == 0
+
+
+async def test_tuya_data_query_refresh_rate_limit(device_mock):
+    """Test that data queries are spread out across devices."""
+
+    scheduler = TuyaDataQueryScheduler(jitter=0, max_queries_per_second=10)
+    clusters = []
+    for i in range(3):
+        cluster = mock.MagicMock()
+        cluster.endpoint.device.ieee = t.EUI64(i.to_bytes(8, "little"))
+        cluster.endpoint.device.application.devices = {
+            cluster.endpoint.device.ieee: cluster.endpoint.device
+        }
+        clusters.append(cluster)
+        scheduler.register(cluster)
+
+    with mock.patch("asyncio.BaseEventLoop.call_later") as call_later:
+        for cluster in clusters:
+            scheduler._refresh(scheduler.get_state(cluster.endpoint.device.ieee))
+
+    # the first query is sent right away, the others are delayed
+    assert clusters[0].create_catching_task.call_count == 1
+    delayed = [c for c in call_later.mock_calls if c[1][1] == scheduler._send]
+    assert [round(c[1][0], 1) for c in delayed] == [0.1, 0.2]
+
+    for cluster in clusters:
+        scheduler.unregister(cluster.endpoint.device.ieee)
+    assert len(scheduler) == 0
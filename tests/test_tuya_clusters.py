@@ -14,6 +14,7 @@ from zhaquirks.tuya import (
     TuyaCommand,
     TuyaData,
     TuyaDatapointData,
+    TuyaDPType,
     TuyaNewManufCluster,
 )
 
@@ -291,3 +292,59 @@ def test_tuya_cluster_request_no_handler(default_rsp_mock, TuyaCluster):
 
     assert default_rsp_mock.call_count == 1
     assert default_rsp_mock.call_args[1]["status"] == zcl_f.Status.UNSUP_CLUSTER_COMMAND
+
+
+def _tuya_data(dp_type: TuyaDPType, raw: bytes) -> TuyaData:
+    """Build a TuyaData from its raw payload."""
+    return TuyaData.deserialize(bytes([dp_type, 0, len(raw)]) + raw)[0]
+
+
+def test_tuya_unknown_datapoint_stats(TuyaCluster):
+    """Test statistics collected for datapoints without a handler."""
+
+    assert len(TuyaCluster.unknown_datapoints) == 0
+
+    for raw in (b"\x00\x00\x00\x01", b"\x00\x00\x00\x02"):
+        command = TuyaCommand(
+            status=0,
+            tsn=2,
+            datapoints=[
+                TuyaDatapointData(0x65, _tuya_data(TuyaDPType.VALUE, raw)),
+                TuyaDatapointData(0x66, _tuya_data(TuyaDPType.RAW, raw[:3])),
+            ],
+        )
+        status = TuyaCluster.handle_get_data(command)
+        assert status == zcl_f.Status.UNSUPPORTED_ATTRIBUTE
+
+    assert len(TuyaCluster.unknown_datapoints) == 2
+    assert 0x65 in TuyaCluster.unknown_datapoints
+
+    stats = TuyaCluster.unknown_datapoints.get(0x65)
+    assert stats.count == 2
+    assert stats.dp_type == TuyaDPType.VALUE
+    assert stats.raw_lengths == {4: 2}
+    assert stats.last_raw == b"\x00\x00\x00\x02"
+    assert stats.last_seen is not None
+
+    dump = TuyaCluster.unknown_datapoints.as_dict()
+    assert dump[0x66]["dp_type"] == "RAW"
+    assert dump[0x66]["raw_lengths"] == {3: 2}
+    assert dump[0x66]["last_raw"] == "000000"
+
+    TuyaCluster.unknown_datapoints.clear()
+    assert len(TuyaCluster.unknown_datapoints) == 0
+
+
+def test_tuya_unknown_datapoint_stats_bounded(TuyaCluster):
+    """Test that the tracked raw lengths of unknown datapoints are bounded."""
+
+    max_lengths = TuyaCluster.unknown_datapoints.MAX_RAW_LENGTHS
+    for length in range(max_lengths + 3):
+        TuyaCluster.unknown_datapoints.record(
+            TuyaDatapointData(0x70, _tuya_data(TuyaDPType.RAW, b"\x00" * length))
+        )
+
+    stats = TuyaCluster.unknown_datapoints.get(0x70)
+    assert stats.count == max_lengths + 3
+    assert len(stats.raw_lengths) == max_lengths
+    assert stats.raw_lengths_overflow == 3
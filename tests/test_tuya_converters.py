@@ -0,0 +1,114 @@
+"""Tests for the declarative Tuya converters."""
+
+import pytest
+
+from zhaquirks.tuya import PowerOnState
+from zhaquirks.tuya.converters import (
+    Bitmask,
+    Chain,
+    Clamp,
+    Divide,
+    EnumMap,
+    Log10,
+    Scale,
+    TuyaConverter,
+)
+from zhaquirks.tuya.mcu import LEVEL_CONVERTER, TuyaLevelControlManufCluster
+
+
+@pytest.mark.parametrize(
+    "converter,value,expected",
+    [
+        (Scale(2), 50, 100),
+        (Scale(10, 5), 3, 35),
+        (Divide(10), 123, 12),
+        (LEVEL_CONVERTER, 1000, 255),
+        (LEVEL_CONVERTER, 500, 127),
+        (EnumMap(PowerOnState), 1, PowerOnState.On),
+        (EnumMap({0: "off", 1: "on"}), 1, "on"),
+        (Clamp(0, 100), 120, 100),
+        (Clamp(0, 100), -5, 0),
+        (Clamp(0, 100), 42, 42),
+        (Log10(), 0, 0),
+        (Log10(), 1000, 30001),
+        (Bitmask(0xF0, 4), 0xAB, 0x0A),
+        (Bitmask(0x0F), 0xAB, 0x0B),
+    ],
+)
+def test_converters(converter, value, expected):
+    """Test converting values."""
+    assert converter(value) == expected
+    assert converter.func(value) == expected
+
+
+@pytest.mark.parametrize(
+    "converter,value",
+    [
+        (Scale(10, 5), 35),
+        (LEVEL_CONVERTER, 1000),
+        (EnumMap(PowerOnState), PowerOnState.LastState),
+        (EnumMap({0: "off", 1: "on"}), 0),
+        (Clamp(0, 100), 50),
+        (Log10(), 1000),
+        (Bitmask(0xF0, 4), 0xA0),
+        (Chain((Scale(2), Clamp(0, 100))), 30),
+    ],
+)
+def test_converters_inverse(converter, value):
+    """Test that the inverse converter restores the original value."""
+    assert converter.inverse(converter(value)) == pytest.approx(value)
+    assert converter.inverse.inverse == converter
+
+
+def test_converter_chain():
+    """Test chaining converters."""
+    converter = Scale(2).then(Clamp(0, 100)).then(Divide(10))
+    assert isinstance(converter, Chain)
+    assert len(converter.converters) == 3
+    assert converter(30) == 6
+    assert converter(80) == 10
+
+    assert converter.metadata == {
+        "converter": "chain",
+        "converters": [
+            {"converter": "scale", "factor": 2, "offset": 0},
+            {"converter": "clamp", "minimum": 0, "maximum": 100},
+            {"converter": "divide", "divisor": 10, "multiplier": 1},
+        ],
+    }
+
+
+def test_converter_metadata():
+    """Test converter metadata."""
+    assert LEVEL_CONVERTER.metadata == {
+        "converter": "divide",
+        "divisor": 1000,
+        "multiplier": 255,
+    }
+    assert LEVEL_CONVERTER.inverse.metadata == {
+        "converter": "divide",
+        "divisor": 255,
+        "multiplier": 1000,
+    }
+    assert Log10().inverse.metadata["converter"] == "exp10"
+
+
+def test_converter_abstract():
+    """Test converters have to implement the conversion and its inverse."""
+
+    class Incomplete(TuyaConverter):
+        def _compile(self):
+            return lambda x: x
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_converter_mapping():
+    """Test mappings keep the converters, so they can be inspected."""
+    mapping = TuyaLevelControlManufCluster.dp_to_attribute[2]
+    assert isinstance(mapping.converter, TuyaConverter)
+    assert mapping.dp_converter == mapping.converter.inverse
+    assert mapping.converter.metadata["converter"] == LEVEL_CONVERTER.name
+    assert mapping.converter(1000) == 255
+    assert mapping.dp_converter(255) == 1000
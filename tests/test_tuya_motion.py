@@ -166,3 +166,101 @@ async def test_tuya_motion_quirk_enum_illum(
     assert len(illum_listener.attribute_updates) == 1
     assert illum_listener.attribute_updates[0][0] == zcl_illum_id
     assert illum_listener.attribute_updates[0][1] == exp_value
+
+
+def test_tuya_radar_stream():
+    """Test the radar target ring buffer."""
+    stream = zhaquirks.tuya.tuya_motion.TuyaRadarStream(capacity=4)
+    assert len(stream) == 0
+    assert stream.latest is None
+    assert stream.min_distance() is None
+    assert stream.dwell_time(1) == 0
+
+    for timestamp, distance, state in (
+        (0, 3.0, 0),
+        (1, 2.5, 1),
+        (3, 1.0, 1),
+        (4, 2.0, 2),
+        (6, 4.0, 0),
+    ):
+        stream.append(timestamp, distance, state)
+
+    # oldest sample has been overwritten
+    assert len(stream) == 4
+    assert [sample.timestamp for sample in stream.samples()] == [1, 3, 4, 6]
+    assert stream.latest == (6, 4.0, 0)
+    assert stream.min_distance() == 1.0
+    assert stream.max_distance() == 4.0
+    assert stream.max_distance(since=3) == 4.0
+    assert stream.min_distance(since=4) == 2.0
+    assert stream.dwell_time(1) == 3
+    assert stream.dwell_time(2) == 2
+    assert stream.dwell_time(0, until=10) == 4
+    assert stream.dwell_time(1, since=3) == 1
+
+    stream.clear()
+    assert stream.samples() == []
+
+
+async def test_tuya_radar_stream_subscribe():
+    """Test iterating over new radar samples."""
+    stream = zhaquirks.tuya.tuya_motion.TuyaRadarStream(capacity=8)
+    subscription = stream.subscribe(maxsize=2)
+
+    for i in range(3):
+        stream.append(i, float(i), 1)
+    subscription.close()
+    stream.append(3, 3.0, 1)
+
+    samples = [sample async for sample in subscription]
+    # oldest sample was dropped, consumer was too slow
+    assert [sample.timestamp for sample in samples] == [2]
+    assert subscription.dropped == 2
+
+
+async def test_tuya_radar_stream_cluster(zigpy_device_from_v2_quirk):
+    """Test recording radar samples and limiting distance updates."""
+    quirked_device = zigpy_device_from_v2_quirk("_TZE200_ya4ft0w4", "TS0601")
+    ep = quirked_device.endpoints[1]
+    manuf_cluster = ep.tuya_manufacturer
+    assert isinstance(manuf_cluster, zhaquirks.tuya.tuya_motion.TuyaRadarMCUCluster)
+
+    manuf_listener = ClusterListener(manuf_cluster)
+    occupancy_listener = ClusterListener(ep.occupancy)
+
+    def distance_msg(distance: int) -> bytes:
+        return b"\tL\x01\x00\x05\x09\x02\x00\x04" + distance.to_bytes(4, "big")
+
+    def send(msg: bytes) -> None:
+        hdr, data = manuf_cluster.deserialize(msg)
+        manuf_cluster.handle_get_data(data.data)
+
+    # without the stream, every report updates the attribute
+    send(distance_msg(150))
+    send(distance_msg(160))
+    assert len(manuf_listener.attribute_updates) == 2
+    manuf_listener.attribute_updates.clear()
+
+    stream = manuf_cluster.enable_stream(capacity=16, attribute_interval=0.05)
+    send(ZCL_TUYA_MOTION)
+    for distance in (150, 140, 130):
+        send(distance_msg(distance))
+
+    assert len(occupancy_listener.attribute_updates) == 1
+    assert manuf_listener.attribute_updates == [(0xEF09, 150)]
+    assert [(sample.distance, sample.state) for sample in stream.samples()] == [
+        (160, 1),
+        (150, 1),
+        (140, 1),
+        (130, 1),
+    ]
+    assert stream.min_distance() == 130
+
+    # last skipped distance is reported once the interval has passed
+    await asyncio.sleep(0.1)
+    assert manuf_listener.attribute_updates == [(0xEF09, 150), (0xEF09, 130)]
+
+    manuf_cluster.disable_stream()
+    send(distance_msg(120))
+    assert manuf_listener.attribute_updates[-1] == (0xEF09, 120)
+    assert len(stream) == 4
@@ -1,12 +1,13 @@
 """Tests for Tuya Sensor quirks."""
 
 import pytest
+import zigpy.types as t
 from zigpy.zcl import foundation
 from zigpy.zcl.clusters.general import Basic, PowerConfiguration
 from zigpy.zcl.clusters.measurement import RelativeHumidity, TemperatureMeasurement
 
 import zhaquirks
-from zhaquirks.tuya import TuyaLocalCluster
+from zhaquirks.tuya import TuyaLocalCluster, _valid_attribute_ids
 from zhaquirks.tuya.mcu import TuyaMCUCluster
 
 # Temp DP 1, Humidity DP 2, Battery DP 3
@@ -170,3 +171,32 @@ def test_valid_attributes(zigpy_device_from_v2_quirk):
     assert {temperature_attr_id} == temperature_cluster._VALID_ATTRIBUTES
     assert {humidity_attr_id} == humidity_cluster._VALID_ATTRIBUTES
     assert {power_attr_id} == power_config_cluster._VALID_ATTRIBUTES
+
+
+def test_valid_attributes_cached_per_class(zigpy_device_from_v2_quirk):
+    """Test that valid attributes are resolved once per class across many devices."""
+    quirked = zigpy_device_from_v2_quirk("_TZE200_bjawzodf", "TS0601")
+    tuya_cluster_cls = type(quirked.endpoints[1].tuya_manufacturer)
+    targets_cache = tuya_cluster_cls.__dict__["_valid_attribute_targets_cache"]
+    misses = _valid_attribute_ids.cache_info().misses
+
+    devices = [
+        zigpy_device_from_v2_quirk(
+            "_TZE200_bjawzodf", "TS0601", ieee=t.EUI64(i.to_bytes(8, "little"))
+        )
+        for i in range(1, 501)
+    ]
+
+    # the class-level grouping and attribute id resolution are not redone
+    assert tuya_cluster_cls.__dict__["_valid_attribute_targets_cache"] is targets_cache
+    assert _valid_attribute_ids.cache_info().misses == misses
+
+    # but every device still gets its own per-instance valid attributes
+    for device in devices:
+        ep = device.endpoints[1]
+        assert {
+            TemperatureMeasurement.AttributeDefs.measured_value.id
+        } == ep.temperature._VALID_ATTRIBUTES
+        assert ep.temperature._VALID_ATTRIBUTES is not (
+            quirked.endpoints[1].temperature._VALID_ATTRIBUTES
+        )
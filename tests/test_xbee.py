@@ -1,5 +1,7 @@
 """Test XBee device."""
 
+import asyncio
+import time
 from unittest import mock
 
 import pytest
@@ -17,7 +19,10 @@ from zhaquirks.xbee import (
     XBEE_DATA_ENDPOINT,
     XBEE_IO_CLUSTER,
     XBEE_PROFILE_ID,
+    XBeeSerialStream,
+    XBeeSerialTransfer,
 )
+from zhaquirks.xbee.types import IOSample
 from zhaquirks.xbee.xbee3_io import XBee3Sensor
 from zhaquirks.xbee.xbee_io import XBeeSensor
 
@@ -681,3 +686,460 @@ async def test_zdo(handle_mgmt_lqi_resp, zigpy_device_from_quirk):
     assert handle_mgmt_lqi_resp.call_args_list[0][0][1] == 0x1234
     assert handle_mgmt_lqi_resp.call_args_list[0][0][2] == 0
     assert handle_mgmt_lqi_resp.call_args_list[0][0][3] == 0
+
+
+def _at_response(device, frame_id, command, value=b""):
+    """Receive a remote AT command response from the device."""
+    device.packet_received(
+        t.ZigbeePacket(
+            profile_id=XBEE_PROFILE_ID,
+            cluster_id=XBEE_AT_RESPONSE_CLUSTER,
+            src_ep=XBEE_AT_ENDPOINT,
+            dst_ep=XBEE_AT_ENDPOINT,
+            data=t.SerializableBytes(bytes([frame_id]) + command + b"\x00" + value),
+        )
+    )
+
+
+async def test_remote_at_requests_per_device(zigpy_device_from_quirk):
+    """Test remote AT commands of several devices are in flight at once."""
+
+    devices = [
+        zigpy_device_from_quirk(XBee3Sensor, ieee=t.EUI64([i] * 8)) for i in range(3)
+    ]
+    for device in devices:
+        device.application.request.reset_mock()
+
+    requests = [
+        asyncio.create_task(device.remote_at(command))
+        for device in devices
+        for command in ("TP", "%V")
+    ]
+    await asyncio.sleep(0)
+
+    # frame ids are allocated per device
+    for device in devices:
+        assert len(device.remote_at_requests) == 2
+        assert device.remote_at_requests.requests == 2
+
+    # responses may arrive in any order
+    for device in reversed(devices):
+        _at_response(device, 2, b"%V", b"\x0c\xe4")
+        _at_response(device, 1, b"TP", b"\x00\x18")
+
+    assert await asyncio.gather(*requests) == [24, 3300] * 3
+    for device in devices:
+        assert len(device.remote_at_requests) == 0
+        assert device.remote_at_requests.responses == 2
+        assert device.remote_at_requests.average_latency >= 0
+        assert device.remote_at_requests.responses_per_second > 0
+
+
+async def test_remote_at_requests_timeout(zigpy_device_from_quirk):
+    """Test timed out remote AT commands are removed and their ids reused."""
+
+    device = zigpy_device_from_quirk(XBee3Sensor)
+    requests = device.remote_at_requests
+
+    with (
+        mock.patch("zhaquirks.xbee.REMOTE_AT_COMMAND_TIMEOUT", 0.01),
+        pytest.raises(asyncio.TimeoutError),
+    ):
+        await device.remote_at("TP")
+
+    assert len(requests) == 0
+    assert requests.timeouts == 1
+
+    # a late response isn't mistaken for the response to another command
+    pending = asyncio.create_task(device.remote_at("%V"))
+    await asyncio.sleep(0)
+    _at_response(device, 1, b"TP", b"\x00\x18")
+    assert requests.unmatched == 1
+    assert not pending.done()
+
+    _at_response(device, 2, b"%V", b"\x0c\xe4")
+    assert await pending == 3300
+
+    # frame ids of pending commands are skipped when wrapping around
+    requests._next_frame_id = 255
+    first = asyncio.create_task(device.remote_at("TP"))
+    await asyncio.sleep(0)
+    requests._next_frame_id = 255
+    second = asyncio.create_task(device.remote_at("TP"))
+    await asyncio.sleep(0)
+
+    assert requests.collisions == 1
+    _at_response(device, 1, b"TP", b"\x00\x02")
+    _at_response(device, 255, b"TP", b"\x00\x01")
+    assert await first == 1
+    assert await second == 2
+
+
+async def test_remote_at_requests_in_flight(zigpy_device_from_quirk):
+    """Test the number of remote AT commands sent at the same time is capped."""
+
+    device = zigpy_device_from_quirk(XBee3Sensor)
+    requests = device.remote_at_requests
+    count = requests.max_in_flight + 2
+
+    tasks = [asyncio.create_task(device.remote_at("TP")) for _ in range(count)]
+    await asyncio.sleep(0)
+    assert len(requests) == requests.max_in_flight
+
+    for frame_id in range(1, count + 1):
+        _at_response(device, frame_id, b"TP", frame_id.to_bytes(2, "big"))
+        await asyncio.sleep(0)
+
+    assert await asyncio.gather(*tasks) == list(range(1, count + 1))
+    assert requests.responses == count
+
+
+def test_io_sample_deserialize():
+    """Test decoding a single IO sample set."""
+    sample, rest = IOSample.deserialize(
+        b"\x01\x55\x55\x85\x11\x11\x01\x55\x02\xaa\x0c\xe9\xff"
+    )
+
+    assert sample["digital_samples"] == [1, None, 0, None] * 3 + [1, None, 0]
+    assert sample["analog_samples"] == [341, None, 682] + [None] * 4 + [3305]
+    assert sample.sample_sets == [(sample["digital_samples"], sample["analog_samples"])]
+    assert rest == b"\xff"
+
+    # the digital samples are left out without digital pins
+    sample, rest = IOSample.deserialize(b"\x01\x00\x00\x02\x01\x00")
+    assert sample["digital_samples"] == [None] * 15
+    assert sample["analog_samples"] == [None, 256] + [None] * 6
+    assert rest == b""
+
+
+def test_io_sample_deserialize_multiple_sets():
+    """Test decoding several IO sample sets of a frame."""
+    sample, rest = IOSample.deserialize(
+        b"\x02\x00\x03\x01" + b"\x00\x01\x01\x00" + b"\x00\x02\x02\x00"
+    )
+
+    assert sample.sample_sets == [
+        ([1, 0] + [None] * 13, [256] + [None] * 7),
+        ([0, 1] + [None] * 13, [512] + [None] * 7),
+    ]
+    assert sample["digital_samples"] == [0, 1] + [None] * 13
+    assert sample["analog_samples"] == [512] + [None] * 7
+    assert rest == b""
+
+
+@pytest.mark.parametrize(
+    "data",
+    (
+        b"\x01\x00",
+        b"\x00\x00\x01\x00",
+        b"\x02\x00\x01\x00\x00\x01",
+    ),
+)
+def test_io_sample_deserialize_invalid(data):
+    """Test truncated IO samples and samples without sets."""
+    with pytest.raises(ValueError):
+        IOSample.deserialize(data)
+
+
+def _io_sample_packet(data):
+    return t.ZigbeePacket(
+        profile_id=XBEE_PROFILE_ID,
+        cluster_id=XBEE_IO_CLUSTER,
+        src_ep=XBEE_DATA_ENDPOINT,
+        dst_ep=XBEE_DATA_ENDPOINT,
+        data=t.SerializableBytes(data),
+    )
+
+
+async def test_io_sample_report_multiple_sets(zigpy_device_from_quirk):
+    """Test each pin is updated once with the last sample set of a frame."""
+    xbee3_device = zigpy_device_from_quirk(XBee3Sensor)
+    digital_listeners = [
+        ClusterListener(xbee3_device.endpoints[e].on_off) for e in (0xD0, 0xD1)
+    ]
+    analog_listener = ClusterListener(xbee3_device.endpoints[0xD0].analog_input)
+
+    xbee3_device.packet_received(
+        _io_sample_packet(
+            b"\x03\x00\x03\x01"
+            + b"\x00\x01\x01\x00"
+            + b"\x00\x03\x01\x80"
+            + b"\x00\x02\x03\xff"
+        )
+    )
+
+    assert digital_listeners[0].attribute_updates == [(0x0000, 0)]
+    assert digital_listeners[1].attribute_updates == [(0x0000, 1)]
+    assert analog_listener.attribute_updates == [(0x0055, 100.0)]
+
+
+async def test_io_sample_report_changed_pins_only(zigpy_device_from_quirk):
+    """Test only pins with a changed value are forwarded, if enabled."""
+    xbee3_device = zigpy_device_from_quirk(XBee3Sensor)
+    xbee3_device.endpoints[XBEE_DATA_ENDPOINT].in_clusters[
+        XBEE_IO_CLUSTER
+    ].forward_changed_pins_only = True
+    digital_listeners = [
+        ClusterListener(xbee3_device.endpoints[e].on_off) for e in (0xD0, 0xD1)
+    ]
+    analog_listener = ClusterListener(xbee3_device.endpoints[0xD0].analog_input)
+
+    for data in (
+        b"\x01\x00\x03\x01\x00\x01\x01\x00",
+        b"\x01\x00\x03\x01\x00\x01\x01\x00",
+        b"\x01\x00\x03\x01\x00\x03\x01\x00",
+        b"\x01\x00\x03\x01\x00\x03\x02\x00",
+    ):
+        xbee3_device.packet_received(_io_sample_packet(data))
+
+    assert digital_listeners[0].attribute_updates == [(0x0000, 1)]
+    assert digital_listeners[1].attribute_updates == [(0x0000, 0), (0x0000, 1)]
+    assert [value for _, value in analog_listener.attribute_updates] == [
+        256 / 10.23,
+        512 / 10.23,
+    ]
+
+
+async def test_serial_stream_framing():
+    """Test reading the serial stream by length and delimiter."""
+    stream = XBeeSerialStream()
+
+    stream.feed_data(b"\x00\x03abc12")
+    stream.feed_data(b"3\r\n45")
+    assert await stream.readexactly(2) == b"\x00\x03"
+    assert await stream.readexactly(3) == b"abc"
+    assert await stream.readuntil(b"\r\n") == b"123\r\n"
+
+    # readers wait for the rest of a frame
+    reader = asyncio.ensure_future(stream.readuntil(b"\r\n"))
+    await asyncio.sleep(0)
+    assert not reader.done()
+    stream.feed_data(b"6\r")
+    await asyncio.sleep(0)
+    assert not reader.done()
+    stream.feed_data(b"\n7")
+    assert await reader == b"456\r\n"
+
+    assert await stream.read() == b"7"
+
+    stream.feed_data(b"89")
+    stream.feed_eof()
+    with pytest.raises(asyncio.IncompleteReadError) as exc:
+        await stream.readexactly(3)
+    assert exc.value.partial == b"89"
+    assert await stream.read() == b""
+    assert stream.at_eof()
+
+
+async def test_serial_stream_backpressure():
+    """Test pausing the stream and dropping data which doesn't fit."""
+    on_pause = mock.MagicMock()
+    stream = XBeeSerialStream(8, high_water=6, low_water=2, on_pause=on_pause)
+
+    stream.feed_data(b"12345")
+    assert not stream.paused
+    stream.feed_data(b"6789")
+    assert stream.paused
+    on_pause.assert_called_once_with(True, 8)
+
+    # no separator in a full buffer
+    with pytest.raises(asyncio.LimitOverrunError):
+        await stream.readuntil(b"\n")
+
+    assert await stream.read(4) == b"1234"
+    assert stream.paused
+    assert await stream.read(2) == b"56"
+    assert not stream.paused
+    assert on_pause.mock_calls == [mock.call(True, 8), mock.call(False, 2)]
+
+    assert stream.frames_received == 2
+    assert stream.bytes_received == 8
+    assert stream.bytes_dropped == 1
+    assert stream.max_buffered == 8
+
+
+async def test_serial_stream_cluster(zigpy_device_from_quirk):
+    """Test received serial data is buffered while a stream is open."""
+    xbee3_device = zigpy_device_from_quirk(XBee3Sensor)
+    serial_cluster = xbee3_device.endpoints[XBEE_DATA_ENDPOINT].in_clusters[
+        XBEE_DATA_CLUSTER
+    ]
+    listener = mock.MagicMock()
+    xbee3_device.endpoints[XBEE_DATA_ENDPOINT].out_clusters[
+        LevelControl.cluster_id
+    ].add_listener(listener)
+
+    def receive(data):
+        xbee3_device.packet_received(
+            t.ZigbeePacket(
+                profile_id=XBEE_PROFILE_ID,
+                cluster_id=XBEE_DATA_CLUSTER,
+                src_ep=XBEE_DATA_ENDPOINT,
+                dst_ep=XBEE_DATA_ENDPOINT,
+                data=t.SerializableBytes(data),
+            )
+        )
+
+    stream = serial_cluster.open_stream(32, high_water=16)
+    assert serial_cluster.open_stream() is stream
+
+    receive(b"temp=21.5\n")
+    receive(b"temp=21.6\n")
+    assert await stream.readuntil() == b"temp=21.5\n"
+    assert await stream.readuntil() == b"temp=21.6\n"
+
+    # only the changes of the backpressure state are sent as events
+    assert listener.zha_send_event.mock_calls == [
+        mock.call("serial_stream_paused", {"buffered": 20}),
+        mock.call("serial_stream_resumed", {"buffered": 0}),
+    ]
+
+    serial_cluster.close_stream()
+    assert stream.at_eof()
+    receive(b"Test UART data")
+    assert listener.zha_send_event.mock_calls[-1] == mock.call(
+        "receive_data", {"data": "Test UART data"}
+    )
+
+
+async def test_serial_stream_throughput(record_property):
+    """Benchmark reading lines from many small frames."""
+    stream = XBeeSerialStream()
+    frames = 20000
+    lines = []
+
+    async def reader():
+        while not stream.at_eof():
+            try:
+                lines.append(await stream.readuntil())
+            except asyncio.IncompleteReadError:
+                break
+
+    task = asyncio.ensure_future(reader())
+    start = time.perf_counter()
+    for i in range(frames):
+        # every line is split over two frames
+        stream.feed_data(b"sample=%d" % i)
+        stream.feed_data(b"\n")
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+    stream.feed_eof()
+    await task
+
+    elapsed = time.perf_counter() - start
+    record_property("frames_per_second", 2 * frames / elapsed)
+    assert len(lines) == frames
+    assert stream.bytes_dropped == 0
+
+
+def _serial_data_cluster(device):
+    return device.endpoints[XBEE_DATA_ENDPOINT].out_clusters[XBEE_DATA_CLUSTER]
+
+
+async def test_serial_transfer_window(zigpy_device_from_quirk):
+    """Test large payloads are sent in order with a window of chunks."""
+    xbee3_device = zigpy_device_from_quirk(XBee3Sensor)
+    sent = []
+    in_flight = 0
+    max_in_flight = 0
+
+    async def request(device, profile, cluster, src_ep, dst_ep, seq, data, **kwargs):
+        nonlocal in_flight, max_in_flight
+        sent.append(data)
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return foundation.Status.SUCCESS, None
+
+    xbee3_device.application.request = mock.AsyncMock(side_effect=request)
+    data = bytes(range(256)) * 4
+
+    transfer = await _serial_data_cluster(xbee3_device).transfer(
+        data, window=3, chunk_size=100
+    )
+
+    assert sent == [data[i : i + 100] for i in range(0, len(data), 100)]
+    assert max_in_flight == transfer.max_in_flight == 3
+    assert transfer.status == foundation.Status.SUCCESS
+    assert transfer.chunks == transfer.chunks_sent == 11
+    assert transfer.bytes_sent == len(data)
+    assert transfer.bytes_per_second > 0
+
+
+async def test_serial_transfer_failure(zigpy_device_from_quirk):
+    """Test a failed chunk stops the transfer."""
+    xbee3_device = zigpy_device_from_quirk(XBee3Sensor)
+    xbee3_device.application.request = mock.AsyncMock(
+        side_effect=[(foundation.Status.SUCCESS, None)] * 2
+        + [(foundation.Status.FAILURE, None)]
+        + [(foundation.Status.SUCCESS, None)] * 10
+    )
+
+    transfer = await _serial_data_cluster(xbee3_device).transfer(
+        b"x" * 100, window=2, chunk_size=10
+    )
+
+    # the chunk in flight with the failed one isn't counted
+    assert transfer.status == foundation.Status.FAILURE
+    assert transfer.chunks_sent == 2
+    assert transfer.bytes_sent == 20
+    assert xbee3_device.application.request.await_count == 4
+
+    with pytest.raises(ValueError):
+        XBeeSerialTransfer(b"x", chunk_size=0)
+
+
+async def test_serial_transfer_max_payload(zigpy_device_from_quirk):
+    """Test the chunk size is the maximum payload reported by the XBee."""
+    xbee3_device = zigpy_device_from_quirk(XBee3Sensor)
+    serial_cluster = _serial_data_cluster(xbee3_device)
+    xbee3_device.application.request.reset_mock()
+
+    with mock.patch.object(
+        xbee3_device, "remote_at", mock.AsyncMock(side_effect=ValueError)
+    ) as remote_at:
+        assert await serial_cluster.get_max_payload() == 84
+        assert await serial_cluster.get_max_payload() == 84
+    assert serial_cluster.max_payload is None
+
+    # the failed read is retried after a while only
+    remote_at.assert_awaited_once_with("NP")
+    serial_cluster._max_payload_retry = 0
+
+    with mock.patch.object(
+        xbee3_device, "remote_at", mock.AsyncMock(return_value=t.uint16_t_be(49))
+    ) as remote_at:
+        serial_cluster.chunked_transfer = True
+        _, status = await serial_cluster.command(0, "x" * 100)
+        await serial_cluster.command(0, "x" * 10)
+
+    # the maximum payload is read once
+    remote_at.assert_awaited_once_with("NP")
+    assert status == foundation.Status.SUCCESS
+    assert serial_cluster.transfer_window == 1
+    assert [
+        len(call.args[6]) for call in xbee3_device.application.request.await_args_list
+    ] == [49, 49, 2, 10]
+
+
+@pytest.mark.parametrize("window", (1, 8))
+async def test_serial_transfer_throughput(
+    zigpy_device_from_quirk, window, record_property
+):
+    """Benchmark a transfer to a device taking 1 ms per frame."""
+    xbee3_device = zigpy_device_from_quirk(XBee3Sensor)
+
+    async def request(*args, **kwargs):
+        await asyncio.sleep(0.001)
+        return foundation.Status.SUCCESS, None
+
+    xbee3_device.application.request = mock.AsyncMock(side_effect=request)
+
+    transfer = await _serial_data_cluster(xbee3_device).transfer(
+        bytes(64 * 84), window=window, chunk_size=84
+    )
+
+    record_property("bytes_per_second", transfer.bytes_per_second)
+    assert transfer.chunks_sent == 64
+    assert transfer.max_in_flight == window
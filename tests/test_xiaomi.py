@@ -3,6 +3,8 @@
 import asyncio
 import logging
 import math
+import random
+import time
 from unittest import mock
 
 import pytest
@@ -13,6 +15,7 @@ from zigpy.zcl.clusters.closures import WindowCovering
 from zigpy.zcl.clusters.general import (
     AnalogInput,
     AnalogOutput,
+    Basic,
     DeviceTemperature,
     MultistateInput,
     MultistateOutput,
@@ -32,6 +35,11 @@ from zigpy.zcl.clusters.security import IasZone
 from zigpy.zcl.clusters.smartenergy import Metering
 
 from tests.common import ZCL_OCC_ATTR_RPT_OCC, ClusterListener
+from tests.xiaomi_corpus import (
+    XIAOMI_ATTRIBUTE_REPORTS,
+    XIAOMI_PAYLOADS,
+    mutate_payload,
+)
 import zhaquirks
 from zhaquirks.const import (
     BUTTON_1,
@@ -50,6 +58,7 @@ from zhaquirks.const import (
     BatterySize,
 )
 from zhaquirks.xiaomi import (
+    AQARA_ATTRIBUTE_NAMES,
     LUMI,
     XIAOMI_AQARA_ATTRIBUTE,
     XIAOMI_AQARA_ATTRIBUTE_E1,
@@ -94,8 +103,13 @@ import zhaquirks.xiaomi.aqara.roller_curtain_e1
 import zhaquirks.xiaomi.aqara.sensor_ht_agl02
 import zhaquirks.xiaomi.aqara.smoke
 import zhaquirks.xiaomi.aqara.switch_t1
-from zhaquirks.xiaomi.aqara.thermostat_agl001 import ScheduleEvent, ScheduleSettings
+from zhaquirks.xiaomi.aqara.thermostat_agl001 import (
+    SCHEDULE_EVENT,
+    ScheduleEvent,
+    ScheduleSettings,
+)
 import zhaquirks.xiaomi.aqara.weather
+from zhaquirks.xiaomi.codec import Layout
 import zhaquirks.xiaomi.mija.motion
 import zhaquirks.xiaomi.mija.smoke
 
@@ -323,6 +337,81 @@ def test_xiaomi_quick_init(raw_device):
     assert raw_device.application.device_initialized.call_count == 1
 
 
+def test_xiaomi_quick_init_flood(raw_device):
+    """Test traffic of other devices is dropped without deserializing it."""
+
+    messages = [
+        # IAS zone status change notification
+        (0x0500, b"\x19\x01\x00\x21\x00\x00\x00\x00\x00"),
+        # on/off toggle
+        (0x0006, b"\x11\x02\x02"),
+        # temperature report
+        (0x0402, b"\x18\x03\x0a\x00\x00\x29\x5d\x09"),
+        # basic cluster read attributes response
+        (0x0000, b"\x18\x04\x01\x04\x00\x00\x42\x04IKEA"),
+        # manufacturer specific basic cluster command
+        (0x0000, b"\x05\x7c\x11\x05\x00\x01"),
+        # truncated frames
+        (0x0000, b""),
+        (0x0000, b"\x1c\x5f\x11"),
+    ]
+
+    with (
+        mock.patch("zigpy.zcl.foundation.ZCLHeader.deserialize") as hdr_deserialize,
+        mock.patch.object(raw_device, "debug") as debug,
+    ):
+        for _ in range(1000):
+            for cluster, message in messages:
+                assert (
+                    handle_quick_init(raw_device, 0x0104, cluster, 1, 1, message)
+                    is None
+                )
+
+    assert hdr_deserialize.call_count == 0
+    assert debug.call_count == 0
+    assert raw_device.cancel_initialization.call_count == 0
+
+
+def test_xiaomi_quick_init_quirk_cache(raw_device):
+    """Test the quick init quirks of a model are cached until the registry changes."""
+
+    model = "lumi.sensor_cache"
+    message = b"\x18\x00\n\x05\x00B\x11lumi.sensor_cache\x01\x00 \x01"
+
+    class WrongDevice(XiaomiCustomDevice):
+        signature = {
+            MANUFACTURER: LUMI,
+            MODEL: model,
+        }
+
+    assert handle_quick_init(raw_device, 0x0260, 0, 1, 1, message) is None
+    cached = zhaquirks.xiaomi._QUICK_INIT_QUIRKS[model]
+    assert cached[1] == ()
+
+    assert handle_quick_init(raw_device, 0x0260, 0, 1, 1, message) is None
+    assert zhaquirks.xiaomi._QUICK_INIT_QUIRKS[model] is cached
+
+    class XiaomiQuirk(XiaomiQuickInitDevice):
+        signature = {
+            NODE_DESCRIPTOR: XIAOMI_NODE_DESC,
+            ENDPOINTS: {
+                1: {
+                    PROFILE_ID: 0x0260,
+                    DEVICE_TYPE: 0x0000,
+                    INPUT_CLUSTERS: [],
+                    OUTPUT_CLUSTERS: [],
+                }
+            },
+            MANUFACTURER: LUMI,
+            MODEL: model,
+        }
+
+    # Registering a quirk invalidates the cached resolution
+    assert handle_quick_init(raw_device, 0x0260, 0, 1, 1, message) is True
+    assert zhaquirks.xiaomi._QUICK_INIT_QUIRKS[model][1] == (XiaomiQuirk,)
+    assert raw_device.application.device_initialized.call_count == 1
+
+
 @pytest.mark.parametrize(
     "voltage, bpr",
     (
@@ -426,77 +515,7 @@ async def test_xiaomi_batt_size(zigpy_device_from_quirk, quirk, batt_size):
     assert succ["battery_size"] == batt_size
 
 
-@pytest.mark.parametrize(
-    "raw_report",
-    (
-        # https://community.hubitat.com/t/xiaomi-aqara-devices-pairing-keeping-them-connected/623?page=34
-        "02FF4C0600100121BA0B21A813240100000000215D062058",
-        "02FF4C0600100021EC0B21A8012400000000002182002063",
-        "01FF421F0121110D0328130421A8430521F60006240600030000082108140A21E51F",
-        "01FF421A0121C70B03281C0421A84305212B01062403000300000A2120CB",
-        "01FF421F0121C70B0328190421A8430521100106240400040000082109140A2120CB",
-        "01FF421F0121C70B0328180421A8430521100106240600050000082109140A213C50",
-        "01FF421A0121BD0B03281D0421A84305212F01062407000300000A2120CB",
-        # https://community.hubitat.com/t/xiaomi-aqara-zigbee-device-drivers-possibly-may-no-longer-be-maintained/631/print
-        "01FF42090421A8130A212759",
-        (
-            "01FF42296410006510016E20006F20010121E40C03281E05210500082116260A2100009923"
-            "000000009B210000"
-        ),
-        "01FF42220121D10B0328190421A81305212D0006240200000000082104020A21A4B4641000",
-        "01FF42220121D10B03281C0421A81305213A0006240000000000082104020A210367641001",
-        (
-            "01FF42280121B70C0328200421A81305211E00062402000000000A21E18C08210410642000"
-            "962300000000"
-        ),
-        (
-            "01FF42270328240521170007270000000000000000082117010921000A0A2130C064200065"
-            "20336621FA00"
-        ),
-        "02FF4C0600100121B30B21A8012400000000002195002056",
-        "02FF4C0600100121B30B21A8012400000000002195002057",
-        # puddly's logs
-        "01FF421A0121DB0B03280C0421A84305215401062401000000000A2178E0",
-        "01FF421D0121BD0B03280A0421A8330521E801062401000000000A214444641000",
-        "01FF421F0121E50B0328170421A8130521500006240100000000082105140A214761",
-        "01FF42210121950B0328130421A81305214400062401000000000A217CBE6410000B210400",
-        (
-            "01FF42250121630B0421A81305217D2F06240100000000642905006521631D662B4D7F0100"
-            "0A2157DE"
-        ),
-        "02FF4C06001001213C0C21A81324010000000021D1052061",
-        (
-            "050042166C756D692E73656E736F725F6D6F74696F6E2E61713201FF42210121950B032816"
-            "0421A83105214400062401000000000A217CBE6410000B210900"
-        ),
-        # GH Issue #811
-        (
-            "01FF424403282305212E0008212E12092100106410006510006E20006F200094200295390A"
-            "078C41963999EB0C4597390030683B983980BB873C9B2100009C20010A2100000C280000"
-        ),
-        # https://github.com/dresden-elektronik/deconz-rest-plugin/issues/1491#issuecomment-489032272
-        (
-            "01FF422E0121BD0B03281A0421A8430521470106240100010000082108030A216535982128"
-            "00992125009A252900FFFFDC04"
-        ),
-        # https://github.com/dresden-elektronik/deconz-rest-plugin/issues/1411#issuecomment-485724957
-        (
-            "01FF424403280005210F000727000000000000000008212312092100086410006510006E20"
-            "006F20009420089539000000009639B22E1645973988E5C83B9839C013063E9B210000"
-        ),
-        # https://github.com/dresden-elektronik/deconz-rest-plugin/issues/1588
-        (
-            "01FF422E0121770B0328230421A8010521250006240100000000082108030A2161F3982128"
-            "00992100009A25AFFE5B016904"
-        ),
-        # https://github.com/dresden-elektronik/deconz-rest-plugin/issues/1069
-        "02FF4C0600100121D10B21A801240000000000216E002050",
-        "01FF421D0121D10B0328150421A8130521A200062403000000000A210000641000",
-        "01FF421D0121DB0B0328140421A84305219A00062401000000000A21C841641000",
-        "01FF421D0121BD0B0328150421A83305213B00062401000000000A219FF8641000",
-        "01FF421D0121C70B0328130421A81305219200062401000000000A21C96B641000",
-    ),
-)
+@pytest.mark.parametrize("raw_report", XIAOMI_ATTRIBUTE_REPORTS)
 def test_attribute_parsing(raw_report):
     """Test the parsing of various Xiaomi 0xFF01 attribute reports."""
     raw_report = bytes.fromhex(raw_report)
@@ -529,6 +548,144 @@ def test_attribute_parsing(raw_report):
     assert len(raw_report) == 2 * len(reports[0])
 
 
+@pytest.mark.parametrize("model", XIAOMI_PAYLOADS)
+async def test_xiaomi_payload_throughput(
+    zigpy_device_from_quirk, record_property, model
+):
+    """Benchmark deserializing and applying the corpus payloads of a model."""
+    payloads = XIAOMI_PAYLOADS[model]
+    device = zigpy_device_from_quirk(payloads.quirk)
+    cluster = getattr(device.endpoints[1], payloads.cluster)
+    rounds = 100
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for frame in payloads.frames:
+            hdr, args = cluster.deserialize(frame)
+            for report in args.attribute_reports:
+                cluster._update_attribute(report.attrid, report.value.value)
+    elapsed = time.perf_counter() - start
+
+    assert args.attribute_reports
+    record_property("frames_per_second", round(rounds * len(payloads.frames) / elapsed))
+
+
+def test_xiaomi_payload_fuzz(record_property):
+    """Fuzz the attribute report parser with mutated corpus payloads."""
+    rng = random.Random(0x115F)
+    cluster = BasicCluster(mock.MagicMock())
+
+    payloads = [bytes.fromhex(raw_report) for raw_report in XIAOMI_ATTRIBUTE_REPORTS]
+    for corpus in XIAOMI_PAYLOADS.values():
+        for frame in corpus.frames:
+            # payloads follow the manufacturer specific or the plain ZCL header
+            payloads.append(frame[5:] if frame[0] & 0b00000100 else frame[3:])
+
+    worst_time = 0.0
+    worst_report = b""
+
+    with mock.patch.object(
+        cluster,
+        "_iter_parse_attr_report",
+        wraps=cluster._iter_parse_attr_report,
+    ) as parse:
+        for payload in payloads:
+            for _ in range(50):
+                report = mutate_payload(payload, rng)
+
+                parse.reset_mock()
+                start = time.perf_counter()
+                cluster._interpret_attr_reports(report)
+                elapsed = time.perf_counter() - start
+
+                # every position of the report is parsed at most once
+                assert parse.call_count <= len(report)
+
+                if elapsed > worst_time:
+                    worst_time = elapsed
+                    worst_report = report
+
+    record_property("worst_parse_time", worst_time)
+    record_property("worst_parse_report", worst_report.hex())
+
+
+def test_attribute_report_deserialize():
+    """Test fixed reports are passed to the command schema without a round trip."""
+    cluster = BasicCluster(mock.MagicMock())
+
+    for raw_report in XIAOMI_ATTRIBUTE_REPORTS:
+        hdr = foundation.ZCLHeader.general(
+            manufacturer=4447,
+            tsn=127,
+            command_id=foundation.GeneralCommand.Report_Attributes,
+        )
+        data = hdr.serialize() + bytes.fromhex(raw_report)
+
+        with mock.patch.object(
+            foundation.ZCLHeader, "serialize", wraps=hdr.serialize
+        ) as serialize:
+            hdr, response = cluster.deserialize(data)
+        assert serialize.call_count == 0
+
+        report, _ = cluster._interpret_attr_reports(bytes.fromhex(raw_report))
+        fixed_data = b"".join(attr.serialize() for attr in report)
+
+        # The result is the same as parsing the fixed report with the generic parser
+        assert (hdr, response) == Basic(mock.MagicMock()).deserialize(
+            hdr.serialize() + fixed_data
+        )
+
+    # Other frames are passed through as they are
+    hdr = foundation.ZCLHeader.general(
+        tsn=1, command_id=foundation.GeneralCommand.Read_Attributes_rsp
+    )
+    data = hdr.serialize() + b"\x05\x00\x00\x42\x03abc"
+
+    with mock.patch.object(foundation.ZCLHeader, "serialize") as serialize:
+        hdr, response = cluster.deserialize(data)
+    assert serialize.call_count == 0
+    assert response.status_records[0].value.value == "abc"
+
+
+def test_attribute_parsing_linear():
+    """Test that every report position is parsed once, even for broken reports."""
+    cluster = BasicCluster(mock.MagicMock())
+
+    with mock.patch.object(
+        cluster,
+        "_iter_parse_attr_report",
+        wraps=cluster._iter_parse_attr_report,
+    ) as parse:
+        for raw_report in XIAOMI_ATTRIBUTE_REPORTS:
+            raw_report = bytes.fromhex(raw_report)
+            parse.reset_mock()
+
+            report, count = cluster._interpret_attr_reports(raw_report)
+            assert report is not None
+            assert count >= 1
+            assert b"".join(attr.serialize() for attr in report)
+            assert parse.call_count <= len(raw_report)
+
+        # 0x00F7 strings nested in each other, every one of them can be read with
+        # its reported length or one byte shorter except for the last one
+        raw_report = (b"\xf7" + 40 * b"\x00\x42\x06\x00\xf7\x00\x42\x01\xf7")[:-1]
+        parse.reset_mock()
+
+        report, count = cluster._interpret_attr_reports(raw_report)
+        assert count == 2**39
+        assert parse.call_count <= len(raw_report)
+
+        # Interpretations are only counted, the first one is picked
+        assert len(report) == 40
+        assert report[0].attrid == 0x00F7
+        assert report[0].value.value == t.LVBytes(b"\x00\xf7\x00\x42\x01")
+
+        # Truncated reports have no interpretation
+        report, count = cluster._interpret_attr_reports(raw_report[:-1])
+        assert report is None
+        assert count == 0
+
+
 @mock.patch("zigpy.zcl.Cluster.bind", mock.AsyncMock())
 @pytest.mark.parametrize("quirk", (zhaquirks.xiaomi.aqara.plug_eu.PlugMAEU01,))
 async def test_xiaomi_eu_plug_binding(zigpy_device_from_quirk, quirk):
@@ -1153,6 +1310,37 @@ async def test_xiaomi_e1_thermostat_schedule_settings_serialization(
     assert s.serialize() == expected_bytes
 
 
+def test_xiaomi_codec_layout():
+    """Test parsing and building binary layouts."""
+    layout = Layout("Record", (("attribute", "i"), ("length", "B")))
+    assert layout.size == 5
+
+    data = layout.build(0x04150055, 1)
+    assert data == b"\x04\x15\x00\x55\x01"
+    assert layout.parse(data) == (0x04150055, 1)
+    assert layout.parse(data).attribute == 0x04150055
+
+    # records are parsed in place, also from memoryviews
+    view = memoryview(b"\x00\x02" + data + data)
+    assert layout.parse(view, 2).length == 1
+
+    with pytest.raises(ValueError):
+        layout.parse(data[:4])
+
+    with pytest.raises(ValueError):
+        layout.parse(view, 8)
+
+
+def test_xiaomi_e1_thermostat_schedule_event_record():
+    """Test creating schedule events from parsed records."""
+    event = ScheduleEvent(SCHEDULE_EVENT.parse(b"\x81\xe0\x00\x00\x08\x98"))
+    assert str(event) == "8:00,22.0"
+    assert not event.is_next_day()
+
+    event.set_next_day(True)
+    assert event.serialize() == b"\x81\xe0\x00\x00\x08\x98"
+
+
 @pytest.mark.parametrize(
     "schedule_settings, expected_string",
     [
@@ -1335,6 +1523,35 @@ async def test_xiaomi_weather(
     assert power_listener.attribute_updates[1][1] == expected_results[4]
 
 
+def test_aqara_attribute_names(zigpy_device_from_quirk):
+    """Test the model specific Aqara attribute names are resolved once per cluster."""
+    device = zigpy_device_from_quirk(zhaquirks.xiaomi.aqara.weather.Weather2)
+    cluster = device.endpoints[1].basic
+    attribute_names = cluster._aqara_attribute_names
+
+    assert attribute_names[102] == "pressure_measurement_precision"
+    assert attribute_names.items() >= AQARA_ATTRIBUTE_NAMES.items()
+
+    attributes = cluster._parse_aqara_attributes(
+        bytes.fromhex("0121B60B64292D090C200100")
+    )
+    assert attributes == {
+        "battery_voltage_mV": 2998,
+        "temperature_measurement": 2349,
+        "0xff01-12": 1,
+    }
+
+    # Unknown keys are named once and the table is kept
+    assert cluster._aqara_attribute_names is attribute_names
+    assert attribute_names[12] == "0xff01-12"
+    assert 12 not in AQARA_ATTRIBUTE_NAMES
+
+    # Clusters of other models don't share the table
+    cluster = BasicCluster(mock.MagicMock())
+    assert cluster._aqara_attribute_names == AQARA_ATTRIBUTE_NAMES
+    assert cluster._aqara_attribute_names is not AQARA_ATTRIBUTE_NAMES
+
+
 @pytest.mark.parametrize(
     "raw_report, expected_results",
     (
@@ -1429,11 +1646,117 @@ async def test_xiaomi_power_cluster_not_used(zigpy_device_from_quirk, caplog, qu
 
     # confirm that a debug message was logged
     assert (
-        "Xiaomi battery voltage attribute received but XiaomiPowerConfiguration not used"
+        "Xiaomi battery voltage attribute is ignored, XiaomiPowerConfiguration not used"
         in caplog.text
     )
 
 
+async def test_xiaomi_attribute_routes(zigpy_device_from_quirk):
+    """Test parsed Aqara attributes are routed through a table built once."""
+    device = zigpy_device_from_quirk(zhaquirks.xiaomi.aqara.plug.Plug)
+    basic_cluster = device.endpoints[1].basic
+    em_listener = ClusterListener(device.endpoints[1].electrical_measurement)
+    metering_listener = ClusterListener(device.endpoints[1].smartenergy_metering)
+
+    with mock.patch.object(
+        basic_cluster,
+        "_build_aqara_routes",
+        wraps=basic_cluster._build_aqara_routes,
+    ) as build_routes:
+        for _ in range(3):
+            basic_cluster.update_attribute(
+                XIAOMI_AQARA_ATTRIBUTE,
+                create_aqara_attr_report({1: 2300, 149: 0.5, 150: 2300, 152: 15}),
+            )
+
+    assert build_routes.call_count == 1
+
+    # the plug has no XiaomiPowerConfiguration cluster, so the battery is dropped
+    routes = basic_cluster._aqara_routes
+    assert "battery_voltage_mV" not in routes
+    assert len(routes["consumption"]) == 2
+    assert {"power", "voltage", "temperature"} <= routes.keys()
+
+    assert em_listener.attribute_updates[:3] == [
+        (ElectricalMeasurement.AttributeDefs.total_active_power.id, 500),
+        (ElectricalMeasurement.AttributeDefs.rms_voltage.id, 230),
+        (ElectricalMeasurement.AttributeDefs.active_power.id, 150),
+    ]
+    assert metering_listener.attribute_updates[0] == (
+        Metering.AttributeDefs.current_summ_delivered.id,
+        500,
+    )
+
+
+async def test_xiaomi_heartbeat_clears_alarm(zigpy_device_from_quirk):
+    """Test a heartbeat value is dispatched when another report changed the target."""
+    device = zigpy_device_from_quirk(zhaquirks.xiaomi.aqara.smoke.LumiSensorSmokeAcn03)
+    opple_cluster = device.endpoints[1].opple_cluster
+    ias_listener = ClusterListener(device.endpoints[1].ias_zone)
+
+    def heartbeat():
+        opple_cluster.update_attribute(
+            XIAOMI_AQARA_ATTRIBUTE_E1, create_aqara_attr_report({160: 0})
+        )
+
+    with mock.patch("time.monotonic", return_value=1000):
+        heartbeat()
+        heartbeat()
+        assert opple_cluster.heartbeat_updates_dropped == 1
+
+        # the alarm is set through the smoke attribute, the next heartbeat clears it
+        opple_cluster.update_attribute(0x013A, 1)
+        heartbeat()
+
+    assert [value for _, value in ias_listener.attribute_updates] == [0, 1, 0]
+    assert opple_cluster.heartbeat_updates_dropped == 1
+
+
+async def test_xiaomi_heartbeat_change_detection(zigpy_device_from_quirk):
+    """Test unchanged heartbeat values are only dispatched after the refresh interval."""
+    device = zigpy_device_from_quirk(zhaquirks.xiaomi.aqara.weather.Weather)
+    basic_cluster = device.endpoints[1].basic
+    temperature_listener = ClusterListener(device.endpoints[1].temperature)
+    humidity_listener = ClusterListener(device.endpoints[1].humidity)
+    power_listener = ClusterListener(device.endpoints[1].power)
+
+    def heartbeat(temperature):
+        basic_cluster.update_attribute(
+            XIAOMI_AQARA_ATTRIBUTE,
+            create_aqara_attr_report({1: 3000, 100: temperature, 101: 4500}),
+        )
+
+    with mock.patch("time.monotonic", return_value=1000):
+        heartbeat(2100)
+        heartbeat(2100)
+        heartbeat(2200)
+
+    assert temperature_listener.attribute_updates == [(0x0000, 2100), (0x0000, 2200)]
+    assert humidity_listener.attribute_updates == [(0x0000, 4500)]
+    # the battery isn't a single attribute, so its values are always dispatched
+    assert power_listener.attribute_updates == [(0x0020, 30), (0x0021, 129)] * 3
+    assert basic_cluster.heartbeat_updates_dispatched == 6
+    assert basic_cluster.heartbeat_updates_dropped == 3
+
+    # unchanged values are refreshed once the interval has passed
+    refresh = 1000 + basic_cluster.heartbeat_refresh_interval
+    with mock.patch("time.monotonic", return_value=refresh):
+        heartbeat(2200)
+
+    assert temperature_listener.attribute_updates[-1] == (0x0000, 2200)
+    assert len(temperature_listener.attribute_updates) == 3
+    assert len(humidity_listener.attribute_updates) == 2
+    assert basic_cluster.heartbeat_updates_dropped == 3
+
+    # every value is dispatched with change detection turned off
+    basic_cluster.heartbeat_refresh_interval = 0
+    with mock.patch("time.monotonic", return_value=refresh):
+        heartbeat(2200)
+
+    assert len(temperature_listener.attribute_updates) == 4
+    assert basic_cluster.heartbeat_updates_dropped == 3
+
+
 @pytest.mark.parametrize(
     "quirk", (zhaquirks.xiaomi.aqara.roller_curtain_e1.RollerE1AQ,)
 )
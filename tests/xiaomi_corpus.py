@@ -0,0 +1,238 @@
+"""Corpus of Xiaomi and Aqara payloads for the parser tests and benchmarks.
+
+The benchmarks in test_xiaomi.py record their results as test properties, run
+pytest with `--junitxml` to collect them.
+"""
+
+import random
+from typing import NamedTuple
+
+from zigpy.quirks import CustomDevice
+
+import zhaquirks.xiaomi.aqara.feeder_acn001
+import zhaquirks.xiaomi.aqara.magnet_agl02
+import zhaquirks.xiaomi.aqara.motion_aq2
+import zhaquirks.xiaomi.aqara.sensor_ht_agl02
+import zhaquirks.xiaomi.aqara.smoke
+import zhaquirks.xiaomi.aqara.thermostat_agl001
+import zhaquirks.xiaomi.aqara.weather
+import zhaquirks.xiaomi.aqara.wleak_aq1
+import zhaquirks.xiaomi.mija.motion
+
+# Real 0xFF01 and 0xFF02 heartbeats, some of them with broken string lengths
+XIAOMI_ATTRIBUTE_REPORTS = (
+    # https://community.hubitat.com/t/xiaomi-aqara-devices-pairing-keeping-them-connected/623?page=34
+    "02FF4C0600100121BA0B21A813240100000000215D062058",
+    "02FF4C0600100021EC0B21A8012400000000002182002063",
+    "01FF421F0121110D0328130421A8430521F60006240600030000082108140A21E51F",
+    "01FF421A0121C70B03281C0421A84305212B01062403000300000A2120CB",
+    "01FF421F0121C70B0328190421A8430521100106240400040000082109140A2120CB",
+    "01FF421F0121C70B0328180421A8430521100106240600050000082109140A213C50",
+    "01FF421A0121BD0B03281D0421A84305212F01062407000300000A2120CB",
+    # https://community.hubitat.com/t/xiaomi-aqara-zigbee-device-drivers-possibly-may-no-longer-be-maintained/631/print
+    "01FF42090421A8130A212759",
+    (
+        "01FF42296410006510016E20006F20010121E40C03281E05210500082116260A2100009923"
+        "000000009B210000"
+    ),
+    "01FF42220121D10B0328190421A81305212D0006240200000000082104020A21A4B4641000",
+    "01FF42220121D10B03281C0421A81305213A0006240000000000082104020A210367641001",
+    (
+        "01FF42280121B70C0328200421A81305211E00062402000000000A21E18C08210410642000"
+        "962300000000"
+    ),
+    (
+        "01FF42270328240521170007270000000000000000082117010921000A0A2130C064200065"
+        "20336621FA00"
+    ),
+    "02FF4C0600100121B30B21A8012400000000002195002056",
+    "02FF4C0600100121B30B21A8012400000000002195002057",
+    # puddly's logs
+    "01FF421A0121DB0B03280C0421A84305215401062401000000000A2178E0",
+    "01FF421D0121BD0B03280A0421A8330521E801062401000000000A214444641000",
+    "01FF421F0121E50B0328170421A8130521500006240100000000082105140A214761",
+    "01FF42210121950B0328130421A81305214400062401000000000A217CBE6410000B210400",
+    (
+        "01FF42250121630B0421A81305217D2F06240100000000642905006521631D662B4D7F0100"
+        "0A2157DE"
+    ),
+    "02FF4C06001001213C0C21A81324010000000021D1052061",
+    (
+        "050042166C756D692E73656E736F725F6D6F74696F6E2E61713201FF42210121950B032816"
+        "0421A83105214400062401000000000A217CBE6410000B210900"
+    ),
+    # GH Issue #811
+    (
+        "01FF424403282305212E0008212E12092100106410006510006E20006F200094200295390A"
+        "078C41963999EB0C4597390030683B983980BB873C9B2100009C20010A2100000C280000"
+    ),
+    # https://github.com/dresden-elektronik/deconz-rest-plugin/issues/1491#issuecomment-489032272
+    (
+        "01FF422E0121BD0B03281A0421A8430521470106240100010000082108030A216535982128"
+        "00992125009A252900FFFFDC04"
+    ),
+    # https://github.com/dresden-elektronik/deconz-rest-plugin/issues/1411#issuecomment-485724957
+    (
+        "01FF424403280005210F000727000000000000000008212312092100086410006510006E20"
+        "006F20009420089539000000009639B22E1645973988E5C83B9839C013063E9B210000"
+    ),
+    # https://github.com/dresden-elektronik/deconz-rest-plugin/issues/1588
+    (
+        "01FF422E0121770B0328230421A8010521250006240100000000082108030A2161F3982128"
+        "00992100009A25AFFE5B016904"
+    ),
+    # https://github.com/dresden-elektronik/deconz-rest-plugin/issues/1069
+    "02FF4C0600100121D10B21A801240000000000216E002050",
+    "01FF421D0121D10B0328150421A8130521A200062403000000000A210000641000",
+    "01FF421D0121DB0B0328140421A84305219A00062401000000000A21C841641000",
+    "01FF421D0121BD0B0328150421A83305213B00062401000000000A219FF8641000",
+    "01FF421D0121C70B0328130421A81305219200062401000000000A21C96B641000",
+)
+
+
+class XiaomiPayloads(NamedTuple):
+    """ZCL frames received from a model on one of its clusters."""
+
+    quirk: type[CustomDevice]
+    cluster: str
+    frames: tuple[bytes, ...]
+
+
+# Complete ZCL frames by model
+XIAOMI_PAYLOADS = {
+    "lumi.weather": XiaomiPayloads(
+        zhaquirks.xiaomi.aqara.weather.Weather2,
+        "basic",
+        (
+            bytes.fromhex(
+                "18200A01FF412501214F0B0421A84305214E020624010000000064299B096521BE1B66"
+                "2B138D01000A21900D"
+            ),
+        ),
+    ),
+    "lumi.sensor_motion.aq2": XiaomiPayloads(
+        zhaquirks.xiaomi.aqara.motion_aq2.MotionAQ2,
+        "basic",
+        (
+            bytes.fromhex(
+                "1C5F11C10A01FF41210121DB0B03281F0421A8430521B60006240B000000000A21CA35"
+                "6410000B210800"
+            ),
+            # model and heartbeat in one report, the heartbeat is a broken string
+            bytes.fromhex(
+                "1C5F11C20A050042166C756D692E73656E736F725F6D6F74696F6E2E61713201FF4221"
+                "0121950B0328160421A83105214400062401000000000A217CBE6410000B210900"
+            ),
+        ),
+    ),
+    "lumi.sensor_wleak.aq1": XiaomiPayloads(
+        zhaquirks.xiaomi.aqara.wleak_aq1.LeakAQ1,
+        "basic",
+        (
+            # the heartbeat string is one byte too short
+            b"\x1c_\x11\x12\n"
+            b'\x05\x00B\x15lumi.sensor_wleak.aq1\x01\xffB"\x01!\xb3\x0b\x03('
+            b"\x17\x04!\xa8C\x05!\xa7\x00\x06$\x00\x00\x00\x00\x00\x08!\x04"
+            b"\x02\n!\x00\x00d\x10\x01",
+            b"\x1c_\x11\x12\n"
+            b'\x01\xffB"\x01!\xb3\x0b\x03(\x17\x04!\xa8C\x05!\xa7\x00\x06$\x15'
+            b"\x00\x14\x00\x00\x08!\x04\x02\n!\x00\x00d\x10\x01",
+        ),
+    ),
+    "lumi.sensor_motion": XiaomiPayloads(
+        zhaquirks.xiaomi.mija.motion.Motion,
+        "basic",
+        (
+            # 0xFF02 struct
+            b"\x1c4\x12\x02\n\x02\xffL\x06\x00\x10\x01!\xb8\x0b"
+            b"!\xa8\x01$\x00\x00\x00\x00\x00!n\x00 P",
+        ),
+    ),
+    "lumi.sensor_ht.agl02": XiaomiPayloads(
+        zhaquirks.xiaomi.aqara.sensor_ht_agl02.LumiSensorHtAgl02,
+        "opple_cluster",
+        (
+            bytes.fromhex(
+                "1C5F11860AF700412D0121B60B0328170421A81305210B000624060000000008211D01"
+                "0A2100000C200164292D09652904186629E903"
+            ),
+        ),
+    ),
+    "lumi.magnet.agl02": XiaomiPayloads(
+        zhaquirks.xiaomi.aqara.magnet_agl02.MagnetT1,
+        "opple_cluster",
+        (
+            bytes.fromhex(
+                "1C5F11670AF700412E0121B00C0328190421A8130521090006240D0000000008211E01"
+                "0A2100000C20016410016620036720016821A800"
+            ),
+        ),
+    ),
+    "lumi.sensor_smoke.acn03": XiaomiPayloads(
+        zhaquirks.xiaomi.aqara.smoke.LumiSensorSmokeAcn03,
+        "opple_cluster",
+        (
+            bytes.fromhex(
+                "1C5F11E10AF700413E0121360C0328190421A81305211E0006240200000000082111"
+                "010A2100000C20016620036720016821A800A0210000A12000A22000A32000A42000A5"
+                "2000"
+            ),
+        ),
+    ),
+    "aqara.feeder.acn001": XiaomiPayloads(
+        zhaquirks.xiaomi.aqara.feeder_acn001.AqaraFeederAcn001,
+        "opple_cluster",
+        (
+            b"\x1c_\x11f\n\xf1\xffA\t\x00\x05\x01\x04\x15\x00U\x01\x01",
+            b"\x1c_\x11l\n\xf1\xffA\x0c\x00\x05\xd0\x04\x15\x02\xbc\x040203",
+            b"\x1c_\x11m\n\xf1\xffA\n\x00\x05\xd1\rh\x00U\x02\x00!",
+            b"\x1c_\x11n\n\xf1\xffA\x0c\x00\x05\xd2\ri\x00U\x04\x00\x00\x01\x08",
+            b"\x1c_\x11o\n\xf1\xffA\t\x00\x05\xd3\r\x0b\x00U\x01\x00",
+            b"\x1c_\x11p\n\xf1\xffA\t\x00\x05\x05\x04\x16\x00U\x01\x01",
+            b"\x1c_\x11r\n\xf1\xffA\t\x00\x05\t\x04\x17\x00U\x01\x01",
+            b"\x1c_\x11s\n\xf1\xffA\t\x00\x05\x0b\x04\x18\x00U\x01\x01",
+            b"\x1c_\x11u\n\xf1\xffA\t\x00\x05\x0f\x0e_\x00U\x01\x06",
+            b"\x1c_\x11v\n\xf1\xffA\t\x00\x05\x11\x0e\\\x00U\x01\x02",
+            b"\x1c_\x11{\n\xf7\x00A\x0e\x05!\x0e\x00\r#!%\x00\x00\t!\x02\x03",
+            b"\x1c_\x11}\n\xf1\xffA(\x00\x05\x15\x08\x00\x08\xc8 "
+            b"7F09000100,7F0D000100,7F13000100",
+        ),
+    ),
+    "lumi.airrtc.agl001": XiaomiPayloads(
+        zhaquirks.xiaomi.aqara.thermostat_agl001.AGL001,
+        "opple_cluster",
+        (
+            # system mode
+            b"\x1c_\x11\x80\n\x71\x02\x20\x01",
+            # schedule settings
+            b"\x1c_\x11\x81\n\x76\x02\x41\x1a\x04>\x01\xe0\x00\x00\t`\x048\x00\x00"
+            b"\x06\xa4\x05d\x00\x00\x08\x98\x81\xe0\x00\x00\x08\x98",
+        ),
+    ),
+}
+
+
+def mutate_payload(payload: bytes, rng: random.Random) -> bytes:
+    """Apply one to three random mutations to a payload."""
+    data = bytearray(payload)
+
+    for _ in range(rng.randint(1, 3)):
+        if not data:
+            break
+
+        pos = rng.randrange(len(data))
+        mutation = rng.randrange(5)
+
+        if mutation == 0:
+            # wrong length or value byte
+            data[pos] = (data[pos] + rng.choice((-1, 1))) & 0xFF
+        elif mutation == 1:
+            data[pos] = rng.randrange(256)
+        elif mutation == 2:
+            del data[pos:]
+        elif mutation == 3:
+            data[pos:pos] = data[pos : pos + rng.randint(1, 16)]
+        else:
+            data.insert(pos, rng.randrange(256))
+
+    return bytes(data)
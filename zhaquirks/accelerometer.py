@@ -0,0 +1,193 @@
+"""Batched accelerometer samples for vibration and multi sensors."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Sequence
+import math
+from typing import Any, ClassVar
+
+from zigpy.quirks import CustomCluster
+
+from zhaquirks.const import ZHA_SEND_EVENT
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ACCELERATION_SUMMARY = "acceleration_summary"
+
+# Batches smaller than this are faster in pure Python than with NumPy
+NUMPY_MIN_BATCH = 16
+
+
+def _tilt_angles_python(
+    samples: Sequence[tuple[float, float, float]],
+) -> list[tuple[int, int, int]]:
+    angles = []
+    sqrt, atan2, scale = math.sqrt, math.atan2, 180 / math.pi
+
+    for x, y, z in samples:
+        xx, yy, zz = x * x, y * y, z * z
+        angles.append(
+            (
+                round(atan2(x, sqrt(yy + zz)) * scale),
+                round(atan2(y, sqrt(xx + zz)) * scale),
+                round(atan2(z, sqrt(xx + yy)) * scale),
+            )
+        )
+
+    return angles
+
+
+def _tilt_angles_numpy(
+    samples: Sequence[tuple[float, float, float]],
+) -> list[tuple[int, int, int]]:
+    axes = np.asarray(samples, dtype=np.float64)
+    squares = axes * axes
+    others = np.sqrt(squares.sum(axis=1, keepdims=True) - squares)
+    angles = np.rint(np.degrees(np.arctan2(axes, others))).astype(np.int64)
+
+    return [tuple(sample) for sample in angles.tolist()]
+
+
+def tilt_angles(
+    samples: Sequence[tuple[float, float, float]],
+) -> list[tuple[int, int, int]]:
+    """Return the tilt angles of the x, y and z axes in degrees for raw samples."""
+    if np is not None and len(samples) >= NUMPY_MIN_BATCH:
+        return _tilt_angles_numpy(samples)
+
+    return _tilt_angles_python(samples)
+
+
+class AccelerometerStream:
+    """Buffer of raw x/y/z samples which are summarized in batches.
+
+    Tilt angles are computed for the whole batch when it's flushed, which happens
+    `summary_interval` seconds after the first sample or when `max_samples` samples
+    are buffered. The summary is passed to the callback.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[dict[str, Any]], Any],
+        *,
+        summary_interval: float = 5.0,
+        max_samples: int = 64,
+    ) -> None:
+        """Init."""
+        self._callback = callback
+        self.summary_interval = summary_interval
+        self.max_samples = max_samples
+        self._samples: list[tuple[float, float, float]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self.summaries_sent = 0
+
+    def __len__(self) -> int:
+        """Return the number of buffered samples."""
+        return len(self._samples)
+
+    def append(self, x: float, y: float, z: float) -> None:
+        """Buffer a raw sample."""
+        self._samples.append((x, y, z))
+
+        if len(self._samples) >= self.max_samples:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.summary_interval, self.flush
+            )
+
+    def flush(self) -> dict[str, Any] | None:
+        """Summarize the buffered samples and pass the summary to the callback."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if not self._samples:
+            return None
+
+        samples, self._samples = self._samples, []
+        angles = tilt_angles(samples)
+        x, y, z = samples[-1]
+        angle_x, angle_y, angle_z = angles[-1]
+        angles_x, angles_y, angles_z = zip(*angles)
+
+        summary = {
+            "samples": len(samples),
+            "rawValueX": x,
+            "rawValueY": y,
+            "rawValueZ": z,
+            "X": angle_x,
+            "Y": angle_y,
+            "Z": angle_z,
+            "min": {"X": min(angles_x), "Y": min(angles_y), "Z": min(angles_z)},
+            "max": {"X": max(angles_x), "Y": max(angles_y), "Z": max(angles_z)},
+        }
+
+        self.summaries_sent += 1
+        self._callback(summary)
+        return summary
+
+    def close(self) -> None:
+        """Drop the buffered samples and stop the flush timer."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        self._samples.clear()
+
+
+class AccelerometerStreamCluster(CustomCluster):
+    """Cluster with an opt-in stream of its raw acceleration reports.
+
+    Set axis_attributes to the x, y and z attribute ids. A sample is added to the
+    stream once all three axes were reported.
+    """
+
+    axis_attributes: ClassVar[tuple[int, ...]] = ()
+    stream_event: ClassVar[str] = ACCELERATION_SUMMARY
+
+    def __init__(self, *args, **kwargs):
+        """Init."""
+        super().__init__(*args, **kwargs)
+        self.stream: AccelerometerStream | None = None
+        self._pending_axes: dict[int, Any] = {}
+
+    def enable_stream(
+        self, summary_interval: float = 5.0, max_samples: int = 64
+    ) -> AccelerometerStream:
+        """Start buffering raw samples and send summaries instead."""
+        self.disable_stream()
+        self.stream = AccelerometerStream(
+            self.send_stream_summary,
+            summary_interval=summary_interval,
+            max_samples=max_samples,
+        )
+        return self.stream
+
+    def disable_stream(self) -> None:
+        """Stop buffering raw samples."""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+        self._pending_axes.clear()
+
+    def send_stream_summary(self, summary: dict[str, Any]) -> None:
+        """Send a summary of the buffered samples."""
+        self.listener_event(ZHA_SEND_EVENT, self.stream_event, summary)
+
+    def _update_attribute(self, attrid: int, value: Any) -> None:
+        super()._update_attribute(attrid, value)
+
+        if self.stream is None or attrid not in self.axis_attributes:
+            return
+
+        self._pending_axes[attrid] = value
+        if len(self._pending_axes) == len(self.axis_attributes):
+            self.stream.append(
+                *(self._pending_axes.pop(axis) for axis in self.axis_attributes)
+            )
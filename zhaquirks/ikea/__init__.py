@@ -9,6 +9,7 @@ from zigpy.zcl.clusters.general import Basic, PowerConfiguration, Scenes
 
 from zhaquirks import EventableCluster
 from zhaquirks.const import BatterySize
+from zhaquirks.tasks import DeviceTaskMixin
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -199,7 +200,9 @@ class PowerConfig1CRXCluster(CustomCluster, PowerConfiguration):
 # doubling IKEA power configuration clusters:
 
 
-class DoublingPowerConfigClusterIKEA(CustomCluster, PowerConfiguration):
+class DoublingPowerConfigClusterIKEA(
+    DeviceTaskMixin, CustomCluster, PowerConfiguration
+):
     """PowerConfiguration cluster implementation for IKEA devices.
 
     This implementation doubles battery pct remaining for IKEA devices with old firmware.
@@ -0,0 +1,170 @@
+"""Multi-press and hold detection for remote buttons."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Hashable
+import math
+from typing import Any
+
+# Seconds between releases which still count as the same multi-press
+MULTI_PRESS_THRESHOLD = 0.3
+# Seconds a button has to be down to be held
+HOLD_THRESHOLD = 1.0
+
+
+class _ButtonState:
+    """Multi-press state of a single button."""
+
+    __slots__ = (
+        "context",
+        "deadline",
+        "down",
+        "handle",
+        "handle_when",
+        "held",
+        "presses",
+    )
+
+    def __init__(self) -> None:
+        self.presses = 0
+        self.down = False
+        self.held = False
+        self.context: Any = None
+        self.deadline = 0.0
+        self.handle: asyncio.TimerHandle | None = None
+        self.handle_when = math.inf
+
+
+class MultiPressDetector:
+    """Derive multi-press and hold events from the presses of many buttons.
+
+    Buttons are identified by a key and only have state while a press sequence is
+    in progress. Remotes which only report releases call `click`, remotes which
+    report the button going down and up call `press` and `release`. Once a button
+    was released for `press_threshold` seconds, `on_presses` is called with the key,
+    the number of presses and the context of the last press. A button which is down
+    for `hold_threshold` seconds calls `on_hold` instead.
+
+    Each button has at most one event loop timer. Pressing a button again only
+    moves its deadline; the timer is moved once it expires early.
+    """
+
+    def __init__(
+        self,
+        on_presses: Callable[[Hashable, int, Any], Any],
+        *,
+        on_hold: Callable[[Hashable, Any], Any] | None = None,
+        press_threshold: float = MULTI_PRESS_THRESHOLD,
+        hold_threshold: float = HOLD_THRESHOLD,
+        max_presses: int | None = None,
+    ) -> None:
+        """Init."""
+        self._on_presses = on_presses
+        self._on_hold = on_hold
+        self.press_threshold = press_threshold
+        self.hold_threshold = hold_threshold
+        self.max_presses = max_presses
+        self._buttons: dict[Hashable, _ButtonState] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.sequences_reported = 0
+
+    def __len__(self) -> int:
+        """Return the number of buttons with a press sequence in progress."""
+        return len(self._buttons)
+
+    def click(self, key: Hashable, context: Any = None) -> None:
+        """Count a short press of a button."""
+        state = self._buttons.get(key)
+        if state is None:
+            state = self._buttons[key] = _ButtonState()
+
+        state.presses += 1
+        state.down = False
+        state.context = context
+
+        if self.max_presses is not None and state.presses >= self.max_presses:
+            self._report(key, state)
+        else:
+            self._arm(key, state, self.press_threshold)
+
+    def press(self, key: Hashable, context: Any = None) -> None:
+        """Handle a button going down."""
+        state = self._buttons.get(key)
+        if state is None:
+            state = self._buttons[key] = _ButtonState()
+
+        state.down = True
+        state.held = False
+        state.context = context
+        self._arm(key, state, self.hold_threshold)
+
+    def release(self, key: Hashable, context: Any = None) -> bool:
+        """Handle a button going up, return if it was a short press."""
+        state = self._buttons.get(key)
+        if state is not None and state.held:
+            self._drop(key, state)
+            return False
+
+        self.click(key, context)
+        return True
+
+    def flush(self) -> None:
+        """Report all pending press sequences right away."""
+        for key, state in list(self._buttons.items()):
+            if state.presses and not state.down:
+                self._report(key, state)
+
+    def cancel(self) -> None:
+        """Drop all pending press sequences."""
+        for key, state in list(self._buttons.items()):
+            self._drop(key, state)
+
+    def _arm(self, key: Hashable, state: _ButtonState, delay: float) -> None:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+
+        state.deadline = self._loop.time() + delay
+
+        # a later deadline is picked up when the pending timer expires
+        if state.deadline < state.handle_when:
+            self._schedule(key, state)
+
+    def _schedule(self, key: Hashable, state: _ButtonState) -> None:
+        if state.handle is not None:
+            state.handle.cancel()
+
+        state.handle_when = state.deadline
+        state.handle = self._loop.call_at(state.deadline, self._expire, key)
+
+    def _expire(self, key: Hashable) -> None:
+        state = self._buttons[key]
+        when = state.handle_when
+        state.handle = None
+        state.handle_when = math.inf
+
+        if state.deadline > when:
+            self._schedule(key, state)
+        elif not state.down:
+            self._report(key, state)
+        elif not state.held:
+            if state.presses:
+                self._on_presses(key, state.presses, state.context)
+                self.sequences_reported += 1
+                state.presses = 0
+
+            state.held = True
+            if self._on_hold is not None:
+                self._on_hold(key, state.context)
+
+    def _report(self, key: Hashable, state: _ButtonState) -> None:
+        presses, context = state.presses, state.context
+        self._drop(key, state)
+        self.sequences_reported += 1
+        self._on_presses(key, presses, context)
+
+    def _drop(self, key: Hashable, state: _ButtonState) -> None:
+        if state.handle is not None:
+            state.handle.cancel()
+
+        del self._buttons[key]
@@ -1,9 +1,7 @@
 """Module for Philips quirks implementations."""
 
-import asyncio
 import itertools
 import logging
-import time
 from typing import Any, Final, Optional, Union
 
 from zigpy.quirks import CustomCluster
@@ -42,6 +40,7 @@ from zhaquirks.const import (
     TURN_ON,
     ZHA_SEND_EVENT,
 )
+from zhaquirks.multipress import MultiPressDetector
 
 PHILIPS = "Philips"
 SIGNIFY = "Signify Netherlands B.V."
@@ -79,34 +78,6 @@ class PhilipsBasicCluster(CustomCluster, Basic):
         await self.write_attributes(self.attr_config, manufacturer=0x100B)
 
 
-class ButtonPressQueue:
-    """Philips button queue to derive multiple press events."""
-
-    def __init__(self):
-        """Init."""
-        self._ms_threshold = 300
-        self._ms_last_click = 0
-        self._click_counter = 1
-        self._callback = lambda x: None
-        self._task = None
-
-    async def _job(self):
-        await asyncio.sleep(self._ms_threshold / 1000)
-        self._callback(self._click_counter)
-
-    def press(self, callback):
-        """Process a button press."""
-        self._callback = callback
-        now_ms = time.time() * 1000
-        if now_ms - self._ms_last_click > self._ms_threshold:
-            self._click_counter = 1
-        else:
-            self._task.cancel()
-            self._click_counter += 1
-        self._ms_last_click = now_ms
-        self._task = asyncio.ensure_future(self._job())
-
-
 class Button:
     """Represents a remote button, including string literals used in triggers and actions."""
 
@@ -184,10 +155,15 @@ class PhilipsRemoteCluster(CustomCluster):
         PressType(SHORT_RELEASE, COMMAND_M_SHORT_RELEASE),
     ]
 
+    # Seconds between short releases which still count as the same multi-press
+    MULTI_PRESS_THRESHOLD: float = 0.3
+
     def __init__(self, endpoint, is_server=True):
-        """Initialize button press queue for each button."""
+        """Initialize the multi-press detector shared by all buttons."""
         super().__init__(endpoint, is_server)
-        self.button_press_queue = {k: ButtonPressQueue() for k in self.BUTTONS}
+        self.multi_press = MultiPressDetector(
+            self.send_press_event, press_threshold=self.MULTI_PRESS_THRESHOLD
+        )
 
     def handle_cluster_request(
         self,
@@ -254,67 +230,68 @@ class PhilipsRemoteCluster(CustomCluster):
             ARGS: args,
         }
 
-        def send_press_event(click_count):
+        # Derive Multiple Presses
+        if press_type.name == SHORT_RELEASE:
             _LOGGER.debug(
-                "%s - send_press_event click_count: [%s]",
+                "%s - handle_cluster_request handling short release. Push to multi-press detector for button %s",
                 self.__class__.__name__,
-                click_count,
+                args[0],
             )
-            press_type = None
-            if click_count == 1:
-                press_type = self.PRESS_TYPES.get(0) or self.SIMULATE_SHORT_EVENTS[0]
-            elif click_count > 1:
-                press_type = self.MULTI_PRESS_EVENTS[min(click_count, 5)]
+            self.multi_press.click(args[0], (button, event_args))
+        else:
+            action = f"{button.action}_{press_type.action}"
+            self.listener_event(ZHA_SEND_EVENT, action, event_args)
+
+    def send_press_event(
+        self, button_id: int, click_count: int, context: tuple[Button, dict[str, Any]]
+    ) -> None:
+        """Send the event of a single or multi-press of a button."""
+        button, event_args = context
+        _LOGGER.debug(
+            "%s - send_press_event click_count: [%s]",
+            self.__class__.__name__,
+            click_count,
+        )
+        press_type = None
+        if click_count == 1:
+            press_type = self.PRESS_TYPES.get(0) or self.SIMULATE_SHORT_EVENTS[0]
+        elif click_count > 1:
+            press_type = self.MULTI_PRESS_EVENTS[min(click_count, 5)]
 
+        _LOGGER.debug(
+            "%s - send_press_event evaluated press_type: [%s]",
+            self.__class__.__name__,
+            press_type,
+        )
+        if press_type is not None:
+            # Override PRESS_TYPE
+            event_args[PRESS_TYPE] = press_type.arg
+            event_args[ARGS] = list(event_args[ARGS])
+            event_args[ARGS][2] = 0 if click_count < 2 else 2 + min(click_count, 5)
+            action = f"{button.action}_{press_type.action}"
             _LOGGER.debug(
-                "%s - send_press_event evaluated press_type: [%s]",
+                "%s - send_press_event emitting action: [%s] event_args: %s",
                 self.__class__.__name__,
-                press_type,
+                action,
+                event_args,
             )
-            if press_type is not None:
-                # Override PRESS_TYPE
-                event_args[PRESS_TYPE] = press_type.arg
-                event_args[ARGS] = list(event_args[ARGS])
-                event_args[ARGS][2] = 0 if click_count < 2 else 2 + min(click_count, 5)
-                action = f"{button.action}_{press_type.action}"
-                _LOGGER.debug(
-                    "%s - send_press_event emitting action: [%s] event_args: %s",
-                    self.__class__.__name__,
-                    action,
-                    event_args,
-                )
-                self.listener_event(ZHA_SEND_EVENT, action, event_args)
-
-            # simulate short release event, if needed for this device type
-            if (
-                press_type.name == SHORT_PRESS
-                and self.SIMULATE_SHORT_EVENTS is not None
-            ):
-                press_type = self.PRESS_TYPES.get(2) or self.SIMULATE_SHORT_EVENTS[1]
-                sim_event_args = event_args.copy()
-                sim_event_args[PRESS_TYPE] = press_type.arg
-                sim_event_args[ARGS] = sim_event_args[ARGS].copy()
-                sim_event_args[ARGS][2] = 2
-                action = f"{button.action}_{press_type.action}"
-                _LOGGER.debug(
-                    "%s - send_press_event emitting simulated action: [%s], event_args: %s",
-                    self.__class__.__name__,
-                    action,
-                    sim_event_args,
-                )
-                self.listener_event(ZHA_SEND_EVENT, action, sim_event_args)
+            self.listener_event(ZHA_SEND_EVENT, action, event_args)
 
-        # Derive Multiple Presses
-        if press_type.name == SHORT_RELEASE:
+        # simulate short release event, if needed for this device type
+        if press_type.name == SHORT_PRESS and self.SIMULATE_SHORT_EVENTS is not None:
+            press_type = self.PRESS_TYPES.get(2) or self.SIMULATE_SHORT_EVENTS[1]
+            sim_event_args = event_args.copy()
+            sim_event_args[PRESS_TYPE] = press_type.arg
+            sim_event_args[ARGS] = sim_event_args[ARGS].copy()
+            sim_event_args[ARGS][2] = 2
+            action = f"{button.action}_{press_type.action}"
             _LOGGER.debug(
-                "%s - handle_cluster_request handling short release. Push to button press queue for button %s",
+                "%s - send_press_event emitting simulated action: [%s], event_args: %s",
                 self.__class__.__name__,
-                args[0],
+                action,
+                sim_event_args,
             )
-            self.button_press_queue[args[0]].press(send_press_event)
-        else:
-            action = f"{button.action}_{press_type.action}"
-            self.listener_event(ZHA_SEND_EVENT, action, event_args)
+            self.listener_event(ZHA_SEND_EVENT, action, sim_event_args)
 
     @classmethod
     def generate_device_automation_triggers(cls, additional=None):
@@ -5,11 +5,13 @@ import zigpy.types as t
 from zigpy.zcl import foundation
 from zigpy.zcl.clusters.security import IasZone
 
+from zhaquirks.accelerometer import AccelerometerStreamCluster
+
 SMART_THINGS = "SmartThings"
 MANUFACTURER_SPECIFIC_CLUSTER_ID = 0xFC02  # decimal = 64514
 
 
-class SmartThingsAccelCluster(CustomCluster):
+class SmartThingsAccelCluster(AccelerometerStreamCluster):
     """SmartThings Acceleration Cluster."""
 
     cluster_id = MANUFACTURER_SPECIFIC_CLUSTER_ID
@@ -23,6 +25,7 @@ class SmartThingsAccelCluster(CustomCluster):
         0x0013: ("y_axis", t.int16s, True),
         0x0014: ("z_axis", t.int16s, True),
     }
+    axis_attributes = (0x0012, 0x0013, 0x0014)
 
 
 class SmartThingsIasZone(CustomCluster, IasZone):
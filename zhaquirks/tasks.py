@@ -0,0 +1,173 @@
+"""Background tasks of quirked devices."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any
+import weakref
+
+import zigpy.device
+import zigpy.types as t
+
+# Quirks can lower this with a max_concurrent_tasks attribute on the device
+DEFAULT_MAX_CONCURRENT_TASKS = 4
+
+
+class DeviceTaskGroup:
+    """Fire-and-forget tasks of a single device with bounded concurrency.
+
+    At most `max_concurrency` tasks run at the same time, others wait for a free
+    slot in creation order. All tasks are cancelled when the device is removed or
+    replaced by a newly joined device with the same ieee.
+    """
+
+    def __init__(
+        self,
+        ieee: t.EUI64,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_TASKS,
+        application: Any | None = None,
+    ) -> None:
+        """Init."""
+        self.ieee = ieee
+        self.max_concurrency = max_concurrency
+        self.closed = False
+        self._application = application
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: dict[asyncio.Task, Coroutine[Any, Any, Any]] = {}
+        self.running = 0
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.run_time_total = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of running and waiting tasks."""
+        return len(self._tasks)
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of tasks waiting for a free slot."""
+        return len(self._tasks) - self.running
+
+    def create_task(
+        self, target: Coroutine[Any, Any, Any], name: str | None = None
+    ) -> asyncio.Task:
+        """Run the coroutine once a slot is free."""
+        loop = asyncio.get_running_loop()
+        task = loop.create_task(self._run(target, loop.time()), name=name)
+
+        self.started += 1
+        self._tasks[task] = target
+        task.add_done_callback(self._task_done)
+
+        return task
+
+    async def _run(self, target: Coroutine[Any, Any, Any], queued: float) -> Any:
+        loop = asyncio.get_running_loop()
+
+        async with self._semaphore:
+            started = loop.time()
+            wait = started - queued
+            self.queue_wait_total += wait
+            self.queue_wait_max = max(self.queue_wait_max, wait)
+
+            self.running += 1
+            try:
+                return await target
+            finally:
+                self.running -= 1
+                self.run_time_total += loop.time() - started
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        # tasks cancelled while waiting never started their coroutine
+        self._tasks.pop(task).close()
+
+        # catching tasks swallow the CancelledError, but remain cancelling
+        if task.cancelled() or task.cancelling():
+            self.cancelled += 1
+        else:
+            self.completed += 1
+
+    def cancel(self) -> None:
+        """Cancel all running and waiting tasks and stop listening for devices."""
+        self.closed = True
+        for task in self._tasks:
+            task.cancel()
+
+        if self._application is not None:
+            self._application.remove_listener(self)
+            self._application = None
+
+    async def join(self) -> None:
+        """Wait for all tasks, including the ones created while waiting."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def device_removed(self, device: zigpy.device.Device) -> None:
+        """Cancel the tasks of a removed device."""
+        if device.ieee != self.ieee:
+            return
+
+        self.cancel()
+        DEVICE_TASK_GROUPS.pop(device, None)
+
+    def device_initialized(self, device: zigpy.device.Device) -> None:
+        """Cancel the tasks of a device replaced by a new one."""
+        if device.ieee != self.ieee or DEVICE_TASK_GROUPS.get(device) is self:
+            return
+
+        self.cancel()
+
+
+DEVICE_TASK_GROUPS: weakref.WeakKeyDictionary[zigpy.device.Device, DeviceTaskGroup] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_device_task_group(device: zigpy.device.Device) -> DeviceTaskGroup:
+    """Return the task group of the device."""
+    group = DEVICE_TASK_GROUPS.get(device)
+    if group is not None and not group.closed:
+        return group
+
+    group = DEVICE_TASK_GROUPS[device] = DeviceTaskGroup(
+        device.ieee,
+        getattr(device, "max_concurrent_tasks", DEFAULT_MAX_CONCURRENT_TASKS),
+        device.application,
+    )
+    device.application.add_listener(group)
+
+    return group
+
+
+class DeviceTaskMixin:
+    """Cluster mixin running its catching tasks in the task group of its device."""
+
+    def create_catching_task(
+        self,
+        target: Coroutine[Any, Any, Any],
+        exceptions: type[Exception] | tuple | None = None,
+        name: str | None = None,
+    ) -> None:
+        """Create a task in the task group of the device."""
+        group = get_device_task_group(self.endpoint.device)
+        group.create_task(
+            self.catching_coro(_run_in_group(group, target), exceptions), name=name
+        )
+
+
+async def _run_in_group(
+    group: DeviceTaskGroup, target: Coroutine[Any, Any, Any]
+) -> Any:
+    """Run a task of the group, cancelling the group is not logged as an error."""
+    try:
+        return await target
+    except asyncio.CancelledError:
+        if not group.closed:
+            raise
+
+    return None
@@ -6,7 +6,7 @@ import zigpy.types as t
 from zigpy.zcl.clusters.general import Basic, Ota, PowerConfiguration
 from zigpy.zcl.clusters.security import IasZone
 
-from zhaquirks import CustomCluster
+from zhaquirks.accelerometer import AccelerometerStreamCluster
 from zhaquirks.const import (
     DEVICE_TYPE,
     ENDPOINTS,
@@ -20,7 +20,7 @@ from zhaquirks.thirdreality import THIRD_REALITY
 MANUFACTURER_SPECIFIC_CLUSTER_ID = 0xFFF1
 
 
-class ThirdRealityAccelCluster(CustomCluster):
+class ThirdRealityAccelCluster(AccelerometerStreamCluster):
     """ThirdReality Acceleration Cluster."""
 
     cluster_id = MANUFACTURER_SPECIFIC_CLUSTER_ID
@@ -29,6 +29,7 @@ class ThirdRealityAccelCluster(CustomCluster):
         0x0002: ("y_axis", t.int16s, True),
         0x0003: ("z_axis", t.int16s, True),
     }
+    axis_attributes = (0x0001, 0x0002, 0x0003)
 
 
 class Vibrate(CustomDevice):
@@ -0,0 +1,130 @@
+"""Shared coarse-grained timers for self resetting clusters."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Hashable
+import heapq
+import logging
+import math
+import weakref
+
+_LOGGER = logging.getLogger(__name__)
+
+# Deadlines are rounded up to this many seconds so timers expire in batches
+TIMER_WHEEL_RESOLUTION = 0.25
+
+
+class TimerWheel:
+    """Deadlines of many timers served by a single event loop timer.
+
+    Every timer is identified by a key, usually the cluster owning it. Scheduling
+    a key which is already pending moves its deadline, which is a dictionary
+    update instead of cancelling a timer handle and pushing a new one onto the
+    event loop heap. Deadlines are grouped in slots of `resolution` seconds and all
+    timers of a slot expire together, never early and at most `resolution` late.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        resolution: float = TIMER_WHEEL_RESOLUTION,
+    ) -> None:
+        """Init."""
+        self._loop = loop
+        self.resolution = resolution
+        self._deadlines: dict[Hashable, tuple[float, Callable[[], None]]] = {}
+        # slot -> keys whose deadline was in it when they were scheduled
+        self._slots: dict[int, set[Hashable]] = {}
+        self._slot_heap: list[int] = []
+        self._handle: asyncio.Handle | None = None
+        self._handle_when: float = math.inf
+        self.expired = 0
+
+    def __len__(self) -> int:
+        """Return the number of pending timers."""
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return if a timer is pending for the key."""
+        return key in self._deadlines
+
+    def schedule(
+        self, key: Hashable, delay: float, callback: Callable[[], None]
+    ) -> None:
+        """Call the callback after `delay` seconds, replacing a pending timer."""
+        now = self._loop.time()
+        deadline = now + delay
+        self._deadlines[key] = (deadline, callback)
+
+        if delay <= 0:
+            # expired timers don't wait for the end of their slot
+            slot = math.floor(deadline / self.resolution)
+            when = now
+        else:
+            slot = math.ceil(deadline / self.resolution)
+            when = slot * self.resolution
+
+        keys = self._slots.get(slot)
+        if keys is None:
+            keys = self._slots[slot] = set()
+            heapq.heappush(self._slot_heap, slot)
+        keys.add(key)
+
+        if when < self._handle_when:
+            self._reschedule(when)
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancel the timer of the key, return if it was pending."""
+        return self._deadlines.pop(key, None) is not None
+
+    def _reschedule(self, when: float) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+
+        self._handle_when = when
+        self._handle = self._loop.call_at(when, self._expire)
+
+    def _expire(self) -> None:
+        self._handle = None
+        self._handle_when = math.inf
+
+        now = self._loop.time()
+        current = math.floor(now / self.resolution)
+        due = []
+
+        while self._slot_heap and self._slot_heap[0] <= current:
+            for key in self._slots.pop(heapq.heappop(self._slot_heap)):
+                # keys which were rescheduled later are also in a later slot
+                entry = self._deadlines.get(key)
+                if entry is not None and entry[0] <= now:
+                    del self._deadlines[key]
+                    due.append(entry)
+
+        due.sort(key=lambda entry: entry[0])
+        self.expired += len(due)
+
+        for _, callback in due:
+            try:
+                callback()
+            except Exception:
+                _LOGGER.exception("Error calling timer callback %r", callback)
+
+        if self._slot_heap:
+            self._reschedule(self._slot_heap[0] * self.resolution)
+
+
+_TIMER_WHEELS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, TimerWheel] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_timer_wheel() -> TimerWheel:
+    """Return the timer wheel of the running event loop."""
+    loop = asyncio.get_running_loop()
+
+    try:
+        return _TIMER_WHEELS[loop]
+    except KeyError:
+        wheel = _TIMER_WHEELS[loop] = TimerWheel(loop)
+        return wheel
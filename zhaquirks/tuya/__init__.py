@@ -1,12 +1,16 @@
 """Tuya devices."""
 
+import asyncio
 from collections.abc import Callable
 import dataclasses
 import datetime
 import enum
+import functools
 import logging
+import random
 from typing import Any, Optional, Union
 
+import zigpy.exceptions
 from zigpy.quirks import BaseCustomDevice, CustomCluster, CustomDevice
 import zigpy.types as t
 from zigpy.zcl import BaseAttributeDefs, foundation
@@ -26,6 +30,7 @@ from zhaquirks.const import (
     ZHA_SEND_EVENT,
     BatterySize,
 )
+from zhaquirks.tasks import DeviceTaskMixin
 
 # ---------------------------------------------------------
 # Tuya Custom Cluster ID
@@ -313,7 +318,7 @@ class NoManufacturerCluster(CustomCluster):
         )
 
 
-class TuyaManufCluster(CustomCluster):
+class TuyaManufCluster(DeviceTaskMixin, CustomCluster):
     """Tuya manufacturer specific cluster."""
 
     name = "Tuya Manufacturer Specicific"
@@ -539,6 +544,7 @@ class BaseEnchantedDevice(BaseCustomDevice):
     # These values can be overridden from a quirk to enable (or disable) additional Tuya spells:
     tuya_spell_read_attributes: bool = True  # spell reading attributes on Basic cluster
     tuya_spell_data_query: bool = False  # additional spell needed for some devices
+    tuya_data_query_refresh: bool = False  # periodically repeat the data query
 
     async def apply_custom_configuration(self, *args, **kwargs):
         """Hooks device configuration to apply custom configuration."""
@@ -547,6 +553,10 @@ class BaseEnchantedDevice(BaseCustomDevice):
             await self.spell_attribute_reads()
         if self.tuya_spell_data_query:
             await self.spell_data_query()
+        if self.tuya_data_query_refresh:
+            cluster = self.endpoints[1].in_clusters.get(TuyaNewManufCluster.cluster_id)
+            if isinstance(cluster, TuyaNewManufCluster):
+                cluster.start_data_query_refresh()
 
         # also apply custom configuration to clusters if defined
         await super().apply_custom_configuration(*args, **kwargs)
@@ -1475,7 +1485,464 @@ class AttributeWithMask:
     mask: int
 
 
-class TuyaNewManufCluster(CustomCluster):
+@dataclasses.dataclass
+class TuyaUnknownDatapoint:
+    """Statistics for a datapoint received without a datapoint handler."""
+
+    dp: int
+    dp_type: TuyaDPType
+    count: int = 0
+    raw_lengths: dict[int, int] = dataclasses.field(default_factory=dict)
+    raw_lengths_overflow: int = 0
+    last_raw: bytes = b""
+    last_seen: Optional[datetime.datetime] = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable representation for diagnostics."""
+        return {
+            "dp": self.dp,
+            "dp_type": self.dp_type.name,
+            "count": self.count,
+            "raw_lengths": dict(sorted(self.raw_lengths.items())),
+            "raw_lengths_overflow": self.raw_lengths_overflow,
+            "last_raw": self.last_raw.hex(),
+            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+        }
+
+
+class TuyaUnknownDatapointStats:
+    """Per device statistics collector for unmapped Tuya datapoints.
+
+    Memory is bounded: datapoint ids are a single byte and at most
+    MAX_RAW_LENGTHS distinct raw lengths are tracked per datapoint, any
+    other length is only counted in raw_lengths_overflow.
+    """
+
+    MAX_RAW_LENGTHS = 8
+
+    def __init__(self) -> None:
+        """Init the statistics collector."""
+        self._datapoints: dict[int, TuyaUnknownDatapoint] = {}
+
+    def __len__(self) -> int:
+        """Return the number of distinct unknown datapoints."""
+        return len(self._datapoints)
+
+    def __contains__(self, dp: int) -> bool:
+        """Return whether the datapoint has been seen."""
+        return dp in self._datapoints
+
+    def get(self, dp: int) -> Optional[TuyaUnknownDatapoint]:
+        """Return the statistics of a single datapoint."""
+        return self._datapoints.get(dp)
+
+    def record(self, datapoint: TuyaDatapointData) -> None:
+        """Record the reception of an unknown datapoint."""
+        data = datapoint.data
+        stats = self._datapoints.get(datapoint.dp)
+        if stats is None:
+            stats = self._datapoints[datapoint.dp] = TuyaUnknownDatapoint(
+                dp=datapoint.dp, dp_type=data.dp_type
+            )
+
+        raw_len = len(data.raw)
+        lengths = stats.raw_lengths
+        if raw_len in lengths:
+            lengths[raw_len] += 1
+        elif len(lengths) < self.MAX_RAW_LENGTHS:
+            lengths[raw_len] = 1
+        else:
+            stats.raw_lengths_overflow += 1
+
+        stats.count += 1
+        stats.dp_type = data.dp_type
+        stats.last_raw = bytes(data.raw)
+        stats.last_seen = datetime.datetime.now(datetime.UTC)
+
+    def clear(self) -> None:
+        """Reset all statistics."""
+        self._datapoints.clear()
+
+    def as_dict(self) -> dict[int, dict[str, Any]]:
+        """Return a diagnostic dump of all unknown datapoints, most frequent first."""
+        return {
+            stats.dp: stats.as_dict()
+            for stats in sorted(
+                self._datapoints.values(), key=lambda s: s.count, reverse=True
+            )
+        }
+
+
+@dataclasses.dataclass
+class TuyaDataQueryRefreshState:
+    """Data query refresh state of a single device."""
+
+    cluster: "TuyaNewManufCluster"
+    interval: float
+    reports_since_refresh: int = 0
+    query_sent: Optional[float] = None
+    last_report: Optional[datetime.datetime] = None
+    last_refresh: Optional[datetime.datetime] = None
+    next_refresh: Optional[datetime.datetime] = None
+    timer_handle: Optional[asyncio.TimerHandle] = None
+
+
+class TuyaDataQueryScheduler:
+    """Adaptive scheduler periodically sending the data query command to Tuya devices.
+
+    The refresh interval of a device grows while it keeps reporting on its own and
+    shrinks when it goes quiet. Reports received within query_reply_window seconds
+    of a query are replies to it and aren't counted. Refreshes are jittered and
+    spread out, so no more than max_queries_per_second queries are sent across all
+    registered devices.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 60,
+        max_interval: float = 3600,
+        initial_interval: float = 600,
+        growth: float = 2.0,
+        shrink: float = 0.5,
+        jitter: float = 0.1,
+        max_queries_per_second: float = 1.0,
+        query_reply_window: float = 10,
+    ) -> None:
+        """Init the scheduler."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.growth = growth
+        self.shrink = shrink
+        self.jitter = jitter
+        self.max_queries_per_second = max_queries_per_second
+        self.query_reply_window = query_reply_window
+        self._states: dict[t.EUI64, TuyaDataQueryRefreshState] = {}
+        self._next_slot: float = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of registered devices."""
+        return len(self._states)
+
+    def get_state(self, ieee: t.EUI64) -> Optional[TuyaDataQueryRefreshState]:
+        """Return the refresh state of a device."""
+        return self._states.get(ieee)
+
+    def register(self, cluster: "TuyaNewManufCluster") -> TuyaDataQueryRefreshState:
+        """Start refreshing the device the cluster belongs to."""
+        ieee = cluster.endpoint.device.ieee
+        self.unregister(ieee)
+        state = self._states[ieee] = TuyaDataQueryRefreshState(
+            cluster=cluster, interval=self.initial_interval
+        )
+        self._schedule(state, state.interval)
+        return state
+
+    def unregister(self, ieee: t.EUI64) -> None:
+        """Stop refreshing a device."""
+        state = self._states.pop(ieee, None)
+        if state is not None and state.timer_handle is not None:
+            state.timer_handle.cancel()
+            state.timer_handle = None
+
+    def report_received(self, cluster: "TuyaNewManufCluster") -> None:
+        """Note a report received from the device the cluster belongs to."""
+        state = self._states.get(cluster.endpoint.device.ieee)
+        if state is None or state.cluster is not cluster:
+            return
+        if (
+            state.query_sent is not None
+            and asyncio.get_running_loop().time() - state.query_sent
+            < self.query_reply_window
+        ):
+            return
+        state.reports_since_refresh += 1
+        state.last_report = datetime.datetime.now(datetime.UTC)
+
+    def _schedule(self, state: TuyaDataQueryRefreshState, delay: float) -> None:
+        if self.jitter:
+            delay += delay * random.uniform(-self.jitter, self.jitter)
+        state.next_refresh = datetime.datetime.now(datetime.UTC) + datetime.timedelta(
+            seconds=delay
+        )
+        state.timer_handle = asyncio.get_running_loop().call_later(
+            delay, self._refresh, state
+        )
+
+    def _refresh(self, state: TuyaDataQueryRefreshState) -> None:
+        state.timer_handle = None
+        device = state.cluster.endpoint.device
+        if self._states.get(device.ieee) is not state:
+            return
+        # stop refreshing devices which have been removed or replaced
+        if device.application.devices.get(device.ieee) is not device:
+            self.unregister(device.ieee)
+            return
+
+        if state.reports_since_refresh:
+            state.interval = min(state.interval * self.growth, self.max_interval)
+        else:
+            state.interval = max(state.interval * self.shrink, self.min_interval)
+        state.reports_since_refresh = 0
+
+        # spread the queries of all devices to respect the rate limit
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1 / self.max_queries_per_second
+        delay = slot - now
+        if delay > 0:
+            loop.call_later(delay, self._send, state)
+        else:
+            self._send(state)
+        self._schedule(state, state.interval + delay)
+
+    def _send(self, state: TuyaDataQueryRefreshState) -> None:
+        if self._states.get(state.cluster.endpoint.device.ieee) is not state:
+            return
+        state.last_refresh = datetime.datetime.now(datetime.UTC)
+        state.query_sent = asyncio.get_running_loop().time()
+        state.cluster.debug("Executing periodic data query")
+        state.cluster.create_catching_task(
+            state.cluster.command(TUYA_QUERY_DATA, expect_reply=False)
+        )
+
+
+TUYA_DATA_QUERY_SCHEDULER = TuyaDataQueryScheduler()
+
+
+@dataclasses.dataclass
+class TuyaMeteringPollState:
+    """Metering poll state of a single device."""
+
+    cluster: "TuyaZBElectricalMeasurementPolled"
+    interval: float
+    polls: int = 0
+    reports_since_poll: int = 0
+    polling: bool = False
+    last_power: Optional[int] = None
+    last_poll: Optional[datetime.datetime] = None
+    next_poll: Optional[datetime.datetime] = None
+    timer_handle: Optional[asyncio.TimerHandle] = None
+
+
+class TuyaMeteringPollScheduler:
+    """Adaptive scheduler polling the measurements of Tuya plugs.
+
+    A plug is polled every min_interval while its active power keeps changing by
+    at least power_threshold. The interval grows up to max_interval while the power
+    is stable, and plugs reporting on their own are polled at max_interval. Polls
+    are spread out, so no more than max_polls_per_second plugs are polled across
+    all registered devices.
+    """
+
+    ELECTRICAL_MEASUREMENT_ATTRIBUTES = ("active_power", "rms_current", "rms_voltage")
+    METERING_ATTRIBUTES = ("current_summ_delivered",)
+
+    def __init__(
+        self,
+        min_interval: float = 10,
+        max_interval: float = 300,
+        growth: float = 2.0,
+        power_threshold: int = 5,
+        jitter: float = 0.1,
+        max_polls_per_second: float = 2.0,
+    ) -> None:
+        """Init the scheduler."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.growth = growth
+        self.power_threshold = power_threshold
+        self.jitter = jitter
+        self.max_polls_per_second = max_polls_per_second
+        self._states: dict[tuple[t.EUI64, int], TuyaMeteringPollState] = {}
+        self._next_slot: float = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of registered devices."""
+        return len(self._states)
+
+    def get_state(
+        self, ieee: t.EUI64, endpoint_id: int = 1
+    ) -> Optional[TuyaMeteringPollState]:
+        """Return the poll state of a device endpoint."""
+        return self._states.get((ieee, endpoint_id))
+
+    @staticmethod
+    def _key(cluster: CustomCluster) -> tuple[t.EUI64, int]:
+        return cluster.endpoint.device.ieee, cluster.endpoint.endpoint_id
+
+    def register(
+        self, cluster: "TuyaZBElectricalMeasurementPolled"
+    ) -> TuyaMeteringPollState:
+        """Start polling the device endpoint the cluster belongs to."""
+        key = self._key(cluster)
+        self._cancel(self._states.pop(key, None))
+        state = self._states[key] = TuyaMeteringPollState(
+            cluster=cluster, interval=self.min_interval
+        )
+        self._schedule(state, state.interval)
+        return state
+
+    def unregister(self, ieee: t.EUI64) -> None:
+        """Stop polling all endpoints of a device."""
+        for key in [key for key in self._states if key[0] == ieee]:
+            self._cancel(self._states.pop(key))
+
+    @staticmethod
+    def _cancel(state: Optional[TuyaMeteringPollState]) -> None:
+        if state is not None and state.timer_handle is not None:
+            state.timer_handle.cancel()
+            state.timer_handle = None
+
+    def report_received(self, cluster: "TuyaZBElectricalMeasurementPolled") -> None:
+        """Note an attribute update of the cluster which wasn't polled."""
+        state = self._states.get(self._key(cluster))
+        if state is None or state.cluster is not cluster or state.polling:
+            return
+        state.reports_since_poll += 1
+
+    def _schedule(self, state: TuyaMeteringPollState, delay: float) -> None:
+        if self.jitter:
+            delay += delay * random.uniform(-self.jitter, self.jitter)
+        state.next_poll = datetime.datetime.now(datetime.UTC) + datetime.timedelta(
+            seconds=delay
+        )
+        state.timer_handle = asyncio.get_running_loop().call_later(
+            delay, self._poll, state
+        )
+
+    def _is_registered(self, state: TuyaMeteringPollState) -> bool:
+        device = state.cluster.endpoint.device
+        if self._states.get(self._key(state.cluster)) is not state:
+            return False
+        # stop polling devices which have been removed or replaced
+        if device.application.devices.get(device.ieee) is not device:
+            self.unregister(device.ieee)
+            return False
+        return True
+
+    def _poll(self, state: TuyaMeteringPollState) -> None:
+        state.timer_handle = None
+        if not self._is_registered(state):
+            return
+
+        # spread the polls of all devices to respect the rate limit
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1 / self.max_polls_per_second
+        state.timer_handle = loop.call_later(
+            slot - now,
+            lambda: state.cluster.create_catching_task(self._read(state)),
+        )
+
+    async def _read(self, state: TuyaMeteringPollState) -> None:
+        state.timer_handle = None
+        if not self._is_registered(state):
+            return
+        cluster = state.cluster
+        metering = getattr(cluster.endpoint, Metering.ep_attribute, None)
+
+        state.polling = True
+        state.last_poll = datetime.datetime.now(datetime.UTC)
+        try:
+            # one read request per cluster for all of its attributes
+            await cluster.read_attributes(
+                self.ELECTRICAL_MEASUREMENT_ATTRIBUTES, allow_cache=False
+            )
+            if metering is not None:
+                await metering.read_attributes(
+                    self.METERING_ATTRIBUTES, allow_cache=False
+                )
+        except (TimeoutError, zigpy.exceptions.ZigbeeException) as exc:
+            cluster.debug("Polling measurements failed: %r", exc)
+        finally:
+            state.polling = False
+        state.polls += 1
+
+        power = cluster.get("active_power")
+        if state.reports_since_poll:
+            state.interval = self.max_interval
+        elif power is None or state.last_power is None:
+            pass
+        elif abs(power - state.last_power) >= self.power_threshold:
+            state.interval = self.min_interval
+        else:
+            state.interval = min(state.interval * self.growth, self.max_interval)
+        state.reports_since_poll = 0
+        state.last_power = power
+
+        if self._is_registered(state):
+            self._schedule(state, state.interval)
+
+
+TUYA_METERING_POLL_SCHEDULER = TuyaMeteringPollScheduler()
+
+
+class TuyaZBElectricalMeasurementPolled(TuyaZBElectricalMeasurement):
+    """Electrical measurement of Tuya plugs which don't report, polled adaptively.
+
+    Quirks of plugs without reports opt in by using this cluster. Polling starts
+    once the cluster is bound or receives its first attribute update.
+    """
+
+    poll_scheduler: TuyaMeteringPollScheduler = TUYA_METERING_POLL_SCHEDULER
+
+    def _start_polling(self) -> bool:
+        """Register the cluster with the scheduler, return if it wasn't yet."""
+        state = self.poll_scheduler.get_state(
+            self.endpoint.device.ieee, self.endpoint.endpoint_id
+        )
+        if state is not None and state.cluster is self:
+            return False
+
+        self.poll_scheduler.register(self)
+        return True
+
+    async def bind(self):
+        """Bind the cluster and start polling."""
+        self._start_polling()
+        return await super().bind()
+
+    def _update_attribute(self, attrid, value):
+        super()._update_attribute(attrid, value)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # e.g. restoring the attribute cache, polls need the event loop
+            return
+
+        if not self._start_polling():
+            self.poll_scheduler.report_received(self)
+
+
+class TuyaZBMeteringClusterPolled(TuyaZBMeteringCluster):
+    """Metering of Tuya plugs polled along with TuyaZBElectricalMeasurementPolled.
+
+    Metering reports count as reports of the plug, so plugs reporting on their own
+    are polled less often.
+    """
+
+    def _update_attribute(self, attrid, value):
+        super()._update_attribute(attrid, value)
+        electrical = getattr(self.endpoint, ElectricalMeasurement.ep_attribute, None)
+        if isinstance(electrical, TuyaZBElectricalMeasurementPolled):
+            electrical.poll_scheduler.report_received(electrical)
+
+
+@functools.cache
+def _valid_attribute_ids(
+    cluster_cls: type[CustomCluster], attr_names: tuple[str, ...]
+) -> frozenset[int]:
+    """Resolve attribute names to attribute ids of a cluster class, once per class."""
+    attributes_by_name = cluster_cls.attributes_by_name
+    return frozenset(
+        attributes_by_name[name].id for name in attr_names if name in attributes_by_name
+    )
+
+
+class TuyaNewManufCluster(DeviceTaskMixin, CustomCluster):
     """Tuya manufacturer specific cluster.
 
     This is an attempt to consolidate the multiple above clusters into a
@@ -1533,29 +2000,61 @@ class TuyaNewManufCluster(CustomCluster):
     def __init__(self, *args, **kwargs):
         """Initialize the cluster and mark attributes as valid on LocalDataClusters."""
         super().__init__(*args, **kwargs)
-        for dp_map in self.dp_to_attribute.values():
+        self.unknown_datapoints = TuyaUnknownDatapointStats()
+        self._data_query_refresh = (
+            isinstance(self.endpoint.device, BaseEnchantedDevice)
+            and self.endpoint.device.tuya_data_query_refresh
+        )
+        for endpoint_id, ep_attribute, attr_names in self._valid_attribute_targets():
             # get the endpoint that is being mapped to
             endpoint = self.endpoint
-            if dp_map.endpoint_id:
-                endpoint = self.endpoint.device.endpoints.get(dp_map.endpoint_id)
+            if endpoint_id:
+                endpoint = self.endpoint.device.endpoints.get(endpoint_id)
 
             # the endpoint to be mapped to might not actually exist within all quirks
             if not endpoint:
                 continue
 
-            cluster = getattr(endpoint, dp_map.ep_attribute, None)
+            cluster = getattr(endpoint, ep_attribute, None)
             # the cluster to be mapped to might not actually exist within all quirks
-            if not cluster:
+            if not cluster or not isinstance(cluster, LocalDataCluster):
                 continue
 
-            # mark mapped to attribute as valid if existing and if on a LocalDataCluster
-            attr = cluster.attributes_by_name.get(dp_map.attribute_name)
-            if attr and isinstance(cluster, LocalDataCluster):
+            # mark mapped to attributes as valid if existing on the LocalDataCluster
+            attr_ids = _valid_attribute_ids(type(cluster), attr_names)
+            if attr_ids:
                 # _VALID_ATTRIBUTES is only a class variable, but as want to modify it
                 # per instance here, we need to create an instance variable first
                 if "_VALID_ATTRIBUTES" not in cluster.__dict__:
                     cluster._VALID_ATTRIBUTES = set()
-                cluster._VALID_ATTRIBUTES.add(attr.id)
+                cluster._VALID_ATTRIBUTES.update(attr_ids)
+
+    @classmethod
+    def _valid_attribute_targets(
+        cls,
+    ) -> tuple[tuple[Optional[int], str, tuple[str, ...]], ...]:
+        """Group the mapped attribute names by target endpoint and cluster.
+
+        This only depends on the class, so it's computed once and cached on it.
+        """
+        cached = cls.__dict__.get("_valid_attribute_targets_cache")
+        if cached is not None and cached[0] is cls.dp_to_attribute:
+            return cached[1]
+
+        targets: dict[tuple[Optional[int], str], dict[str, None]] = {}
+        for dp_map in cls.dp_to_attribute.values():
+            # attributes mapped as tuples are never looked up on the target cluster
+            if not isinstance(dp_map.attribute_name, str):
+                continue
+            key = (dp_map.endpoint_id or None, dp_map.ep_attribute)
+            targets.setdefault(key, {})[dp_map.attribute_name] = None
+
+        result = tuple(
+            (endpoint_id, ep_attribute, tuple(attr_names))
+            for (endpoint_id, ep_attribute), attr_names in targets.items()
+        )
+        cls._valid_attribute_targets_cache = (cls.dp_to_attribute, result)
+        return result
 
     def handle_cluster_request(
         self,
@@ -1597,8 +2096,26 @@ class TuyaNewManufCluster(CustomCluster):
         if not hdr.frame_control.disable_default_response:
             self.send_default_rsp(hdr, status=status)
 
+    def start_data_query_refresh(self) -> bool:
+        """Register the device with the data query scheduler, return if it wasn't."""
+        state = TUYA_DATA_QUERY_SCHEDULER.get_state(self.endpoint.device.ieee)
+        if state is not None and state.cluster is self:
+            return False
+
+        TUYA_DATA_QUERY_SCHEDULER.register(self)
+        return True
+
     def handle_get_data(self, command: TuyaCommand) -> foundation.Status:
         """Handle get_data response (report)."""
+        if self._data_query_refresh and not self.start_data_query_refresh():
+            TUYA_DATA_QUERY_SCHEDULER.report_received(self)
+        return self._handle_datapoints(command)
+
+    def handle_set_data_response(self, command: TuyaCommand) -> foundation.Status:
+        """Handle set_data response, which acknowledges a write and isn't a report."""
+        return self._handle_datapoints(command)
+
+    def _handle_datapoints(self, command: TuyaCommand) -> foundation.Status:
         dp_error = False
         for record in command.datapoints:
             try:
@@ -1606,6 +2123,8 @@ class TuyaNewManufCluster(CustomCluster):
                 getattr(self, dp_handler)(record)
             except (AttributeError, KeyError):
                 self.debug("No datapoint handler for %s", record)
+                if record.dp not in self.data_point_handlers:
+                    self.unknown_datapoints.record(record)
                 dp_error = True
                 # return foundation.Status.UNSUPPORTED_ATTRIBUTE
 
@@ -1624,7 +2143,6 @@ class TuyaNewManufCluster(CustomCluster):
             else foundation.Status.UNSUPPORTED_ATTRIBUTE
         )
 
-    handle_set_data_response = handle_get_data
     handle_active_status_report = handle_get_data
 
     def handle_set_time_request(self, payload: t.uint16_t) -> foundation.Status:
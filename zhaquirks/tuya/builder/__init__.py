@@ -3,7 +3,6 @@
 from collections.abc import Callable
 from enum import Enum
 import inspect
-import math
 import pathlib
 from types import FrameType
 from typing import Any, Optional
@@ -38,6 +37,7 @@ from zhaquirks.tuya import (
     TuyaLocalCluster,
     TuyaPowerConfigurationCluster,
 )
+from zhaquirks.tuya.converters import Log10, Scale
 from zhaquirks.tuya.mcu import DPToAttributeMapping, TuyaMCUCluster, TuyaOnOffNM
 
 MOL_VOL_AIR_NTP = 0.2445  # molar volume of air at NTP in cL/mol
@@ -209,7 +209,7 @@ class TuyaQuirkBuilder(QuirkBuilder):
             dp_id,
             power_cfg.ep_attribute,
             PowerConfiguration.AttributeDefs.battery_percentage_remaining.name,
-            converter=lambda x: x * scale,
+            converter=Scale(scale),
         )
         self.adds(power_cfg)
         return self
@@ -248,9 +248,7 @@ class TuyaQuirkBuilder(QuirkBuilder):
         self,
         dp_id: int,
         illuminance_cfg: TuyaLocalCluster = TuyaIlluminance,
-        converter: Optional[Callable[[Any], Any]] = (
-            lambda x: 10000 * math.log10(x) + 1 if x != 0 else 0
-        ),
+        converter: Optional[Callable[[Any], Any]] = Log10(10000, 1),
     ) -> QuirkBuilder:
         """Add a Tuya Illuminance Configuration."""
         self.tuya_dp(
@@ -282,7 +280,7 @@ class TuyaQuirkBuilder(QuirkBuilder):
             dp_id,
             co2_cfg.ep_attribute,
             CarbonDioxideConcentration.AttributeDefs.measured_value.name,
-            converter=lambda x: x * scale,
+            converter=Scale(scale),
         )
         self.adds(co2_cfg)
         return self
@@ -318,7 +316,7 @@ class TuyaQuirkBuilder(QuirkBuilder):
             dp_id,
             pm25_cfg.ep_attribute,
             PM25.AttributeDefs.measured_value.name,
-            converter=lambda x: x * scale,
+            converter=Scale(scale),
         )
         self.adds(pm25_cfg)
         return self
@@ -368,7 +366,7 @@ class TuyaQuirkBuilder(QuirkBuilder):
             dp_id,
             metering_cfg.ep_attribute,
             attribute_name="current_summ_delivered",
-            converter=lambda x: x * scale,
+            converter=Scale(scale),
         )
         self.adds(metering_cfg)
         return self
@@ -398,7 +396,7 @@ class TuyaQuirkBuilder(QuirkBuilder):
             dp_id,
             rh_cfg.ep_attribute,
             "measured_value",
-            converter=lambda x: x * scale,
+            converter=Scale(scale),
         )
         self.adds(rh_cfg)
         return self
@@ -414,7 +412,7 @@ class TuyaQuirkBuilder(QuirkBuilder):
             dp_id,
             soil_cfg.ep_attribute,
             "measured_value",
-            converter=lambda x: x * scale,
+            converter=Scale(scale),
         )
         self.adds(soil_cfg)
         return self
@@ -430,7 +428,7 @@ class TuyaQuirkBuilder(QuirkBuilder):
             dp_id,
             temp_cfg.ep_attribute,
             "measured_value",
-            converter=lambda x: x * scale,
+            converter=Scale(scale),
         )
         self.adds(temp_cfg)
         return self
@@ -446,7 +444,7 @@ class TuyaQuirkBuilder(QuirkBuilder):
             dp_id,
             voc_cfg.ep_attribute,
             TuyaAirQualityVOC.AttributeDefs.measured_value.name,
-            converter=lambda x: x * scale,
+            converter=Scale(scale),
         )
         self.adds(voc_cfg)
         return self
@@ -755,7 +753,10 @@ class TuyaQuirkBuilder(QuirkBuilder):
         return self
 
     def tuya_enchantment(
-        self, read_attr_spell: bool = True, data_query_spell: bool = False
+        self,
+        read_attr_spell: bool = True,
+        data_query_spell: bool = False,
+        data_query_refresh: bool = False,
     ) -> QuirkBuilder:
         """Set the Tuya enchantment spells."""
 
@@ -764,6 +765,7 @@ class TuyaQuirkBuilder(QuirkBuilder):
 
         EnchantedDeviceV2.tuya_spell_read_attributes = read_attr_spell
         EnchantedDeviceV2.tuya_spell_data_query = data_query_spell
+        EnchantedDeviceV2.tuya_data_query_refresh = data_query_refresh
 
         self.device_class(EnchantedDeviceV2)
 
@@ -0,0 +1,264 @@
+"""Declarative converters for Tuya datapoint values.
+
+Converters replace ad-hoc lambdas in DPToAttributeMapping. They are compiled to
+plain functions when created and are callable, so mappings hold the converters
+themselves. They expose their inverse for the write path and their parameters as
+metadata for diagnostics and benchmarks.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Mapping
+import dataclasses
+import enum
+import math
+from typing import Any, ClassVar
+
+
+class TuyaConverter(ABC):
+    """Base class for declarative Tuya value converters.
+
+    Converters are stored on the mappings, so their inverse and metadata can be
+    looked up from a mapping.
+    """
+
+    name: ClassVar[str] = "converter"
+
+    def __post_init__(self) -> None:
+        """Compile the converter."""
+        object.__setattr__(self, "_func", self._compile())
+
+    def __call__(self, value: Any) -> Any:
+        """Convert a value."""
+        return self._func(value)
+
+    @property
+    def func(self) -> Callable[[Any], Any]:
+        """Return the compiled function, avoiding the call indirection on hot paths."""
+        return self._func
+
+    @property
+    @abstractmethod
+    def inverse(self) -> TuyaConverter:
+        """Return the converter for the opposite direction."""
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        """Return the converter type and its parameters."""
+        return {
+            "converter": self.name,
+            **{
+                field.name: getattr(self, field.name)
+                for field in dataclasses.fields(self)
+            },
+        }
+
+    def then(self, other: TuyaConverter) -> Chain:
+        """Return a converter applying this converter and then the other one."""
+        return Chain((self, other))
+
+    @abstractmethod
+    def _compile(self) -> Callable[[Any], Any]:
+        """Return a plain function doing the conversion."""
+
+
+@dataclasses.dataclass(frozen=True)
+class Scale(TuyaConverter):
+    """Multiply by a factor and add an offset."""
+
+    name: ClassVar[str] = "scale"
+
+    factor: float = 1
+    offset: float = 0
+
+    def _compile(self) -> Callable[[Any], Any]:
+        factor, offset = self.factor, self.offset
+        if not offset:
+            return lambda x: x * factor
+        return lambda x: x * factor + offset
+
+    @property
+    def inverse(self) -> Scale:
+        """Return the converter for the opposite direction."""
+        return Scale(1 / self.factor, -self.offset / self.factor)
+
+
+@dataclasses.dataclass(frozen=True)
+class Divide(TuyaConverter):
+    """Multiply and floor divide integer values."""
+
+    name: ClassVar[str] = "divide"
+
+    divisor: int
+    multiplier: int = 1
+
+    def _compile(self) -> Callable[[Any], Any]:
+        divisor, multiplier = self.divisor, self.multiplier
+        if multiplier == 1:
+            return lambda x: x // divisor
+        return lambda x: (x * multiplier) // divisor
+
+    @property
+    def inverse(self) -> Divide:
+        """Return the converter for the opposite direction."""
+        return Divide(self.multiplier, self.divisor)
+
+
+@dataclasses.dataclass(frozen=True)
+class EnumMap(TuyaConverter):
+    """Map values with an enum class or a mapping."""
+
+    name: ClassVar[str] = "enum_map"
+
+    mapping: type[enum.Enum] | Mapping[Any, Any]
+
+    def _compile(self) -> Callable[[Any], Any]:
+        if isinstance(self.mapping, Mapping):
+            return self.mapping.__getitem__
+        return self.mapping
+
+    @property
+    def inverse(self) -> EnumMap:
+        """Return the converter for the opposite direction."""
+        if isinstance(self.mapping, Mapping):
+            return EnumMap({v: k for k, v in self.mapping.items()})
+        # enum members are sent as enum datapoints, so they're kept as they are
+        return self
+
+
+@dataclasses.dataclass(frozen=True)
+class Clamp(TuyaConverter):
+    """Limit values to a range."""
+
+    name: ClassVar[str] = "clamp"
+
+    minimum: float
+    maximum: float
+
+    def _compile(self) -> Callable[[Any], Any]:
+        minimum, maximum = self.minimum, self.maximum
+        return lambda x: minimum if x < minimum else maximum if x > maximum else x
+
+    @property
+    def inverse(self) -> Clamp:
+        """Return the converter for the opposite direction."""
+        return self
+
+
+@dataclasses.dataclass(frozen=True)
+class Log10(TuyaConverter):
+    """Logarithmic conversion, e.g. lux to the ZCL illuminance measured value."""
+
+    name: ClassVar[str] = "log10"
+
+    factor: float = 10000
+    offset: float = 1
+
+    def _compile(self) -> Callable[[Any], Any]:
+        factor, offset, log10 = self.factor, self.offset, math.log10
+        return lambda x: factor * log10(x) + offset if x != 0 else 0
+
+    @property
+    def inverse(self) -> Exp10:
+        """Return the converter for the opposite direction."""
+        return Exp10(self.factor, self.offset)
+
+
+@dataclasses.dataclass(frozen=True)
+class Exp10(TuyaConverter):
+    """Inverse of the logarithmic conversion."""
+
+    name: ClassVar[str] = "exp10"
+
+    factor: float = 10000
+    offset: float = 1
+
+    def _compile(self) -> Callable[[Any], Any]:
+        factor, offset = self.factor, self.offset
+        return lambda x: 10 ** ((x - offset) / factor) if x != 0 else 0
+
+    @property
+    def inverse(self) -> Log10:
+        """Return the converter for the opposite direction."""
+        return Log10(self.factor, self.offset)
+
+
+@dataclasses.dataclass(frozen=True)
+class Bitmask(TuyaConverter):
+    """Extract bits from a value."""
+
+    name: ClassVar[str] = "bitmask"
+
+    mask: int
+    shift: int = 0
+
+    def _compile(self) -> Callable[[Any], Any]:
+        mask, shift = self.mask, self.shift
+        if not shift:
+            return lambda x: x & mask
+        return lambda x: (x & mask) >> shift
+
+    @property
+    def inverse(self) -> BitmaskInverse:
+        """Return the converter for the opposite direction."""
+        return BitmaskInverse(self.mask, self.shift)
+
+
+@dataclasses.dataclass(frozen=True)
+class BitmaskInverse(TuyaConverter):
+    """Place bits back into their position of a value."""
+
+    name: ClassVar[str] = "bitmask_inverse"
+
+    mask: int
+    shift: int = 0
+
+    def _compile(self) -> Callable[[Any], Any]:
+        mask, shift = self.mask, self.shift
+        return lambda x: (x << shift) & mask
+
+    @property
+    def inverse(self) -> Bitmask:
+        """Return the converter for the opposite direction."""
+        return Bitmask(self.mask, self.shift)
+
+
+@dataclasses.dataclass(frozen=True)
+class Chain(TuyaConverter):
+    """Apply several converters in a row."""
+
+    name: ClassVar[str] = "chain"
+
+    converters: tuple[TuyaConverter, ...]
+
+    def _compile(self) -> Callable[[Any], Any]:
+        funcs = tuple(converter.func for converter in self.converters)
+        if len(funcs) == 1:
+            return funcs[0]
+
+        def chained(value: Any) -> Any:
+            for func in funcs:
+                value = func(value)
+            return value
+
+        return chained
+
+    @property
+    def inverse(self) -> Chain:
+        """Return the converter for the opposite direction."""
+        return Chain(
+            tuple(converter.inverse for converter in reversed(self.converters))
+        )
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        """Return the converter type and the metadata of the chained converters."""
+        return {
+            "converter": self.name,
+            "converters": [converter.metadata for converter in self.converters],
+        }
+
+    def then(self, other: TuyaConverter) -> Chain:
+        """Return a converter applying this chain and then the other converter."""
+        return Chain((*self.converters, other))
@@ -26,6 +26,7 @@ from zhaquirks.tuya import (
     TuyaNewManufCluster,
     TuyaTimePayload,
 )
+from zhaquirks.tuya.converters import Divide, EnumMap
 
 # New manufacturer attributes
 ATTR_MCU_VERSION = 0xEF00
@@ -33,6 +34,9 @@ ATTR_MCU_VERSION = 0xEF00
 # manufacturer commands
 TUYA_MCU_CONNECTION_STATUS = 0x25
 
+# Tuya brightness 0-1000 <-> ZCL level 0-255
+LEVEL_CONVERTER = Divide(1000, multiplier=255)
+
 
 @dataclasses.dataclass
 class DPToAttributeMapping:
@@ -530,7 +534,7 @@ class MoesSwitchManufCluster(TuyaOnOffManufCluster):
             14: DPToAttributeMapping(
                 TuyaMCUCluster.ep_attribute,
                 "power_on_state",
-                converter=lambda x: PowerOnState(x),
+                converter=EnumMap(PowerOnState),
             )
         }
     )
@@ -539,7 +543,7 @@ class MoesSwitchManufCluster(TuyaOnOffManufCluster):
             15: DPToAttributeMapping(
                 TuyaMCUCluster.ep_attribute,
                 "backlight_mode",
-                converter=lambda x: MoesBacklight(x),
+                converter=EnumMap(MoesBacklight),
             ),
         }
     )
@@ -648,14 +652,14 @@ class TuyaLevelControlManufCluster(TuyaMCUCluster):
         2: DPToAttributeMapping(
             TuyaLevelControl.ep_attribute,
             "current_level",
-            converter=lambda x: (x * 255) // 1000,
-            dp_converter=lambda x: (x * 1000) // 255,
+            converter=LEVEL_CONVERTER,
+            dp_converter=LEVEL_CONVERTER.inverse,
         ),
         3: DPToAttributeMapping(
             TuyaLevelControl.ep_attribute,
             "minimum_level",
-            converter=lambda x: (x * 255) // 1000,
-            dp_converter=lambda x: (x * 1000) // 255,
+            converter=LEVEL_CONVERTER,
+            dp_converter=LEVEL_CONVERTER.inverse,
         ),
         4: DPToAttributeMapping(
             TuyaLevelControl.ep_attribute,
@@ -669,15 +673,15 @@ class TuyaLevelControlManufCluster(TuyaMCUCluster):
         8: DPToAttributeMapping(
             TuyaLevelControl.ep_attribute,
             "current_level",
-            converter=lambda x: (x * 255) // 1000,
-            dp_converter=lambda x: (x * 1000) // 255,
+            converter=LEVEL_CONVERTER,
+            dp_converter=LEVEL_CONVERTER.inverse,
             endpoint_id=2,
         ),
         9: DPToAttributeMapping(
             TuyaLevelControl.ep_attribute,
             "minimum_level",
-            converter=lambda x: (x * 255) // 1000,
-            dp_converter=lambda x: (x * 1000) // 255,
+            converter=LEVEL_CONVERTER,
+            dp_converter=LEVEL_CONVERTER.inverse,
             endpoint_id=2,
         ),
         10: DPToAttributeMapping(
@@ -693,15 +697,15 @@ class TuyaLevelControlManufCluster(TuyaMCUCluster):
         16: DPToAttributeMapping(
             TuyaLevelControl.ep_attribute,
             "current_level",
-            converter=lambda x: (x * 255) // 1000,
-            dp_converter=lambda x: (x * 1000) // 255,
+            converter=LEVEL_CONVERTER,
+            dp_converter=LEVEL_CONVERTER.inverse,
             endpoint_id=3,
         ),
         17: DPToAttributeMapping(
             TuyaLevelControl.ep_attribute,
             "minimum_level",
-            converter=lambda x: (x * 255) // 1000,
-            dp_converter=lambda x: (x * 1000) // 255,
+            converter=LEVEL_CONVERTER,
+            dp_converter=LEVEL_CONVERTER.inverse,
             endpoint_id=3,
         ),
         18: DPToAttributeMapping(
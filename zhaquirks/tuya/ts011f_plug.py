@@ -33,8 +33,10 @@ from zhaquirks.tuya import (
     TuyaZB1888Cluster,
     TuyaZBE000Cluster,
     TuyaZBElectricalMeasurement,
+    TuyaZBElectricalMeasurementPolled,
     TuyaZBExternalSwitchTypeCluster,
     TuyaZBMeteringCluster,
+    TuyaZBMeteringClusterPolled,
     TuyaZBMeteringClusterWithUnit,
     TuyaZBOnOffAttributeCluster,
 )
@@ -91,8 +93,9 @@ class Plug(EnchantedDevice):
                     Groups.cluster_id,
                     Scenes.cluster_id,
                     TuyaZBOnOffAttributeCluster,
-                    TuyaZBMeteringCluster,
-                    TuyaZBElectricalMeasurement,
+                    # measurements aren't reported, they are polled
+                    TuyaZBMeteringClusterPolled,
+                    TuyaZBElectricalMeasurementPolled,
                     TuyaZBE000Cluster,
                     TuyaZBExternalSwitchTypeCluster,
                 ],
@@ -664,8 +667,9 @@ class Plug_TZ3210_2AC(CustomDevice):
                     Groups.cluster_id,
                     Scenes.cluster_id,
                     TuyaZBOnOffAttributeCluster,
-                    TuyaZBMeteringCluster,
-                    TuyaZBElectricalMeasurement,
+                    # measurements aren't reported, they are polled
+                    TuyaZBMeteringClusterPolled,
+                    TuyaZBElectricalMeasurementPolled,
                     TuyaNewManufCluster,
                 ],
                 OUTPUT_CLUSTERS: [Time.cluster_id, Ota.cluster_id],
@@ -743,8 +747,9 @@ class Plug_TZ3210_1AC(CustomDevice):
                     Groups.cluster_id,
                     Scenes.cluster_id,
                     TuyaZBOnOffAttributeCluster,
-                    TuyaZBMeteringCluster,
-                    TuyaZBElectricalMeasurement,
+                    # measurements aren't reported, they are polled
+                    TuyaZBMeteringClusterPolled,
+                    TuyaZBElectricalMeasurementPolled,
                     TuyaNewManufCluster,
                 ],
                 OUTPUT_CLUSTERS: [Time.cluster_id, Ota.cluster_id],
@@ -1008,8 +1013,9 @@ class Plug_4AC_2USB_Metering(EnchantedDevice):
                     Groups.cluster_id,
                     Scenes.cluster_id,
                     TuyaZBOnOffAttributeCluster,
-                    TuyaZBMeteringCluster,
-                    TuyaZBElectricalMeasurement,
+                    # measurements aren't reported, they are polled
+                    TuyaZBMeteringClusterPolled,
+                    TuyaZBElectricalMeasurementPolled,
                     TuyaZBE000Cluster,
                     TuyaZBExternalSwitchTypeCluster,
                 ],
@@ -1,5 +1,7 @@
 """Map from manufacturer to standard clusters for thermostatic valves."""
 
+from collections.abc import AsyncIterator
+import contextlib
 import logging
 from typing import Optional, Union
 
@@ -235,6 +237,105 @@ class data144(t.FixedList, item_type=t.uint8_t, length=18):
     """General data, Discrete, 144 bit."""
 
 
+MOES_SCHEDULE_PROGRAMS = {
+    MOES_SCHEDULE_WORKDAY_ATTR: "workday",
+    MOES_SCHEDULE_WEEKEND_ATTR: "weekend",
+}
+
+
+class MoesSchedule:
+    """Weekly schedule of Moes thermostatic valves.
+
+    Holds the six switch points of the workday and weekend programs by attribute
+    name, e.g. `workday_schedule_1_hour`. Temperatures are in centidegrees.
+    """
+
+    SWITCH_POINTS = 6
+
+    def __init__(self, points: dict[str, int]) -> None:
+        """Init."""
+        self._points = dict(points)
+
+    def __getitem__(self, name: str) -> int:
+        """Return the value of a switch point attribute."""
+        return self._points[name]
+
+    def __setitem__(self, name: str, value: int) -> None:
+        """Set the value of a switch point attribute."""
+        if name not in self._points:
+            raise KeyError(name)
+        self._points[name] = value
+
+    def __eq__(self, other: object) -> bool:
+        """Compare schedules."""
+        if not isinstance(other, MoesSchedule):
+            return NotImplemented
+        return self._points == other._points
+
+    def update(self, points: dict[str, int]) -> None:
+        """Set the values of several switch point attributes."""
+        for name, value in points.items():
+            self[name] = value
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the switch point attributes."""
+        return dict(self._points)
+
+    @classmethod
+    def attribute_names(cls, program_attr: int) -> list[tuple[str, str, str]]:
+        """Return the hour, minute and temperature names of a program."""
+        program = MOES_SCHEDULE_PROGRAMS[program_attr]
+        return [
+            (
+                f"{program}_schedule_{num}_hour",
+                f"{program}_schedule_{num}_minute",
+                f"{program}_schedule_{num}_temperature",
+            )
+            for num in range(1, cls.SWITCH_POINTS + 1)
+        ]
+
+    @classmethod
+    def decode(cls, program_attr: int, value: data144) -> dict[str, int]:
+        """Decode the switch points of a program datapoint."""
+        points = {}
+        for num, (hour, minute, temperature) in enumerate(
+            cls.attribute_names(program_attr)
+        ):
+            # top bits of the hour indicate the current switch point
+            points[hour] = value[17 - 3 * num] & 0x3F
+            points[minute] = value[16 - 3 * num]
+            points[temperature] = value[15 - 3 * num] * 100
+        return points
+
+    def encode(self, program_attr: int) -> data144:
+        """Encode the switch points of a program datapoint."""
+        data = data144()
+        for hour, minute, temperature in reversed(self.attribute_names(program_attr)):
+            data.append(round(self._points[temperature] / 100))
+            data.append(self._points[minute])
+            data.append(self._points[hour])
+        return data
+
+    def program(self, program_attr: int) -> dict[str, int]:
+        """Return the switch points of a program."""
+        return {
+            name: self._points[name]
+            for names in self.attribute_names(program_attr)
+            for name in names
+        }
+
+    def diff(self, confirmed: dict[str, int]) -> dict[int, data144]:
+        """Return the program datapoints differing from the confirmed values."""
+        return {
+            program_attr: self.encode(program_attr)
+            for program_attr in MOES_SCHEDULE_PROGRAMS
+            if any(
+                confirmed.get(name) != value
+                for name, value in self.program(program_attr).items()
+            )
+        }
+
+
 class MoesManufCluster(TuyaManufClusterAttributes):
     """Manufacturer Specific Cluster of some thermostatic valves."""
 
@@ -560,50 +661,6 @@ class MoesThermostat(TuyaThermostatCluster):
                     self.attributes_by_name["operation_preset"].id, 2
                 )
             }
-        if attribute in self.WORKDAY_SCHEDULE_ATTRS:
-            data = data144()
-            for num, (attr, default) in enumerate(self.WORKDAY_SCHEDULE_ATTRS.items()):
-                if num % 3 == 0:
-                    if attr == attribute:
-                        val = round(value / 100)
-                    else:
-                        val = round(
-                            self._attr_cache.get(
-                                self.attributes_by_name[attr].id, default
-                            )
-                            / 100
-                        )
-                elif attr == attribute:
-                    val = value
-                else:
-                    val = self._attr_cache.get(
-                        self.attributes_by_name[attr].id, default
-                    )
-
-                data.append(val)
-            return {MOES_SCHEDULE_WORKDAY_ATTR: data}
-        if attribute in self.WEEKEND_SCHEDULE_ATTRS:
-            data = data144()
-            for num, (attr, default) in enumerate(self.WEEKEND_SCHEDULE_ATTRS.items()):
-                if num % 3 == 0:
-                    if attr == attribute:
-                        val = round(value / 100)
-                    else:
-                        val = round(
-                            self._attr_cache.get(
-                                self.attributes_by_name[attr].id, default
-                            )
-                            / 100
-                        )
-                elif attr == attribute:
-                    val = value
-                else:
-                    val = self._attr_cache.get(
-                        self.attributes_by_name[attr].id, default
-                    )
-
-                data.append(val)
-            return {MOES_SCHEDULE_WEEKEND_ATTR: data}
 
     def mode_change(self, value):
         """System Mode change."""
@@ -634,129 +691,103 @@ class MoesThermostat(TuyaThermostatCluster):
     def schedule_change(self, attr, value):
         """Scheduler attribute change."""
 
-        if attr == MOES_SCHEDULE_WORKDAY_ATTR:
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_1_hour"].id, value[17] & 0x3F
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_1_minute"].id, value[16]
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_1_temperature"].id,
-                value[15] * 100,
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_2_hour"].id, value[14] & 0x3F
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_2_minute"].id, value[13]
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_2_temperature"].id,
-                value[12] * 100,
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_3_hour"].id, value[11] & 0x3F
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_3_minute"].id, value[10]
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_3_temperature"].id,
-                value[9] * 100,
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_4_hour"].id, value[8] & 0x3F
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_4_minute"].id, value[7]
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_4_temperature"].id,
-                value[6] * 100,
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_5_hour"].id, value[5] & 0x3F
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_5_minute"].id, value[4]
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_5_temperature"].id,
-                value[3] * 100,
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_6_hour"].id, value[2] & 0x3F
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_6_minute"].id, value[1]
-            )
-            self._update_attribute(
-                self.attributes_by_name["workday_schedule_6_temperature"].id,
-                value[0] * 100,
-            )
-        elif attr == MOES_SCHEDULE_WEEKEND_ATTR:
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_1_hour"].id, value[17] & 0x3F
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_1_minute"].id, value[16]
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_1_temperature"].id,
-                value[15] * 100,
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_2_hour"].id, value[14] & 0x3F
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_2_minute"].id, value[13]
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_2_temperature"].id,
-                value[12] * 100,
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_3_hour"].id, value[11] & 0x3F
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_3_minute"].id, value[10]
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_3_temperature"].id,
-                value[9] * 100,
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_4_hour"].id, value[8] & 0x3F
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_4_minute"].id, value[7]
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_4_temperature"].id,
-                value[6] * 100,
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_5_hour"].id, value[5] & 0x3F
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_5_minute"].id, value[4]
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_5_temperature"].id,
-                value[3] * 100,
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_6_hour"].id, value[2] & 0x3F
-            )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_6_minute"].id, value[1]
+        for name, point in MoesSchedule.decode(attr, value).items():
+            self._update_attribute(self.attributes_by_name[name].id, point)
+
+    @property
+    def confirmed_schedule(self) -> dict[str, int]:
+        """Return the switch points last reported by the device."""
+        points = {}
+        for name in (*self.WORKDAY_SCHEDULE_ATTRS, *self.WEEKEND_SCHEDULE_ATTRS):
+            attrid = self.attributes_by_name[name].id
+            if attrid in self._attr_cache:
+                points[name] = self._attr_cache[attrid]
+        return points
+
+    @property
+    def schedule(self) -> MoesSchedule:
+        """Return the schedule last reported by the device, completed by defaults."""
+        return MoesSchedule(
+            {
+                **self.WORKDAY_SCHEDULE_ATTRS,
+                **self.WEEKEND_SCHEDULE_ATTRS,
+                **self.confirmed_schedule,
+            }
+        )
+
+    async def write_schedule(
+        self, schedule: MoesSchedule, manufacturer=None
+    ) -> dict[int, data144]:
+        """Send the program datapoints differing from the confirmed schedule."""
+        changed = schedule.diff(self.confirmed_schedule)
+        _LOGGER.debug(
+            "[0x%04x:%s:0x%04x] Writing schedule datapoints %s",
+            self.endpoint.device.nwk,
+            self.endpoint.endpoint_id,
+            self.cluster_id,
+            [f"0x{attrid:04x}" for attrid in changed],
+        )
+        if changed:
+            await self.endpoint.tuya_manufacturer.write_attributes(
+                changed, manufacturer=manufacturer
             )
-            self._update_attribute(
-                self.attributes_by_name["weekend_schedule_6_temperature"].id,
-                value[0] * 100,
+        return changed
+
+    @contextlib.asynccontextmanager
+    async def edit_schedule(self) -> AsyncIterator[MoesSchedule]:
+        """Edit the schedule and write the changed program datapoints on exit."""
+        schedule = self.schedule
+        yield schedule
+        await self.write_schedule(schedule)
+
+    async def write_attributes(self, attributes, manufacturer=None):
+        """Write all schedule attributes at once, together with other attributes."""
+
+        records = self._write_attr_records(attributes)
+        schedule_points = {}
+        for record in records:
+            attr_name = self.attributes[record.attrid].name
+            if (
+                attr_name in self.WORKDAY_SCHEDULE_ATTRS
+                or attr_name in self.WEEKEND_SCHEDULE_ATTRS
+            ):
+                schedule_points[attr_name] = record.value.value
+
+        if not schedule_points:
+            return await super().write_attributes(attributes, manufacturer)
+
+        schedule = self.schedule
+        schedule.update(schedule_points)
+        manufacturer_attrs = schedule.diff(self.confirmed_schedule)
+        failed = []
+        for record in records:
+            attr_name = self.attributes[record.attrid].name
+            if attr_name in schedule_points:
+                continue
+
+            new_attrs = self.map_attribute(attr_name, record.value.value)
+            if not new_attrs:
+                failed.append(record.attrid)
+                continue
+            manufacturer_attrs.update(new_attrs)
+
+        # schedule and other attributes succeed or fail in a single write
+        if manufacturer_attrs:
+            await self.endpoint.tuya_manufacturer.write_attributes(
+                manufacturer_attrs, manufacturer=manufacturer
             )
 
+        if failed:
+            return [
+                [
+                    foundation.WriteAttributesStatusRecord(
+                        foundation.Status.FAILURE, attrid
+                    )
+                    for attrid in failed
+                ]
+            ]
+        return [[foundation.WriteAttributesStatusRecord(foundation.Status.SUCCESS)]]
+
 
 class MoesThermostatNew(MoesThermostat):
     """Thermostat cluster for the new _TZE200_b6wax7g0 thermostatic valve."""
@@ -4,9 +4,14 @@ Heavily inspired by work from @mak-42
 https://github.com/Koenkk/zigbee-herdsman-converters/blob/9d5e7b902479582581615cbfac3148d66d4c675c/lib/zosung.js
 """
 
+import asyncio
 import base64
+from collections import OrderedDict
+import dataclasses
+import hashlib
 import logging
 from typing import Any, Final, Optional, Union
+import zlib
 
 from zigpy.profiles import zgp, zha
 from zigpy.quirks import CustomCluster, CustomDevice
@@ -32,9 +37,228 @@ from zhaquirks.const import (
     OUTPUT_CLUSTERS,
     PROFILE_ID,
 )
+from zhaquirks.tasks import DeviceTaskMixin
 
 _LOGGER = logging.getLogger(__name__)
 
+IR_CHUNK_SIZE: Final = 0x38
+MAX_PENDING_SENDS: Final = 16
+MAX_LEARNED_CODES: Final = 256
+
+
+def ir_checksum(data: bytes) -> int:
+    """Return the checksum of an IR message part."""
+    return sum(data) & 0xFF
+
+
+@dataclasses.dataclass
+class ZosungIRTransferStats:
+    """IR code transfer statistics of a device."""
+
+    transfers: int = 0
+    bytes: int = 0
+    chunks: int = 0
+    duration: float = 0.0
+    last_rate: Optional[float] = None
+    last_chunk_size: Optional[int] = None
+
+    @property
+    def rate(self) -> Optional[float]:
+        """Return the average transfer rate in bytes per second."""
+        if not self.duration:
+            return None
+        return self.bytes / self.duration
+
+    def add(self, size: int, chunks: int, chunk_size: int, duration: float) -> None:
+        """Add a completed transfer."""
+        self.transfers += 1
+        self.bytes += size
+        self.chunks += chunks
+        self.duration += duration
+        self.last_rate = size / duration if duration > 0 else None
+        self.last_chunk_size = chunk_size
+
+
+class ZosungIRReceiveTransfer:
+    """Reassembly of an IR code sent by the device in parts.
+
+    Up to `window` parts are requested at once. The device may send less than the
+    requested maximum length, so parts are only pipelined once the length of a
+    part has been learned from the first one.
+    """
+
+    def __init__(
+        self, seq: int, length: int, chunk_size: int, window: int, started: float
+    ) -> None:
+        """Init the transfer."""
+        self.seq = seq
+        self.length = length
+        self.chunk_size = chunk_size
+        self.window = max(window, 1)
+        self.started = started
+        self.buffer = bytearray(length)
+        self.received = 0
+        self.chunks = 0
+        self._covered = bytearray(length)
+        self._in_flight: set[int] = set()
+        self._holes: list[int] = []
+        self._next_offset = 0
+        self._stride: Optional[int] = None
+
+    @property
+    def complete(self) -> bool:
+        """Return whether the whole message has been received."""
+        return self.received >= self.length
+
+    def next_positions(self) -> list[int]:
+        """Return the positions of the parts to request next."""
+        window = self.window if self._stride else 1
+        positions = []
+        while len(self._in_flight) < window:
+            position = self._next_position()
+            if position is None:
+                break
+            self._in_flight.add(position)
+            positions.append(position)
+        return positions
+
+    def add_part(self, position: int, data: bytes) -> int:
+        """Store a received part and return the number of new bytes."""
+        self._in_flight.discard(position)
+        end = min(position + len(data), self.length)
+        size = end - position
+        if size <= 0:
+            return 0
+
+        new = size - self._covered.count(1, position, end)
+        self.buffer[position:end] = data[:size]
+        self._covered[position:end] = b"\x01" * size
+        self.received += new
+        self.chunks += 1
+
+        if self._stride is None:
+            # first part, its length is used for the following requests
+            self._next_offset = end
+            if end < self.length:
+                self._stride = size
+        elif end < self.length and size < self._stride and not self._covered[end]:
+            # a short part leaves a gap before the next requested part
+            self._holes.append(end)
+        return new
+
+    def _next_position(self) -> Optional[int]:
+        while self._holes:
+            position = self._holes.pop()
+            if not self._covered[position] and position not in self._in_flight:
+                return position
+        if self._stride is None:
+            # the length of a part is not known until the first one is received
+            if self._in_flight or self._next_offset >= self.length:
+                return None
+            return self._next_offset
+        while self._next_offset < self.length:
+            position = self._next_offset
+            self._next_offset += self._stride
+            if not self._covered[position] and position not in self._in_flight:
+                return position
+        return None
+
+
+class ZosungIRMessageCache(OrderedDict):
+    """IR messages waiting to be sent, by sequence number.
+
+    The least recently used messages are evicted once `maxsize` is reached, so
+    messages the device never requested do not accumulate.
+    """
+
+    def __init__(self, maxsize: int = MAX_PENDING_SENDS) -> None:
+        """Init the cache."""
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, seq: int) -> bytes:
+        """Return a message and mark it as recently used."""
+        value = super().__getitem__(seq)
+        self.move_to_end(seq)
+        return value
+
+    def get(self, seq: int, default: bytes | None = None) -> bytes | None:
+        """Return a message if present and mark it as recently used."""
+        if seq not in self:
+            return default
+        return self[seq]
+
+    def __setitem__(self, seq: int, msg: bytes) -> None:
+        """Add a message, evicting the least recently used ones."""
+        super().__setitem__(seq, msg)
+        self.move_to_end(seq)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+class ZosungIRCodeLibrary:
+    """Local library of learned IR codes.
+
+    Codes are stored zlib compressed and deduplicated by their digest. Names index
+    the stored codes, so the same code can be known under several names. Once
+    `max_codes` codes are stored, the least recently used one is evicted together
+    with its names.
+    """
+
+    def __init__(self, max_codes: int = MAX_LEARNED_CODES) -> None:
+        """Init the library."""
+        self.max_codes = max_codes
+        self._codes: OrderedDict[str, bytes] = OrderedDict()
+        self._index: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        """Return the number of stored codes."""
+        return len(self._codes)
+
+    def __contains__(self, key: str) -> bool:
+        """Return whether a code is stored under the name or digest."""
+        return key in self._index or key in self._codes
+
+    @property
+    def names(self) -> dict[str, str]:
+        """Return the digests of the stored codes by name."""
+        return dict(self._index)
+
+    @property
+    def size(self) -> int:
+        """Return the number of bytes used by the compressed codes."""
+        return sum(len(data) for data in self._codes.values())
+
+    def add(self, code: str, name: Optional[str] = None) -> str:
+        """Store a base64 encoded code and return its digest."""
+        raw = base64.b64decode(code, validate=True)
+        digest = hashlib.blake2b(raw, digest_size=8).hexdigest()
+        if digest not in self._codes:
+            self._codes[digest] = zlib.compress(raw, 9)
+        self._codes.move_to_end(digest)
+        if name is not None:
+            self._index[name] = digest
+
+        while len(self._codes) > self.max_codes:
+            evicted, _ = self._codes.popitem(last=False)
+            self._index = {k: v for k, v in self._index.items() if v != evicted}
+        return digest
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the base64 encoded code stored under the name or digest."""
+        digest = self._index.get(key, key)
+        data = self._codes.get(digest)
+        if data is None:
+            return None
+        self._codes.move_to_end(digest)
+        return base64.b64encode(zlib.decompress(data)).decode()
+
+    def remove(self, name: str) -> None:
+        """Remove a name, and its code once no other name refers to it."""
+        digest = self._index.pop(name)
+        if digest not in self._index.values():
+            del self._codes[digest]
+
 
 class Bytes(bytes):
     """Bytes serializable class."""
@@ -49,7 +273,7 @@ class Bytes(bytes):
         return cls(data), b""
 
 
-class ZosungIRControl(CustomCluster):
+class ZosungIRControl(DeviceTaskMixin, CustomCluster):
     """Zosung IR Control Cluster (0xE004)."""
 
     name = "Zosung IR Control Cluster"
@@ -120,15 +344,19 @@ class ZosungIRControl(CustomCluster):
                 tsn=tsn,
             )
         elif command_id == self.ServerCommandDefs.IRSend.id:
+            # codes stored in the learned code library can be sent by name
+            code = kwargs["code"]
+            code = self.endpoint.device.learned_ir_codes.get(code) or code
             ir_msg = (
                 f'{{"key_num":1,"delay":300,"key1":'
-                f'{{"num":1,"freq":38000,"type":1,"key_code":"{kwargs["code"]}"}}}}'
+                f'{{"num":1,"freq":38000,"type":1,"key_code":"{code}"}}}}'
             )
             _LOGGER.debug(
                 "Sending IR code: %s to %s", ir_msg, self.endpoint.device.ieee
             )
             seq = self.endpoint.device.next_seq()
-            self.endpoint.device.ir_msg_to_send = {seq: ir_msg}
+            self.endpoint.device.ir_msg_to_send[seq] = ir_msg.encode("utf-8")
+            self.endpoint.zosung_irtransmit.start_send(seq, len(ir_msg))
             self.create_catching_task(
                 self.endpoint.zosung_irtransmit.command(
                     0x00,
@@ -153,16 +381,48 @@ class ZosungIRControl(CustomCluster):
             )
 
 
-class ZosungIRTransmit(CustomCluster):
+class ZosungIRTransmit(DeviceTaskMixin, CustomCluster):
     """Zosung IR Transmit Cluster (0xED00)."""
 
     name = "Zosung IR Transmit Cluster"
     cluster_id = 0xED00
     ep_attribute = "zosung_irtransmit"
 
-    current_position = 0
-    msg_length = 0
-    ir_msg = []
+    chunk_size: int = IR_CHUNK_SIZE
+    # number of message parts requested at once while receiving a learned code,
+    # only raise this for devices which handle parallel part requests
+    transfer_window: int = 1
+
+    def __init__(self, *args, **kwargs):
+        """Init."""
+        super().__init__(*args, **kwargs)
+        self.transfer_stats = ZosungIRTransferStats()
+        self._receive: Optional[ZosungIRReceiveTransfer] = None
+        self._learned_ir_msg = b""
+        # seq -> [start time, length, parts sent]
+        self._sends: dict[int, list] = {}
+
+    def start_send(self, seq: int, length: int) -> None:
+        """Start measuring the transfer of an IR code to the device."""
+        self._sends[seq] = [asyncio.get_running_loop().time(), length, 0]
+        while len(self._sends) > MAX_PENDING_SENDS:
+            del self._sends[next(iter(self._sends))]
+
+    def _send_frame(self, command_id: int, expect_reply: bool, **kwargs) -> None:
+        self.create_catching_task(
+            super().command(command_id, **kwargs, expect_reply=expect_reply)
+        )
+
+    def _request_parts(self, expect_reply: bool) -> None:
+        transfer = self._receive
+        for position in transfer.next_positions():
+            self._send_frame(
+                0x02,
+                expect_reply,
+                seq=transfer.seq,
+                position=position,
+                maxlen=transfer.chunk_size,
+            )
 
     class ServerCommandDefs(BaseCommandDefs):
         """Server command definitions."""
@@ -282,27 +542,26 @@ class ZosungIRTransmit(CustomCluster):
         if hdr.command_id == self.ServerCommandDefs.receive_ir_frame_00.id:
             _LOGGER.debug("Received IR frame 0x00 from %s", self.endpoint.device.ieee)
 
-            self.current_position = 0
-            self.ir_msg.clear()
-            self.msg_length = args.length
-
-            cmd_01_args = {
-                "zero": 0,
-                "seq": args.seq,
-                "length": args.length,
-                "unk1": args.unk1,
-                "clusterid": args.clusterid,
-                "unk2": args.unk2,
-                "cmd": args.cmd,
-                "unk3": args.unk3,
-            }
-            self.create_catching_task(
-                super().command(0x01, **cmd_01_args, expect_reply=True)
+            self._receive = ZosungIRReceiveTransfer(
+                seq=args.seq,
+                length=args.length,
+                chunk_size=self.chunk_size,
+                window=self.transfer_window,
+                started=asyncio.get_running_loop().time(),
             )
-            cmd_02_args = {"seq": args.seq, "position": 0, "maxlen": 0x38}
-            self.create_catching_task(
-                super().command(0x02, **cmd_02_args, expect_reply=True)
+            self._send_frame(
+                0x01,
+                True,
+                zero=0,
+                seq=args.seq,
+                length=args.length,
+                unk1=args.unk1,
+                clusterid=args.clusterid,
+                unk2=args.unk2,
+                cmd=args.cmd,
+                unk3=args.unk3,
             )
+            self._request_parts(expect_reply=True)
         elif hdr.command_id == self.ServerCommandDefs.receive_ir_frame_01.id:
             _LOGGER.debug(
                 "IR-Message-Code01 received, sequence: %s, from %s",
@@ -311,18 +570,22 @@ class ZosungIRTransmit(CustomCluster):
             )
             _LOGGER.debug(
                 "Message to send: %s, to %s",
-                self.endpoint.device.ir_msg_to_send[args.seq],
+                self.endpoint.device.ir_msg_to_send.get(args.seq),
                 self.endpoint.device.ieee,
             )
         elif hdr.command_id == self.ServerCommandDefs.receive_ir_frame_02.id:
             position = args.position
             seq = args.seq
-            maxlen = args.maxlen
-            irmsg = self.endpoint.device.ir_msg_to_send[seq]
-            msgpart = irmsg[position : position + maxlen]
-            calculated_crc = 0
-            for x in msgpart:
-                calculated_crc = (calculated_crc + ord(x)) % 0x100
+            irmsg = self.endpoint.device.ir_msg_to_send.get(seq)
+            if irmsg is None:
+                _LOGGER.debug(
+                    "No IR message to send to %s (seq:%s)",
+                    self.endpoint.device.ieee,
+                    seq,
+                )
+                return
+            msgpart = irmsg[position : position + args.maxlen]
+            calculated_crc = ir_checksum(msgpart)
             _LOGGER.debug(
                 "Received IR frame 0x02 from %s, msgsrc: %s, position: %s, msgpart: %s",
                 self.endpoint.device.ieee,
@@ -330,21 +593,20 @@ class ZosungIRTransmit(CustomCluster):
                 position,
                 msgpart,
             )
-            cmd_03_args = {
-                "zero": 0,
-                "seq": seq,
-                "position": position,
-                "msgpart": msgpart.encode("utf-8"),
-                "msgpartcrc": calculated_crc,
-            }
-            self.create_catching_task(
-                super().command(0x03, **cmd_03_args, expect_reply=True)
+            if seq in self._sends:
+                self._sends[seq][2] += 1
+            self._send_frame(
+                0x03,
+                True,
+                zero=0,
+                seq=seq,
+                position=position,
+                msgpart=msgpart,
+                msgpartcrc=calculated_crc,
             )
         elif hdr.command_id == self.ServerCommandDefs.receive_ir_frame_03.id:
             msg_part_crc = args.msgpartcrc
-            calculated_crc = 0
-            for x in args.msgpart:
-                calculated_crc = (calculated_crc + x) % 0x100
+            calculated_crc = ir_checksum(args.msgpart)
             _LOGGER.debug(
                 "Received IR frame 0x03 from %s, msgcrc: %s, "
                 "calculated_crc: %s, position: %s",
@@ -353,37 +615,72 @@ class ZosungIRTransmit(CustomCluster):
                 calculated_crc,
                 args.position,
             )
-            self.ir_msg[args.position :] = args.msgpart
-            if args.position + len(args.msgpart) < self.msg_length:
-                cmd_02_args = {
-                    "seq": args.seq,
-                    "position": args.position + len(args.msgpart),
-                    "maxlen": 0x38,
-                }
-                self.create_catching_task(
-                    super().command(0x02, **cmd_02_args, expect_reply=False)
+            transfer = self._receive
+            if transfer is None or transfer.seq != args.seq:
+                _LOGGER.debug(
+                    "Unexpected IR message part from %s (seq:%s)",
+                    self.endpoint.device.ieee,
+                    args.seq,
+                )
+                return
+            if msg_part_crc != calculated_crc:
+                _LOGGER.warning(
+                    "IR message part checksum mismatch from %s, position: %s",
+                    self.endpoint.device.ieee,
+                    args.position,
+                )
+
+            if not args.msgpart:
+                _LOGGER.warning(
+                    "Aborting IR message transfer from %s, no data at position %s",
+                    self.endpoint.device.ieee,
+                    args.position,
                 )
+                self._receive = None
+                return
+
+            transfer.add_part(args.position, args.msgpart)
+            if not transfer.complete:
+                self._request_parts(expect_reply=False)
             else:
                 _LOGGER.debug(
                     "IR message completely received from %s", self.endpoint.device.ieee
                 )
-                cmd_04_args = {"zero0": 0, "seq": args.seq, "zero1": 0}
-                self.create_catching_task(
-                    super().command(0x04, **cmd_04_args, expect_reply=False)
+                self._receive = None
+                self._learned_ir_msg = bytes(transfer.buffer)
+                self.transfer_stats.add(
+                    transfer.length,
+                    transfer.chunks,
+                    transfer.chunk_size,
+                    asyncio.get_running_loop().time() - transfer.started,
                 )
+                self._send_frame(0x04, False, zero0=0, seq=args.seq, zero1=0)
         elif hdr.command_id == self.ServerCommandDefs.receive_ir_frame_04.id:
             seq = args.seq
             _LOGGER.debug(
                 "IR code has been sent to %s (seq:%s)", self.endpoint.device.ieee, seq
             )
-            cmd_05_args = {"seq": seq, "zero": 0}
-            self.create_catching_task(
-                super().command(0x05, **cmd_05_args, expect_reply=False)
-            )
+            self.endpoint.device.ir_msg_to_send.pop(seq, None)
+            send = self._sends.pop(seq, None)
+            if send is not None:
+                started, length, parts = send
+                self.transfer_stats.add(
+                    length,
+                    parts,
+                    self.chunk_size,
+                    asyncio.get_running_loop().time() - started,
+                )
+            self._send_frame(0x05, False, seq=seq, zero=0)
         elif hdr.command_id == self.ServerCommandDefs.receive_ir_frame_05.id:
+            if not self._learned_ir_msg:
+                return
             self.endpoint.device.last_learned_ir_code = base64.b64encode(
-                bytes(self.ir_msg)
+                self._learned_ir_msg
             ).decode()
+            self._learned_ir_msg = b""
+            self.endpoint.device.learned_ir_codes.add(
+                self.endpoint.device.last_learned_ir_code
+            )
             _LOGGER.info(
                 "IR message really totally received: %s, from %s",
                 self.endpoint.device.last_learned_ir_code,
@@ -409,12 +706,13 @@ class ZosungIRBlaster(CustomDevice):
     """Zosung IR Blaster."""
 
     seq = -1
-    ir_msg_to_send = {}
-    last_learned_ir_code = t.CharacterString("")
 
     def __init__(self, *args, **kwargs):
         """Init device."""
         self.seq = 0
+        self.ir_msg_to_send = ZosungIRMessageCache()
+        self.learned_ir_codes = ZosungIRCodeLibrary()
+        self.last_learned_ir_code = t.CharacterString("")
         super().__init__(*args, **kwargs)
 
     def next_seq(self):
@@ -1,7 +1,11 @@
 """BlitzWolf IS-3/Tuya motion rechargeable occupancy sensor."""
 
+from __future__ import annotations
+
+from array import array
 import asyncio
-from typing import Any
+from collections.abc import AsyncIterator
+from typing import Any, NamedTuple, Optional
 
 from zigpy.quirks.v2 import EntityPlatform, EntityType
 from zigpy.quirks.v2.homeassistant import LIGHT_LUX, UnitOfLength, UnitOfTime
@@ -11,8 +15,13 @@ import zigpy.types as t
 from zigpy.zcl.clusters.measurement import OccupancySensing
 from zigpy.zcl.clusters.security import IasZone
 
-from zhaquirks.tuya import TuyaLocalCluster
+from zhaquirks.timers import get_timer_wheel
+from zhaquirks.tuya import TuyaDatapointData, TuyaLocalCluster
 from zhaquirks.tuya.builder import TuyaQuirkBuilder
+from zhaquirks.tuya.mcu import TuyaMCUCluster
+
+RADAR_STREAM_CAPACITY = 1024
+RADAR_STREAM_QUEUE_SIZE = 64
 
 
 class TuyaOccupancySensing(OccupancySensing, TuyaLocalCluster):
@@ -30,12 +39,10 @@ class TuyaMotionWithReset(IasZone, TuyaLocalCluster):
     def __init__(self, *args, **kwargs):
         """Init."""
         super().__init__(*args, **kwargs)
-        self._loop = asyncio.get_running_loop()
-        self._timer_handle = None
+        self._timer_wheel = get_timer_wheel()
 
     def _turn_off(self) -> None:
         """Reset IAS zone status."""
-        self._timer_handle = None
         self.debug("%s - Resetting Tuya motion sensor", self.endpoint.device.ieee)
         self._update_attribute(IasZone.AttributeDefs.zone_status.id, 0)
 
@@ -46,13 +53,270 @@ class TuyaMotionWithReset(IasZone, TuyaLocalCluster):
             and value == IasZone.ZoneStatus.Alarm_1
         ):
             self.debug("%s - Received Tuya motion event", self.endpoint.device.ieee)
-            if self._timer_handle:
-                self._timer_handle.cancel()
-            self._timer_handle = self._loop.call_later(self.reset_s, self._turn_off)
+            self._timer_wheel.schedule(self, self.reset_s, self._turn_off)
 
         super()._update_attribute(attrid, value)
 
 
+class TuyaRadarSample(NamedTuple):
+    """Radar target sample."""
+
+    timestamp: float
+    distance: float
+    state: int
+
+
+class TuyaRadarStreamSubscription(AsyncIterator[TuyaRadarSample]):
+    """Async iterator over new radar samples.
+
+    When the consumer falls behind, the oldest queued samples are dropped.
+    """
+
+    def __init__(self, stream: TuyaRadarStream, maxsize: int) -> None:
+        """Init."""
+        self._stream = stream
+        self._queue: asyncio.Queue[Optional[TuyaRadarSample]] = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def _put(self, sample: Optional[TuyaRadarSample]) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(sample)
+
+    async def __anext__(self) -> TuyaRadarSample:
+        """Return the next sample."""
+        sample = await self._queue.get()
+        if sample is None:
+            raise StopAsyncIteration
+        return sample
+
+    def close(self) -> None:
+        """Stop the iteration."""
+        self._stream.unsubscribe(self)
+        self._put(None)
+
+
+class TuyaRadarStream:
+    """Fixed size ring buffer of radar target samples.
+
+    Samples are kept in preallocated arrays, so recording a sample does not
+    allocate and the buffer never grows past its capacity.
+    """
+
+    def __init__(self, capacity: int = RADAR_STREAM_CAPACITY) -> None:
+        """Init."""
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._distances = array("d", bytes(8 * capacity))
+        self._states = array("B", bytes(capacity))
+        self._next = 0
+        self._count = 0
+        self._subscriptions: list[TuyaRadarStreamSubscription] = []
+
+    def __len__(self) -> int:
+        """Return the number of buffered samples."""
+        return self._count
+
+    def __aiter__(self) -> TuyaRadarStreamSubscription:
+        """Subscribe to new samples."""
+        return self.subscribe()
+
+    def append(self, timestamp: float, distance: float, state: int) -> None:
+        """Record a sample, overwriting the oldest one when the buffer is full."""
+        i = self._next
+        self._timestamps[i] = timestamp
+        self._distances[i] = distance
+        self._states[i] = state
+        self._next = (i + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+        if self._subscriptions:
+            sample = TuyaRadarSample(timestamp, distance, state)
+            for subscription in self._subscriptions:
+                subscription._put(sample)
+
+    def subscribe(
+        self, maxsize: int = RADAR_STREAM_QUEUE_SIZE
+    ) -> TuyaRadarStreamSubscription:
+        """Return an async iterator over samples recorded from now on."""
+        subscription = TuyaRadarStreamSubscription(self, maxsize)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: TuyaRadarStreamSubscription) -> None:
+        """Remove a subscription."""
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def clear(self) -> None:
+        """Drop all buffered samples."""
+        self._next = 0
+        self._count = 0
+
+    def _indices(self, since: Optional[float] = None) -> list[int]:
+        start = self._next - self._count
+        indices = [i % self.capacity for i in range(start, self._next)]
+        if since is not None:
+            indices = [i for i in indices if self._timestamps[i] >= since]
+        return indices
+
+    def samples(self, since: Optional[float] = None) -> list[TuyaRadarSample]:
+        """Return the buffered samples, oldest first."""
+        return [
+            TuyaRadarSample(self._timestamps[i], self._distances[i], self._states[i])
+            for i in self._indices(since)
+        ]
+
+    @property
+    def latest(self) -> Optional[TuyaRadarSample]:
+        """Return the most recent sample."""
+        if not self._count:
+            return None
+        i = (self._next - 1) % self.capacity
+        return TuyaRadarSample(self._timestamps[i], self._distances[i], self._states[i])
+
+    def min_distance(self, since: Optional[float] = None) -> Optional[float]:
+        """Return the minimum distance of the buffered samples."""
+        return min((self._distances[i] for i in self._indices(since)), default=None)
+
+    def max_distance(self, since: Optional[float] = None) -> Optional[float]:
+        """Return the maximum distance of the buffered samples."""
+        return max((self._distances[i] for i in self._indices(since)), default=None)
+
+    def dwell_time(
+        self, state: int, since: Optional[float] = None, until: Optional[float] = None
+    ) -> float:
+        """Return the time spent in a state.
+
+        Each sample lasts until the next one, the latest sample until `until`.
+        """
+        indices = self._indices(since)
+        if not indices:
+            return 0.0
+        timestamps, states = self._timestamps, self._states
+        if until is None:
+            until = timestamps[indices[-1]]
+
+        dwell = 0.0
+        for i, j in zip(indices, indices[1:]):
+            if states[i] == state:
+                dwell += timestamps[j] - timestamps[i]
+        if states[indices[-1]] == state:
+            dwell += max(until - timestamps[indices[-1]], 0.0)
+        return dwell
+
+
+class TuyaRadarMCUCluster(TuyaMCUCluster):
+    """Tuya MCU cluster for mmWave radars with an opt-in target stream.
+
+    Once the stream is enabled, distance and state reports are recorded in a
+    TuyaRadarStream and distance attribute updates are limited to one per
+    `attribute_interval`. Distances are recorded with the value of the distance
+    attribute, states with the raw datapoint value. Without the stream, reports
+    are handled as usual.
+    """
+
+    stream_distance_attributes: tuple[str, ...] = ("distance", "target_distance")
+    stream_state_attributes: tuple[str, ...] = (
+        "presence_state",
+        "human_motion_state",
+        OccupancySensing.AttributeDefs.occupancy.name,
+    )
+
+    def __init__(self, *args, **kwargs):
+        """Init."""
+        super().__init__(*args, **kwargs)
+        self.radar_stream: Optional[TuyaRadarStream] = None
+        self.attribute_interval = 0.0
+        self._distance_dp: Optional[int] = None
+        self._state_dp: Optional[int] = None
+        self._distance = 0.0
+        self._state = 0
+        self._pending_distance: Optional[TuyaDatapointData] = None
+        self._distance_timer: Optional[asyncio.TimerHandle] = None
+
+    def _stream_dp(self, attribute_names: tuple[str, ...]) -> Optional[int]:
+        dps = {
+            dp_map.attribute_name: dp
+            for dp, dp_map in self.dp_to_attribute.items()
+            if isinstance(dp_map.attribute_name, str)
+        }
+        return next(
+            (dps[name] for name in attribute_names if name in dps),
+            None,
+        )
+
+    def _attribute_value(self, dp: Optional[int]) -> Any:
+        if dp is None:
+            return None
+        dp_map = self.dp_to_attribute[dp]
+        endpoint = self.endpoint
+        if dp_map.endpoint_id:
+            endpoint = self.endpoint.device.endpoints[dp_map.endpoint_id]
+        return getattr(endpoint, dp_map.ep_attribute).get(dp_map.attribute_name)
+
+    def enable_stream(
+        self, capacity: int = RADAR_STREAM_CAPACITY, attribute_interval: float = 5.0
+    ) -> TuyaRadarStream:
+        """Start recording target samples and return the stream."""
+        if self.radar_stream is None:
+            self._distance_dp = self._stream_dp(self.stream_distance_attributes)
+            self._state_dp = self._stream_dp(self.stream_state_attributes)
+            self._distance = self._attribute_value(self._distance_dp) or 0.0
+            self._state = int(self._attribute_value(self._state_dp) or 0)
+            self.radar_stream = TuyaRadarStream(capacity)
+        self.attribute_interval = attribute_interval
+        return self.radar_stream
+
+    def disable_stream(self) -> None:
+        """Stop recording target samples and update the distance attribute."""
+        self.radar_stream = None
+        if self._distance_timer is not None:
+            self._distance_timer.cancel()
+        self._flush_distance()
+
+    def _dp_2_attr_update(self, datapoint: TuyaDatapointData) -> None:
+        """Record stream samples and limit the rate of distance updates."""
+        stream = self.radar_stream
+        if stream is None or datapoint.dp not in (self._distance_dp, self._state_dp):
+            super()._dp_2_attr_update(datapoint)
+            return
+
+        loop = asyncio.get_running_loop()
+        if datapoint.dp == self._state_dp:
+            self._state = int(datapoint.data.payload)
+            stream.append(loop.time(), self._distance, self._state)
+            super()._dp_2_attr_update(datapoint)
+            return
+
+        converter = self.dp_to_attribute[datapoint.dp].converter
+        value = datapoint.data.payload
+        self._distance = converter(value) if converter else value
+        stream.append(loop.time(), self._distance, self._state)
+
+        if self._distance_timer is not None:
+            self._pending_distance = datapoint
+            return
+        super()._dp_2_attr_update(datapoint)
+        if self.attribute_interval > 0:
+            self._distance_timer = loop.call_later(
+                self.attribute_interval, self._flush_distance
+            )
+
+    def _flush_distance(self) -> None:
+        """Update the distance attribute with the last skipped report."""
+        self._distance_timer = None
+        datapoint, self._pending_distance = self._pending_distance, None
+        if datapoint is None:
+            return
+        super()._dp_2_attr_update(datapoint)
+        if self.radar_stream is not None and self.attribute_interval > 0:
+            self._distance_timer = asyncio.get_running_loop().call_later(
+                self.attribute_interval, self._flush_distance
+            )
+
+
 class TuyaSelfCheckResult(t.enum8):
     """Tuya self check result enum."""
 
@@ -248,7 +512,7 @@ base_tuya_motion = (
         translation_key="fading_time",
         fallback_name="Fading time",
     )
-    .add_to_registry()
+    .add_to_registry(replacement_cluster=TuyaRadarMCUCluster)
 )
 
 
@@ -306,7 +570,7 @@ base_tuya_motion = (
     )
     .tuya_illuminance(dp_id=104)
     # 103 cli, z2m lists as not working
-    .add_to_registry()
+    .add_to_registry(replacement_cluster=TuyaRadarMCUCluster)
 )
 
 
@@ -348,7 +612,7 @@ base_tuya_motion = (
         fallback_name="Fading time",
     )
     .tuya_illuminance(dp_id=104)
-    .add_to_registry()
+    .add_to_registry(replacement_cluster=TuyaRadarMCUCluster)
 )
 
 # Whenzi Tuya WZ-M100
@@ -400,7 +664,7 @@ base_tuya_motion = (
         fallback_name="Fading time",
     )
     .tuya_illuminance(dp_id=103)
-    .add_to_registry()
+    .add_to_registry(replacement_cluster=TuyaRadarMCUCluster)
 )
 
 
@@ -510,7 +774,7 @@ base_tuya_motion = (
         fallback_name="Presence sensitivity",
     )
     .skip_configuration()
-    .add_to_registry()
+    .add_to_registry(replacement_cluster=TuyaRadarMCUCluster)
 )
 
 
@@ -656,7 +920,7 @@ base_tuya_motion = (
         fallback_name="Breath sensitivity",
     )
     .skip_configuration()
-    .add_to_registry()
+    .add_to_registry(replacement_cluster=TuyaRadarMCUCluster)
 )
 
 
@@ -792,7 +1056,7 @@ base_tuya_motion = (
         translation_key="sensor_mode",
         fallback_name="Sensor mode",
     )
-    .add_to_registry()
+    .add_to_registry(replacement_cluster=TuyaRadarMCUCluster)
 )
 
 
@@ -860,7 +1124,7 @@ base_tuya_motion = (
         fallback_name="Fading time",
     )
     .skip_configuration()
-    .add_to_registry()
+    .add_to_registry(replacement_cluster=TuyaRadarMCUCluster)
 )
 
 
@@ -938,7 +1202,7 @@ base_tuya_motion = (
         fallback_name="Target distance",
     )
     .skip_configuration()
-    .add_to_registry()
+    .add_to_registry(replacement_cluster=TuyaRadarMCUCluster)
 )
 
 
@@ -1107,7 +1371,7 @@ base_tuya_motion = (
         fallback_name="LED indicator",
     )
     .skip_configuration()
-    .add_to_registry()
+    .add_to_registry(replacement_cluster=TuyaRadarMCUCluster)
 )
 
 
@@ -1240,7 +1504,7 @@ base_tuya_motion = (
         fallback_name="Detection delay",
     )
     .skip_configuration()
-    .add_to_registry()
+    .add_to_registry(replacement_cluster=TuyaRadarMCUCluster)
 )
 
 
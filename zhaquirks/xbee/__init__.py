@@ -4,13 +4,15 @@ See xbee.md for additional information.
 """
 
 import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
 import enum
 import logging
 from typing import Any, Optional
 
 from zigpy.quirks import CustomDevice
 import zigpy.types as t
-from zigpy.zcl import foundation
+from zigpy.zcl import Cluster, foundation
 from zigpy.zcl.clusters.general import (
     AnalogInput,
     AnalogOutput,
@@ -21,7 +23,7 @@ from zigpy.zcl.clusters.general import (
 )
 
 from zhaquirks import EventableCluster, LocalDataCluster
-from zhaquirks.const import ENDPOINTS, INPUT_CLUSTERS, OUTPUT_CLUSTERS
+from zhaquirks.const import ENDPOINTS, INPUT_CLUSTERS, OUTPUT_CLUSTERS, ZHA_SEND_EVENT
 
 from .types import ATCommand, BinaryString, Bytes, IOSample
 
@@ -47,6 +49,15 @@ ATTR_PRESENT_VALUE = 0x0055
 PIN_ANALOG_OUTPUT = 2
 
 REMOTE_AT_COMMAND_TIMEOUT = 30
+REMOTE_AT_MAX_IN_FLIGHT = 8
+SERIAL_STREAM_LIMIT = 64 * 1024
+# Used when the maximum payload can't be read with the NP command
+SERIAL_DATA_MAX_PAYLOAD = 84
+# Seconds until a failed NP command is retried
+SERIAL_MAX_PAYLOAD_RETRY = 60 * 60
+# Frames carry no sequence number and APS retries can reorder them, so only one
+# chunk is in flight unless the receiver tolerates reordering
+SERIAL_TRANSFER_WINDOW = 1
 
 
 # https://github.com/zigpy/zigpy-xbee/blob/dev/zigpy_xbee/api.py
@@ -201,6 +212,318 @@ class ATCommandResult(enum.IntEnum):
     TX_FAILURE = 4
 
 
+class XBeeRemoteATRequests:
+    """Pending remote AT commands of a single XBee.
+
+    Frame ids are allocated per device, skipping the ones still in use, and an
+    entry is removed as soon as its future is done, including on timeout. At most
+    `max_in_flight` commands are sent to the device at the same time.
+    """
+
+    def __init__(self, max_in_flight: int = REMOTE_AT_MAX_IN_FLIGHT) -> None:
+        """Init."""
+        self.max_in_flight = max_in_flight
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self._pending: dict[int, tuple[bytes, float, asyncio.Future]] = {}
+        self._next_frame_id = 1
+        self._first_request: float | None = None
+        self.requests = 0
+        self.responses = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.collisions = 0
+        self.unmatched = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of commands waiting for a response."""
+        return len(self._pending)
+
+    @property
+    def average_latency(self) -> float:
+        """Return the average time between a request and its response."""
+        return self.latency_total / self.responses if self.responses else 0.0
+
+    @property
+    def responses_per_second(self) -> float:
+        """Return the number of responses per second since the first request."""
+        if self._first_request is None:
+            return 0.0
+
+        elapsed = asyncio.get_running_loop().time() - self._first_request
+        return self.responses / elapsed if elapsed > 0 else 0.0
+
+    def add(self, command: bytes) -> tuple[int, asyncio.Future]:
+        """Allocate a frame id and a future for the response of a command."""
+        if len(self._pending) >= 255:
+            raise RuntimeError("No free frame id for a remote AT command")
+
+        # 0 means no response is sent, skip frame ids of commands still pending
+        frame_id = self._next_frame_id
+        while frame_id in self._pending:
+            self.collisions += 1
+            frame_id = frame_id % 255 + 1
+        self._next_frame_id = frame_id % 255 + 1
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._first_request is None:
+            self._first_request = now
+
+        future = loop.create_future()
+        self._pending[frame_id] = (command, now, future)
+        future.add_done_callback(lambda fut: self._done(frame_id, fut))
+        self.requests += 1
+
+        return frame_id, future
+
+    def pop(self, frame_id: int, command: bytes) -> asyncio.Future | None:
+        """Return the future of the pending command the response is for."""
+        entry = self._pending.get(frame_id)
+        if entry is None or entry[0] != command:
+            # a late response to a command which timed out already
+            self.unmatched += 1
+            return None
+
+        del self._pending[frame_id]
+        _, sent, future = entry
+        latency = asyncio.get_running_loop().time() - sent
+        self.responses += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+        return future
+
+    def _done(self, frame_id: int, future: asyncio.Future) -> None:
+        entry = self._pending.get(frame_id)
+        if entry is not None and entry[2] is future:
+            del self._pending[frame_id]
+
+        if future.cancelled():
+            self.timeouts += 1
+        elif future.exception() is not None:
+            self.errors += 1
+
+
+class XBeeSerialStream:
+    """Buffered stream of the serial data received from a single XBee.
+
+    Received frames are appended to a buffer of at most `limit` bytes, data which
+    doesn't fit is dropped and counted. Once `high_water` bytes are buffered the
+    stream is paused and `on_pause` is called with True and the number of buffered
+    bytes, it is called with False once the readers drained the buffer to
+    `low_water` bytes.
+    """
+
+    def __init__(
+        self,
+        limit: int = SERIAL_STREAM_LIMIT,
+        *,
+        high_water: int | None = None,
+        low_water: int | None = None,
+        on_pause: Callable[[bool, int], Any] | None = None,
+    ) -> None:
+        """Init."""
+        self.limit = limit
+        self.high_water = limit // 2 if high_water is None else high_water
+        self.low_water = self.high_water // 2 if low_water is None else low_water
+        self._on_pause = on_pause
+        self._buffer = bytearray()
+        self._waiter: asyncio.Future | None = None
+        self._eof = False
+        self.paused = False
+        self.frames_received = 0
+        self.bytes_received = 0
+        self.bytes_dropped = 0
+        self.max_buffered = 0
+
+    def __len__(self) -> int:
+        """Return the number of buffered bytes."""
+        return len(self._buffer)
+
+    def at_eof(self) -> bool:
+        """Return if the stream is closed and all data was read."""
+        return self._eof and not self._buffer
+
+    def feed_data(self, data: bytes) -> None:
+        """Append a received frame to the buffer."""
+        if self._eof:
+            raise RuntimeError("Data received after the stream was closed")
+
+        self.frames_received += 1
+        free = self.limit - len(self._buffer)
+        if len(data) > free:
+            self.bytes_dropped += len(data) - free
+            data = data[:free]
+        if not data:
+            return
+
+        self._buffer += data
+        self.bytes_received += len(data)
+        self.max_buffered = max(self.max_buffered, len(self._buffer))
+
+        if not self.paused and len(self._buffer) >= self.high_water:
+            self._set_paused(True)
+        self._wakeup()
+
+    def feed_eof(self) -> None:
+        """Close the stream, readers get the remaining data."""
+        self._eof = True
+        self._wakeup()
+
+    async def read(self, n: int = -1) -> bytes:
+        """Read up to n bytes, or all buffered bytes if n is negative."""
+        if n == 0:
+            return b""
+
+        while not self._buffer and not self._eof:
+            await self._wait_for_data()
+
+        if n < 0:
+            n = len(self._buffer)
+        return self._consume(n)
+
+    async def readexactly(self, n: int) -> bytes:
+        """Read exactly n bytes."""
+        if n > self.limit:
+            raise ValueError("Can't read more than the limit of the stream")
+
+        while len(self._buffer) < n:
+            if self._eof:
+                partial = self._consume(len(self._buffer))
+                raise asyncio.IncompleteReadError(partial, n)
+            await self._wait_for_data()
+
+        return self._consume(n)
+
+    async def readuntil(self, separator: bytes = b"\n") -> bytes:
+        """Read up to and including the separator."""
+        if not separator:
+            raise ValueError("Separator should be at least one byte")
+
+        start = 0
+        while (index := self._buffer.find(separator, start)) == -1:
+            if self._eof:
+                partial = self._consume(len(self._buffer))
+                raise asyncio.IncompleteReadError(partial, None)
+            if len(self._buffer) >= self.limit:
+                raise asyncio.LimitOverrunError(
+                    "Separator not found in a full buffer", len(self._buffer)
+                )
+            # only search the new data next time
+            start = max(0, len(self._buffer) - len(separator) + 1)
+            await self._wait_for_data()
+
+        return self._consume(index + len(separator))
+
+    def _consume(self, n: int) -> bytes:
+        data = bytes(self._buffer[:n])
+        del self._buffer[:n]
+
+        if self.paused and len(self._buffer) <= self.low_water:
+            self._set_paused(False)
+        return data
+
+    async def _wait_for_data(self) -> None:
+        if self._waiter is not None:
+            raise RuntimeError("Another coroutine is already waiting for data")
+
+        self._waiter = asyncio.get_running_loop().create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+
+    def _wakeup(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def _set_paused(self, paused: bool) -> None:
+        self.paused = paused
+        if self._on_pause is not None:
+            self._on_pause(paused, len(self._buffer))
+
+
+class XBeeSerialTransfer:
+    """Transfer of serial data split into chunks of at most `chunk_size` bytes.
+
+    Chunks are sent in order with up to `window` of them waiting for their
+    transmit status. A failed chunk stops the transfer, its status is kept and
+    chunks completing after it aren't counted as sent.
+
+    Chunks have no sequence number, with a window larger than 1 retried frames
+    can arrive out of order. Only use larger windows if the receiver reassembles
+    the data itself.
+    """
+
+    def __init__(
+        self, data: bytes, chunk_size: int, window: int = SERIAL_TRANSFER_WINDOW
+    ) -> None:
+        """Init."""
+        if chunk_size < 1 or window < 1:
+            raise ValueError("Chunk size and window must be positive")
+
+        self.data = data
+        self.chunk_size = chunk_size
+        self.window = window
+        self.status = foundation.Status.SUCCESS
+        self.chunks_sent = 0
+        self.bytes_sent = 0
+        self.max_in_flight = 0
+        self.elapsed = 0.0
+
+    @property
+    def chunks(self) -> int:
+        """Return the number of chunks of the data."""
+        return -(-len(self.data) // self.chunk_size)
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Return the throughput of the sent chunks."""
+        return self.bytes_sent / self.elapsed if self.elapsed > 0 else 0.0
+
+    async def run(
+        self, send: Callable[[bytes], Awaitable[foundation.Status]]
+    ) -> foundation.Status:
+        """Send all chunks, return the status of the transfer."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        pending: deque[tuple[int, asyncio.Task]] = deque()
+
+        try:
+            for offset in range(0, len(self.data), self.chunk_size):
+                chunk = self.data[offset : offset + self.chunk_size]
+                pending.append((len(chunk), loop.create_task(send(chunk))))
+                self.max_in_flight = max(self.max_in_flight, len(pending))
+
+                while len(pending) >= self.window:
+                    await self._finish(*pending.popleft())
+                if self.status != foundation.Status.SUCCESS:
+                    break
+
+            while pending:
+                await self._finish(*pending.popleft())
+        finally:
+            for _, task in pending:
+                task.cancel()
+            self.elapsed = loop.time() - start
+
+        return self.status
+
+    async def _finish(self, size: int, task: asyncio.Task) -> None:
+        status = await task
+        # chunks after a failed one would leave a gap in the received data
+        if self.status != foundation.Status.SUCCESS:
+            return
+        if status != foundation.Status.SUCCESS:
+            self.status = status
+            return
+
+        self.chunks_sent += 1
+        self.bytes_sent += size
+
+
 class XBeeBasic(LocalDataCluster, Basic):
     """XBee Basic Cluster."""
 
@@ -288,13 +611,6 @@ class XBeeRemoteATRequest(LocalDataCluster):
         for k, v in zip(range(1, len(AT_COMMANDS) + 1), AT_COMMANDS.items())
     }
 
-    _seq: int = 1
-
-    def _save_at_request(self, frame_id, future):
-        self._endpoint.in_clusters[XBEE_AT_RESPONSE_CLUSTER].save_at_request(
-            frame_id, future
-        )
-
     def remote_at_command(self, cmd_name, *args, apply_changes=True, **kwargs):
         """Execute a Remote AT Command and Return Response."""
         if hasattr(self._endpoint.device.application, "remote_at_command"):
@@ -315,19 +631,20 @@ class XBeeRemoteATRequest(LocalDataCluster):
     async def _remote_at_command(self, options, name, *args):
         _LOGGER.debug("Remote AT command: %s %s", name, args)
         data = t.serialize(args, (AT_COMMANDS[name],))
-        try:
-            return await asyncio.wait_for(
-                await self._command(options, name.encode("ascii"), data, *args),
-                timeout=REMOTE_AT_COMMAND_TIMEOUT,
-            )
-        except TimeoutError:
-            _LOGGER.warning("No response to %s command", name)
-            raise
+        requests = self._endpoint.device.remote_at_requests
+        async with requests.semaphore:
+            try:
+                return await asyncio.wait_for(
+                    await self._command(options, name.encode("ascii"), data, *args),
+                    timeout=REMOTE_AT_COMMAND_TIMEOUT,
+                )
+            except TimeoutError:
+                _LOGGER.warning("No response to %s command", name)
+                raise
 
     async def _command(self, options, command, data, *args):
         _LOGGER.debug("Command %s %s", command, data)
-        frame_id = self._seq
-        self._seq = (self._seq % 255) + 1
+        frame_id, future = self._endpoint.device.remote_at_requests.add(command)
         schema = (
             t.uint8_t,
             t.uint8_t,
@@ -352,9 +669,6 @@ class XBeeRemoteATRequest(LocalDataCluster):
             schema,
         )
 
-        future = asyncio.Future()
-        self._save_at_request(frame_id, future)
-
         try:
             await self._endpoint.device.application.request(
                 self._endpoint.device,
@@ -421,12 +735,6 @@ class XBeeRemoteATResponse(LocalDataCluster):
 
     cluster_id = XBEE_AT_RESPONSE_CLUSTER
 
-    _awaiting = {}
-
-    def save_at_request(self, frame_id, future):
-        """Save pending request."""
-        self._awaiting[frame_id] = (future,)
-
     def handle_cluster_request(
         self,
         hdr: foundation.ZCLHeader,
@@ -440,7 +748,11 @@ class XBeeRemoteATResponse(LocalDataCluster):
                 "Remote AT command response: %s",
                 (args.frame_id, args.cmd, args.status, args.value),
             )
-            (fut,) = self._awaiting.pop(args.frame_id)
+            fut = self._endpoint.device.remote_at_requests.pop(args.frame_id, args.cmd)
+            if fut is None:
+                _LOGGER.debug("Ignoring response to unknown frame id %s", args.frame_id)
+                return
+
             try:
                 status = ATCommandResult(args.status)
             except ValueError:
@@ -481,6 +793,15 @@ class XBeeDigitalIOCluster(LocalDataCluster, BinaryInput):
 
     cluster_id = XBEE_IO_CLUSTER
 
+    # Skip pins whose value didn't change since the previous sample
+    forward_changed_pins_only = False
+
+    def _update_pin(self, cluster: Cluster, attrid: int, value: Any) -> None:
+        # pylint: disable=W0212
+        if self.forward_changed_pins_only and cluster._attr_cache.get(attrid) == value:
+            return
+        cluster._update_attribute(attrid, value)
+
     def handle_cluster_request(
         self,
         hdr: foundation.ZCLHeader,
@@ -494,26 +815,17 @@ class XBeeDigitalIOCluster(LocalDataCluster, BinaryInput):
         """
         if hdr.command_id == SAMPLE_DATA_CMD:
             values = args.io_sample
-            if "digital_samples" in values:
-                # Update digital inputs
-                active_pins = [
-                    i for i, x in enumerate(values["digital_samples"]) if x is not None
-                ]
-                for pin in active_pins:
-                    # pylint: disable=W0212
-                    self._endpoint.device[0xD0 + pin].on_off._update_attribute(
-                        ATTR_ON_OFF, values["digital_samples"][pin]
-                    )
-            if "analog_samples" in values:
-                # Update analog inputs
-                active_pins = [
-                    i for i, x in enumerate(values["analog_samples"]) if x is not None
-                ]
-                for pin in active_pins:
-                    # pylint: disable=W0212
-                    self._endpoint.device[0xD0 + pin].analog_input._update_attribute(
+            # the last sample set holds the current state, each pin is updated once
+            device = self._endpoint.device
+            for pin, value in enumerate(values.get("digital_samples", ())):
+                if value is not None:
+                    self._update_pin(device[0xD0 + pin].on_off, ATTR_ON_OFF, value)
+            for pin, value in enumerate(values.get("analog_samples", ())):
+                if value is not None:
+                    self._update_pin(
+                        device[0xD0 + pin].analog_input,
                         ATTR_PRESENT_VALUE,
-                        values["analog_samples"][pin]
+                        value
                         / (10.23 if pin != 7 else 1000),  # supply voltage is in mV
                     )
         else:
@@ -555,6 +867,37 @@ class XBeeSerialDataCluster(LocalDataCluster):
     cluster_id = XBEE_DATA_CLUSTER
     ep_attribute = "xbee_serial_data"
 
+    # Receiving stream, frames are relayed as events while it isn't open
+    stream: XBeeSerialStream | None = None
+    # Split send_data payloads into chunks sent with a window
+    chunked_transfer = False
+    transfer_window = SERIAL_TRANSFER_WINDOW
+    max_payload: int | None = None
+    _max_payload_retry: float = 0.0
+
+    def open_stream(
+        self, limit: int = SERIAL_STREAM_LIMIT, **kwargs
+    ) -> XBeeSerialStream:
+        """Buffer the received data in a stream instead of sending events."""
+        if self.stream is None:
+            self.stream = XBeeSerialStream(
+                limit, on_pause=self._stream_paused, **kwargs
+            )
+        return self.stream
+
+    def close_stream(self) -> None:
+        """Close the stream and send events for received data again."""
+        if self.stream is not None:
+            self.stream.feed_eof()
+            self.stream = None
+
+    def _stream_paused(self, paused: bool, buffered: int) -> None:
+        self._endpoint.out_clusters[LevelControl.cluster_id].listener_event(
+            ZHA_SEND_EVENT,
+            "serial_stream_paused" if paused else "serial_stream_resumed",
+            {"buffered": buffered},
+        )
+
     async def command(
         self,
         command_id,
@@ -566,23 +909,71 @@ class XBeeSerialDataCluster(LocalDataCluster):
     ):
         """Handle outgoing data."""
         data = BinaryString(data).serialize()
+        if self.chunked_transfer:
+            status = (await self.transfer(data)).status
+        else:
+            status = await self._send(data)
+
         return foundation.GENERAL_COMMANDS[
             foundation.GeneralCommand.Default_Response
-        ].schema(
-            command_id=0x00,
-            status=(
-                await self._endpoint.device.application.request(
-                    self._endpoint.device,
-                    XBEE_PROFILE_ID,
-                    XBEE_DATA_CLUSTER,
-                    XBEE_DATA_ENDPOINT,
-                    XBEE_DATA_ENDPOINT,
-                    self._endpoint.device.application.get_sequence(),
-                    data,
-                    expect_reply=False,
-                )
-            )[0],
+        ].schema(command_id=0x00, status=status)
+
+    async def _send(self, data: bytes) -> foundation.Status:
+        return (
+            await self._endpoint.device.application.request(
+                self._endpoint.device,
+                XBEE_PROFILE_ID,
+                XBEE_DATA_CLUSTER,
+                XBEE_DATA_ENDPOINT,
+                XBEE_DATA_ENDPOINT,
+                self._endpoint.device.application.get_sequence(),
+                data,
+                expect_reply=False,
+            )
+        )[0]
+
+    async def get_max_payload(self) -> int:
+        """Return the maximum payload of a frame, as reported by the XBee."""
+        if self.max_payload is not None:
+            return self.max_payload
+
+        # don't wait for a device which didn't answer before with every transfer
+        loop = asyncio.get_running_loop()
+        if loop.time() < self._max_payload_retry:
+            return SERIAL_DATA_MAX_PAYLOAD
+
+        try:
+            self.max_payload = int(await self._endpoint.device.remote_at("NP"))
+        except Exception as exc:  # pylint: disable=broad-except
+            _LOGGER.debug("Failed to read the maximum payload: %r", exc)
+            self._max_payload_retry = loop.time() + SERIAL_MAX_PAYLOAD_RETRY
+            return SERIAL_DATA_MAX_PAYLOAD
+
+        return self.max_payload
+
+    async def transfer(
+        self,
+        data: bytes,
+        *,
+        window: int | None = None,
+        chunk_size: int | None = None,
+    ) -> XBeeSerialTransfer:
+        """Send data of any size split into chunks of the maximum payload."""
+        transfer = XBeeSerialTransfer(
+            data,
+            chunk_size or await self.get_max_payload(),
+            window or self.transfer_window,
         )
+        await transfer.run(self._send)
+        _LOGGER.debug(
+            "Sent %d of %d bytes in %d chunks at %.0f bytes/s: %s",
+            transfer.bytes_sent,
+            len(data),
+            transfer.chunks_sent,
+            transfer.bytes_per_second,
+            transfer.status,
+        )
+        return transfer
 
     def handle_cluster_request(
         self,
@@ -592,7 +983,9 @@ class XBeeSerialDataCluster(LocalDataCluster):
         dst_addressing: Optional[t.AddrMode] = None,
     ):
         """Handle incoming data."""
-        if hdr.command_id == DATA_IN_CMD:
+        if hdr.command_id == DATA_IN_CMD and self.stream is not None:
+            self.stream.feed_data(args.data.serialize())
+        elif hdr.command_id == DATA_IN_CMD:
             self._endpoint.out_clusters[LevelControl.cluster_id].handle_cluster_request(
                 hdr, {"data": args.data}
             )
@@ -619,6 +1012,11 @@ class XBeeSerialDataCluster(LocalDataCluster):
 class XBeeCommon(CustomDevice):
     """XBee common class."""
 
+    def __init__(self, *args, **kwargs):
+        """Init."""
+        self.remote_at_requests = XBeeRemoteATRequests()
+        super().__init__(*args, **kwargs)
+
     def remote_at(self, command, *args, **kwargs):
         """Remote at command."""
         return (
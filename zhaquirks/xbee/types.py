@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+import struct
+
 
 class Bytes(bytes):
     """Bytes serializable class."""
@@ -39,10 +42,25 @@ class BinaryString(str):
         return (cls(data), b"")
 
 
+# Pins set in each mask byte, the high byte of the digital mask starts at pin 8
+_LOW_BITS = tuple(
+    tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)
+)
+_HIGH_BITS = tuple(tuple(bit + 8 for bit in bits) for bits in _LOW_BITS)
+
+DIGITAL_PINS = 15
+ANALOG_PINS = 8
+
+
 class IOSample(dict):
-    """Parse an XBee IO sample report."""
+    """Parse an XBee IO sample report.
+
+    `digital_samples` and `analog_samples` hold the values of the last sample set,
+    the `sample_sets` attribute holds a `(digital, analog)` pair for every set.
+    """
 
     serialize = None
+    sample_sets: Sequence[tuple[list[int | None], list[int | None]]] = ()
 
     @classmethod
     def deserialize(cls, data):
@@ -52,56 +70,42 @@ class IOSample(dict):
         Sample set count byte 0
         Digital mask byte 1, 2
         Analog mask byte 3
-        Digital samples byte 4, 5 (if any sample exists)
-        Analog Sample, 2 bytes per
+        Per sample set:
+          Digital samples 2 bytes (if any digital pin is enabled)
+          Analog Sample, 2 bytes per enabled analog pin
         """
-        sample_sets = int.from_bytes(data[0:1], byteorder="big")
-        if sample_sets != 1:
-            raise ValueError("Number of sets is not 1")
-        digital_mask = data[1:3]
-        analog_mask = data[3:4]
-        digital_sample = data[4:6]
-        num_bits = 15
-        digital_pins = [
-            (int.from_bytes(digital_mask, byteorder="big") >> bit) & 1
-            for bit in range(num_bits - 1, -1, -1)
-        ]
-        digital_pins = list(reversed(digital_pins))
-        analog_pins = [
-            (int.from_bytes(analog_mask, byteorder="big") >> bit) & 1
-            for bit in range(8 - 1, -1, -1)
-        ]
-        analog_pins = list(reversed(analog_pins))
-        if 1 in digital_pins:
-            digital_samples: list[int | None] = [
-                (int.from_bytes(digital_sample, byteorder="big") >> bit) & 1
-                for bit in range(num_bits - 1, -1, -1)
-            ]
-            digital_samples = list(reversed(digital_samples))
-            sample_index = 6
-        else:
-            # skip digital samples block
-            digital_samples = digital_pins
-            sample_index = 4
-        analog_samples = []
-        for apin in analog_pins:
-            if apin == 1:
-                analog_samples.append(
-                    int.from_bytes(
-                        data[sample_index : sample_index + 2], byteorder="big"
-                    )
-                )
-                sample_index += 2
-            else:
-                analog_samples.append(None)
-        for dpin in range(len(digital_pins)):
-            if digital_pins[dpin] == 0:
-                digital_samples[dpin] = None
-
-        return (
-            {
-                "digital_samples": digital_samples,
-                "analog_samples": analog_samples,
-            },
-            data[sample_index:],
-        )
+        if len(data) < 4:
+            raise ValueError("IO sample is too short")
+
+        sample_sets = data[0]
+        if sample_sets == 0:
+            raise ValueError("IO sample has no sample sets")
+
+        digital_pins = _LOW_BITS[data[2]] + _HIGH_BITS[data[1] & 0x7F]
+        analog_pins = _LOW_BITS[data[3]]
+
+        # all sample words of all sets are unpacked at once
+        words_per_set = bool(digital_pins) + len(analog_pins)
+        end = 4 + 2 * words_per_set * sample_sets
+        if len(data) < end:
+            raise ValueError("IO sample is too short")
+        words = struct.unpack_from(f">{words_per_set * sample_sets}H", data, 4)
+
+        sets = []
+        for set_index in range(sample_sets):
+            digital_samples: list[int | None] = [None] * DIGITAL_PINS
+            analog_samples: list[int | None] = [None] * ANALOG_PINS
+            index = set_index * words_per_set
+            if digital_pins:
+                word = words[index]
+                for pin in digital_pins:
+                    digital_samples[pin] = word >> pin & 1
+                index += 1
+            for pin in analog_pins:
+                analog_samples[pin] = words[index]
+                index += 1
+            sets.append((digital_samples, analog_samples))
+
+        sample = cls(digital_samples=sets[-1][0], analog_samples=sets[-1][1])
+        sample.sample_sets = sets
+        return sample, data[end:]
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable, Iterator
+from collections.abc import Callable, Iterator
+import functools
 import logging
 import math
+import time
 from typing import Any
 
 from zigpy import types as t
@@ -108,6 +110,178 @@ XIAOMI_NODE_DESC = NodeDescriptor(
 )
 
 
+AQARA_ATTRIBUTE_NAMES = {
+    1: BATTERY_VOLTAGE_MV,
+    3: TEMPERATURE,
+    4: XIAOMI_ATTR_4,
+    5: XIAOMI_ATTR_5,
+    6: XIAOMI_ATTR_6,
+    10: PATH,
+}
+
+# Temperature sensors send temperature/humidity/pressure updates through this
+# cluster instead of the respective clusters
+_AQARA_CLIMATE_ATTRIBUTE_NAMES = {
+    100: TEMPERATURE_MEASUREMENT,
+    101: HUMIDITY_MEASUREMENT,
+    102: PRESSURE_MEASUREMENT,
+}
+_AQARA_PLUG_ATTRIBUTE_NAMES = {149: CONSUMPTION, 150: VOLTAGE, 152: POWER}
+_AQARA_MOTION_ATTRIBUTE_NAMES = {101: ILLUMINANCE_MEASUREMENT}
+
+# Model specific keys of the 0xFF01/0x00F7 attribute, resolved once per cluster
+AQARA_MODEL_ATTRIBUTE_NAMES: dict[str, dict[int, str]] = {
+    "lumi.sensor_ht": _AQARA_CLIMATE_ATTRIBUTE_NAMES,
+    "lumi.sens": _AQARA_CLIMATE_ATTRIBUTE_NAMES,
+    "lumi.sensor_ht.agl02": _AQARA_CLIMATE_ATTRIBUTE_NAMES,
+    "lumi.weather": {
+        **_AQARA_CLIMATE_ATTRIBUTE_NAMES,
+        102: PRESSURE_MEASUREMENT_PRECISION,
+    },
+    "lumi.airmonitor.acn01": {**_AQARA_CLIMATE_ATTRIBUTE_NAMES, 102: TVOC_MEASUREMENT},
+    "lumi.plug": _AQARA_PLUG_ATTRIBUTE_NAMES,
+    "lumi.plug.maus01": _AQARA_PLUG_ATTRIBUTE_NAMES,
+    "lumi.plug.maeu01": _AQARA_PLUG_ATTRIBUTE_NAMES,
+    "lumi.plug.mmeu01": _AQARA_PLUG_ATTRIBUTE_NAMES,
+    "lumi.relay.c2acn01": _AQARA_PLUG_ATTRIBUTE_NAMES,
+    "lumi.switch.n0agl1": _AQARA_PLUG_ATTRIBUTE_NAMES,
+    "lumi.switch.n0acn2": _AQARA_PLUG_ATTRIBUTE_NAMES,
+    "lumi.sensor_motion.aq2": {11: ILLUMINANCE_MEASUREMENT},
+    "lumi.curtain.acn002": {101: BATTERY_PERCENTAGE_REMAINING_ATTRIBUTE},
+    "lumi.motion.agl02": _AQARA_MOTION_ATTRIBUTE_NAMES,
+    "lumi.motion.acn001": _AQARA_MOTION_ATTRIBUTE_NAMES,
+    "lumi.motion.ac02": {
+        **_AQARA_MOTION_ATTRIBUTE_NAMES,
+        105: DETECTION_INTERVAL,
+        106: MOTION_SENSITIVITY,
+    },
+    "lumi.motion.agl04": {
+        102: DETECTION_INTERVAL,
+        105: MOTION_SENSITIVITY,
+        258: DETECTION_INTERVAL,
+        268: MOTION_SENSITIVITY,
+    },
+    "lumi.motion.ac01": {
+        5: POWER_OUTAGE_COUNT,
+        101: PRESENCE_DETECTED,
+        102: PRESENCE_EVENT,
+        103: MONITORING_MODE,
+        105: APPROACH_DISTANCE,
+        268: MOTION_SENSITIVITY,
+        322: PRESENCE_DETECTED,
+        323: PRESENCE_EVENT,
+        324: MONITORING_MODE,
+        326: APPROACH_DISTANCE,
+    },
+    "lumi.sensor_smoke.acn03": {
+        160: SMOKE,
+        161: SMOKE_DENSITY,
+        162: SELF_TEST,
+        163: BUZZER_MANUAL_MUTE,
+        164: HEARTBEAT_INDICATOR,
+        165: LINKAGE_ALARM,
+    },
+}
+
+
+def _convert_and_call(
+    func: Callable[[Any], Any], convert: Callable[[Any], Any], value: Any
+) -> Any:
+    return func(convert(value))
+
+
+def _holds_value(
+    cluster: CustomCluster,
+    attrid: int,
+    convert: Callable[[Any], Any] | None,
+    value: Any,
+) -> bool:
+    """Check if the target attribute still has the value of a parsed attribute."""
+    if convert is not None:
+        value = convert(value)
+    return cluster._attr_cache.get(attrid) == value
+
+
+# Parsed attribute -> (endpoint attribute, attribute id or method name, conversion)
+AQARA_ATTRIBUTE_ROUTES: dict[
+    str, tuple[tuple[str, int | str, Callable[[Any], Any] | None], ...]
+] = {
+    BATTERY_VOLTAGE_MV: (("power", "battery_reported", None),),
+    TEMPERATURE_MEASUREMENT: (
+        ("temperature", TemperatureMeasurement.AttributeDefs.measured_value.id, None),
+    ),
+    HUMIDITY_MEASUREMENT: (
+        ("humidity", RelativeHumidity.AttributeDefs.measured_value.id, None),
+    ),
+    PRESSURE_MEASUREMENT: (
+        ("pressure", PressureMeasurement.AttributeDefs.measured_value.id, None),
+    ),
+    PRESSURE_MEASUREMENT_PRECISION: (
+        (
+            "pressure",
+            PressureMeasurement.AttributeDefs.measured_value.id,
+            lambda value: value / 100,
+        ),
+    ),
+    POWER: (
+        (
+            "electrical_measurement",
+            ElectricalMeasurement.AttributeDefs.active_power.id,
+            lambda value: round(value * 10),
+        ),
+    ),
+    CONSUMPTION: (
+        (
+            "electrical_measurement",
+            ElectricalMeasurement.AttributeDefs.total_active_power.id,
+            lambda value: round(value * 1000),
+        ),
+        (
+            "smartenergy_metering",
+            Metering.AttributeDefs.current_summ_delivered.id,
+            lambda value: round(value * 1000),
+        ),
+    ),
+    VOLTAGE: (
+        (
+            "electrical_measurement",
+            ElectricalMeasurement.AttributeDefs.rms_voltage.id,
+            lambda value: value * 0.1,
+        ),
+    ),
+    ILLUMINANCE_MEASUREMENT: (
+        ("illuminance", IlluminanceMeasurement.AttributeDefs.measured_value.id, None),
+    ),
+    TVOC_MEASUREMENT: (("voc_level", 0x0000, None),),
+    TEMPERATURE: (
+        (
+            "device_temperature",
+            DeviceTemperature.AttributeDefs.current_temperature.id,
+            lambda value: value * 100,
+        ),
+    ),
+    BATTERY_PERCENTAGE_REMAINING_ATTRIBUTE: (
+        ("power", "battery_percent_reported", None),
+    ),
+    SMOKE: (("ias_zone", IasZone.AttributeDefs.zone_status.id, None),),
+}
+
+
+def _is_attr_report(data: bytes) -> bool:
+    """Check the ZCL header of a frame for a global attribute report."""
+    if not data:
+        return False
+
+    # The manufacturer code is only present in manufacturer specific frames
+    command_offset = 4 if data[0] & 0b00000100 else 2
+
+    return (
+        len(data) > command_offset
+        and data[0] & 0b00000011 == foundation.FrameType.GLOBAL_COMMAND
+        and data[command_offset] == foundation.GeneralCommand.Report_Attributes
+    )
+
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -128,14 +302,40 @@ class XiaomiQuickInitDevice(XiaomiCustomDevice, QuickInitDevice):
 class XiaomiCluster(CustomCluster):
     """Xiaomi cluster implementation."""
 
+    # Unchanged heartbeat values are dispatched again after this many seconds,
+    # 0 dispatches every value
+    heartbeat_refresh_interval: float = 6 * 60 * 60
+
+    def __init__(self, *args, **kwargs):
+        """Init."""
+        super().__init__(*args, **kwargs)
+        self._aqara_attribute_names = {
+            **AQARA_ATTRIBUTE_NAMES,
+            **AQARA_MODEL_ATTRIBUTE_NAMES.get(self.endpoint.device.model, {}),
+        }
+        # other clusters of the endpoint may not exist yet, routes are resolved
+        # with the first report
+        self._aqara_routes: (
+            dict[str, tuple[tuple[Callable[[Any], Any], Callable | None], ...]] | None
+        ) = None
+        # parsed attribute -> (last dispatched value, time it was dispatched)
+        self._heartbeat_snapshot: dict[str, tuple[Any, float]] = {}
+        self.heartbeat_updates_dispatched = 0
+        self.heartbeat_updates_dropped = 0
+
     def _iter_parse_attr_report(
-        self, data: bytes
-    ) -> Iterator[tuple[foundation.Attribute, bytes]]:
-        """Yield all interpretations of the first attribute in a Xiaomi report."""
+        self, data: memoryview, pos: int
+    ) -> Iterator[tuple[foundation.Attribute, int]]:
+        """Yield all interpretations of the attribute at `pos` in a Xiaomi report.
+
+        Each interpretation is yielded with the position of the next attribute.
+        """
 
         # Peek at the attribute report
-        attr_id, data = t.uint16_t.deserialize(data)
-        attr_type, data = t.uint8_t.deserialize(data)
+        if len(data) - pos < 3:
+            raise ValueError(f"Truncated attribute report: {bytes(data[pos:])!r}")
+        attr_id = data[pos] | (data[pos + 1] << 8)
+        attr_type = data[pos + 2]
 
         if (
             attr_id
@@ -145,79 +345,119 @@ class XiaomiCluster(CustomCluster):
                 XIAOMI_AQARA_ATTRIBUTE_E1,
             )
             or attr_type != 0x42  # "Character String"
+            or len(data) - pos < 4
         ):
             # Assume other attributes are reported correctly
-            data = attr_id.serialize() + attr_type.serialize() + data
-            attribute, data = foundation.Attribute.deserialize(data)
+            attribute, rest = foundation.Attribute.deserialize(bytes(data[pos:]))
 
-            yield attribute, data
+            yield attribute, len(data) - len(rest)
             return
 
         # Length of the "string" can be wrong
-        val_len, data = t.uint8_t.deserialize(data)
+        val_len = data[pos + 3]
+        start = pos + 4
 
         # Try every offset. Start with 0 to pass unbroken reports through.
         for offset in (0, -1, 1):
             fixed_len = val_len + offset
 
-            if len(data) < fixed_len:
+            if fixed_len < 0 or len(data) - start < fixed_len:
                 continue
 
-            val, final_data = data[:fixed_len], data[fixed_len:]
-            attr_val = t.LVBytes(val)
+            attr_val = t.LVBytes(data[start : start + fixed_len])
             attr_type = 0x41  # The data type should be "Octet String"
 
             yield (
                 foundation.Attribute(
-                    attrid=attr_id,
+                    attrid=t.uint16_t(attr_id),
                     value=foundation.TypeValue(type=attr_type, value=attr_val),
                 ),
-                final_data,
+                start + fixed_len,
             )
 
     def _interpret_attr_reports(
         self, data: bytes
-    ) -> Iterable[tuple[foundation.Attribute]]:
-        """Yield all valid interprations of a Xiaomi attribute report."""
-
-        if not data:
-            yield ()
-            return
+    ) -> tuple[tuple[foundation.Attribute, ...] | None, int]:
+        """Return the first valid interpretation of a Xiaomi attribute report.
+
+        The number of valid interpretations is returned along with it. Each position
+        in the report is only parsed once, so reports with several broken string
+        attributes don't need to enumerate every combination of length offsets.
+        """
+
+        view = memoryview(data)
+        end = len(view)
+        candidates: dict[int, list[tuple[foundation.Attribute, int]]] = {}
+        # number of valid interpretations of the report from a position to its end
+        counts: dict[int, int] = {end: 1}
+
+        stack = [0]
+        while stack:
+            pos = stack[-1]
+            if pos in counts:
+                stack.pop()
+                continue
 
-        try:
-            parsed = list(self._iter_parse_attr_report(data))
-        except (KeyError, ValueError):
-            return
+            if pos not in candidates:
+                try:
+                    candidates[pos] = list(self._iter_parse_attr_report(view, pos))
+                except (KeyError, ValueError):
+                    candidates[pos] = []
+
+                # every attribute takes at least 3 bytes, so there are no cycles
+                pending = [nxt for _, nxt in candidates[pos] if nxt not in counts]
+                if pending:
+                    stack.extend(pending)
+                    continue
+
+            counts[pos] = sum(counts[nxt] for _, nxt in candidates[pos])
+            stack.pop()
+
+        if not counts[0]:
+            return None, 0
+
+        # follow the first interpretation which reaches the end of the report
+        attrs = []
+        pos = 0
+        while pos != end:
+            attr, pos = next(
+                (attr, nxt) for attr, nxt in candidates[pos] if counts[nxt]
+            )
+            attrs.append(attr)
 
-        for attr, remaining_data in parsed:
-            for remaining_attrs in self._interpret_attr_reports(remaining_data):
-                yield (attr,) + remaining_attrs
+        return tuple(attrs), counts[0]
 
     def deserialize(self, data):
         """Deserialize cluster data."""
-        hdr, data = foundation.ZCLHeader.deserialize(data)
 
         # Only handle attribute reports differently
-        if (
-            hdr.frame_control.frame_type != foundation.FrameType.GLOBAL_COMMAND
-            or hdr.command_id != foundation.GeneralCommand.Report_Attributes
-        ):
-            return super().deserialize(hdr.serialize() + data)
+        if not _is_attr_report(data):
+            return super().deserialize(data)
 
-        reports = list(self._interpret_attr_reports(data))
+        hdr, payload = foundation.ZCLHeader.deserialize(data)
+        report, count = self._interpret_attr_reports(payload)
 
-        if not reports:
-            _LOGGER.warning("Failed to parse Xiaomi attribute report: %r", data)
-            return super().deserialize(hdr.serialize() + data)
-        elif len(reports) > 1:
+        if report is None:
+            _LOGGER.warning("Failed to parse Xiaomi attribute report: %r", payload)
+            return super().deserialize(data)
+        elif count > 1:
             _LOGGER.warning(
-                "Xiaomi attribute report has multiple valid interpretations: %r",
-                reports,
+                "Xiaomi attribute report has %d valid interpretations, using %r",
+                count,
+                report,
             )
 
-        fixed_data = b"".join(attr.serialize() for attr in reports[0])
+        # The fixed attributes are already deserialized, so pass them to the
+        # command schema instead of parsing the report again
+        command = foundation.GENERAL_COMMANDS[
+            foundation.GeneralCommand.Report_Attributes
+        ]
+        hdr.frame_control.direction = command.direction
+        response = command.schema(attribute_reports=list(report))
 
-        return super().deserialize(hdr.serialize() + fixed_data)
+        self.debug("Decoded ZCL frame: %s:%r", type(self).__name__, response)
+
+        return hdr, response
 
     def _update_attribute(self, attrid, value):
         if attrid in (XIAOMI_AQARA_ATTRIBUTE, XIAOMI_AQARA_ATTRIBUTE_E1):
@@ -257,186 +497,101 @@ class XiaomiCluster(CustomCluster):
             attrid,
             attributes,
         )
-        if BATTERY_VOLTAGE_MV in attributes:
-            # many Xiaomi devices report this, but not all quirks implement the XiaomiPowerConfiguration cluster,
-            # so we might error out if the method doesn't exist
-            if hasattr(self.endpoint.power, "battery_reported") and callable(
-                self.endpoint.power.battery_reported
-            ):
-                self.endpoint.power.battery_reported(attributes[BATTERY_VOLTAGE_MV])
-            else:
-                # log a debug message if the cluster is not implemented
-                _LOGGER.debug(
-                    "%s - Xiaomi battery voltage attribute received but XiaomiPowerConfiguration not used",
-                    self.endpoint.device.ieee,
-                )
-
-        if TEMPERATURE_MEASUREMENT in attributes:
-            self.endpoint.temperature.update_attribute(
-                TemperatureMeasurement.AttributeDefs.measured_value.id,
-                attributes[TEMPERATURE_MEASUREMENT],
-            )
-
-        if HUMIDITY_MEASUREMENT in attributes:
-            self.endpoint.humidity.update_attribute(
-                RelativeHumidity.AttributeDefs.measured_value.id,
-                attributes[HUMIDITY_MEASUREMENT],
-            )
-
-        if PRESSURE_MEASUREMENT in attributes:
-            self.endpoint.pressure.update_attribute(
-                PressureMeasurement.AttributeDefs.measured_value.id,
-                attributes[PRESSURE_MEASUREMENT],
-            )
+        routes = self._aqara_routes
+        if routes is None:
+            routes = self._aqara_routes = self._build_aqara_routes()
 
-        if PRESSURE_MEASUREMENT_PRECISION in attributes:
-            self.endpoint.pressure.update_attribute(
-                PressureMeasurement.AttributeDefs.measured_value.id,
-                attributes[PRESSURE_MEASUREMENT_PRECISION] / 100,
-            )
+        snapshot = self._heartbeat_snapshot
+        refresh_interval = self.heartbeat_refresh_interval
+        now = time.monotonic()
 
-        if POWER in attributes:
-            self.endpoint.electrical_measurement.update_attribute(
-                ElectricalMeasurement.AttributeDefs.active_power.id,
-                round(attributes[POWER] * 10),
-            )
+        for key, attr_value in attributes.items():
+            handlers = routes.get(key)
+            if handlers is None:
+                continue
 
-        if CONSUMPTION in attributes:
-            zcl_consumption = round(attributes[CONSUMPTION] * 1000)
-            self.endpoint.electrical_measurement.update_attribute(
-                ElectricalMeasurement.AttributeDefs.total_active_power.id,
-                zcl_consumption,
-            )
-            self.endpoint.smartenergy_metering.update_attribute(
-                Metering.AttributeDefs.current_summ_delivered.id, zcl_consumption
-            )
+            # heartbeats repeat the same values every hour, only dispatch changes.
+            # Other reports can change the target attributes as well, so a value is
+            # only dropped while the target attributes still hold it
+            previous = snapshot.get(key)
+            if (
+                previous is not None
+                and previous[0] == attr_value
+                and now - previous[1] < refresh_interval
+                and all(
+                    holds_value is not None and holds_value(attr_value)
+                    for _, holds_value in handlers
+                )
+            ):
+                self.heartbeat_updates_dropped += 1
+                continue
 
-        if VOLTAGE in attributes:
-            self.endpoint.electrical_measurement.update_attribute(
-                ElectricalMeasurement.AttributeDefs.rms_voltage.id,
-                attributes[VOLTAGE] * 0.1,
-            )
+            snapshot[key] = (attr_value, now)
+            self.heartbeat_updates_dispatched += 1
+            for handler, _ in handlers:
+                handler(attr_value)
 
-        if ILLUMINANCE_MEASUREMENT in attributes:
-            self.endpoint.illuminance.update_attribute(
-                IlluminanceMeasurement.AttributeDefs.measured_value.id,
-                attributes[ILLUMINANCE_MEASUREMENT],
-            )
+    def _build_aqara_routes(
+        self,
+    ) -> dict[str, tuple[tuple[Callable[[Any], Any], Callable | None], ...]]:
+        """Resolve the target cluster of every parsed attribute the device can use.
+
+        Each handler is paired with a check if its target attribute still holds a
+        value. Methods updating several attributes have none, their values are
+        always dispatched.
+        """
+        routes = {}
+
+        for key, targets in AQARA_ATTRIBUTE_ROUTES.items():
+            handlers = []
+
+            for ep_attribute, target, convert in targets:
+                cluster = getattr(self.endpoint, ep_attribute, None)
+                if cluster is None:
+                    continue
+
+                if isinstance(target, str):
+                    # many Xiaomi devices report the battery voltage, but not all
+                    # quirks implement the XiaomiPowerConfiguration cluster
+                    handler = getattr(cluster, target, None)
+                    if not callable(handler):
+                        if key == BATTERY_VOLTAGE_MV:
+                            _LOGGER.debug(
+                                "%s - Xiaomi battery voltage attribute is ignored, XiaomiPowerConfiguration not used",
+                                self.endpoint.device.ieee,
+                            )
+                        continue
+                    holds_value = None
+                else:
+                    handler = functools.partial(cluster.update_attribute, target)
+                    holds_value = functools.partial(
+                        _holds_value, cluster, target, convert
+                    )
 
-        if TVOC_MEASUREMENT in attributes:
-            self.endpoint.voc_level.update_attribute(
-                0x0000, attributes[TVOC_MEASUREMENT]
-            )
+                if convert is not None:
+                    handler = functools.partial(_convert_and_call, handler, convert)
 
-        if TEMPERATURE in attributes:
-            if hasattr(self.endpoint, "device_temperature"):
-                self.endpoint.device_temperature.update_attribute(
-                    DeviceTemperature.AttributeDefs.current_temperature.id,
-                    attributes[TEMPERATURE] * 100,
-                )
+                handlers.append((handler, holds_value))
 
-        if BATTERY_PERCENTAGE_REMAINING_ATTRIBUTE in attributes:
-            self.endpoint.power.battery_percent_reported(
-                attributes[BATTERY_PERCENTAGE_REMAINING_ATTRIBUTE]
-            )
+            if handlers:
+                routes[key] = tuple(handlers)
 
-        if SMOKE in attributes:
-            self.endpoint.ias_zone.update_attribute(
-                IasZone.AttributeDefs.zone_status.id, attributes[SMOKE]
-            )
+        return routes
 
     def _parse_aqara_attributes(self, value):
         """Parse non-standard attributes."""
         attributes = {}
-        attribute_names = {
-            1: BATTERY_VOLTAGE_MV,
-            3: TEMPERATURE,
-            4: XIAOMI_ATTR_4,
-            5: XIAOMI_ATTR_5,
-            6: XIAOMI_ATTR_6,
-            10: PATH,
-        }
-
-        if self.endpoint.device.model in [
-            "lumi.sensor_ht",
-            "lumi.sens",
-            "lumi.weather",
-            "lumi.airmonitor.acn01",
-            "lumi.sensor_ht.agl02",
-        ]:
-            # Temperature sensors send temperature/humidity/pressure updates through this
-            # cluster instead of the respective clusters
-            attribute_names.update(
-                {
-                    100: TEMPERATURE_MEASUREMENT,
-                    101: HUMIDITY_MEASUREMENT,
-                    102: TVOC_MEASUREMENT
-                    if self.endpoint.device.model == "lumi.airmonitor.acn01"
-                    else PRESSURE_MEASUREMENT_PRECISION
-                    if self.endpoint.device.model == "lumi.weather"
-                    else PRESSURE_MEASUREMENT,
-                }
-            )
-        elif self.endpoint.device.model in [
-            "lumi.plug",
-            "lumi.plug.maus01",
-            "lumi.plug.maeu01",
-            "lumi.plug.mmeu01",
-            "lumi.relay.c2acn01",
-            "lumi.switch.n0agl1",
-            "lumi.switch.n0acn2",
-        ]:
-            attribute_names.update({149: CONSUMPTION, 150: VOLTAGE, 152: POWER})
-        elif self.endpoint.device.model == "lumi.sensor_motion.aq2":
-            attribute_names.update({11: ILLUMINANCE_MEASUREMENT})
-        elif self.endpoint.device.model == "lumi.curtain.acn002":
-            attribute_names.update({101: BATTERY_PERCENTAGE_REMAINING_ATTRIBUTE})
-        elif self.endpoint.device.model in [
-            "lumi.motion.agl02",
-            "lumi.motion.ac02",
-            "lumi.motion.acn001",
-        ]:
-            attribute_names.update({101: ILLUMINANCE_MEASUREMENT})
-            if self.endpoint.device.model == "lumi.motion.ac02":
-                attribute_names.update({105: DETECTION_INTERVAL})
-                attribute_names.update({106: MOTION_SENSITIVITY})
-        elif self.endpoint.device.model == "lumi.motion.agl04":
-            attribute_names.update({102: DETECTION_INTERVAL})
-            attribute_names.update({105: MOTION_SENSITIVITY})
-            attribute_names.update({258: DETECTION_INTERVAL})
-            attribute_names.update({268: MOTION_SENSITIVITY})
-        elif self.endpoint.device.model == "lumi.motion.ac01":
-            attribute_names.update({5: POWER_OUTAGE_COUNT})
-            attribute_names.update({101: PRESENCE_DETECTED})
-            attribute_names.update({102: PRESENCE_EVENT})
-            attribute_names.update({103: MONITORING_MODE})
-            attribute_names.update({105: APPROACH_DISTANCE})
-            attribute_names.update({268: MOTION_SENSITIVITY})
-            attribute_names.update({322: PRESENCE_DETECTED})
-            attribute_names.update({323: PRESENCE_EVENT})
-            attribute_names.update({324: MONITORING_MODE})
-            attribute_names.update({326: APPROACH_DISTANCE})
-        elif self.endpoint.device.model == "lumi.sensor_smoke.acn03":
-            attribute_names.update({160: SMOKE})
-            attribute_names.update({161: SMOKE_DENSITY})
-            attribute_names.update({162: SELF_TEST})
-            attribute_names.update({163: BUZZER_MANUAL_MUTE})
-            attribute_names.update({164: HEARTBEAT_INDICATOR})
-            attribute_names.update({165: LINKAGE_ALARM})
-        result = {}
+        attribute_names = self._aqara_attribute_names
 
         # Some attribute reports end with a stray null byte
         while value not in (b"", b"\x00"):
-            skey = int(value[0])
+            skey = value[0]
             svalue, value = foundation.TypeValue.deserialize(value[1:])
-            result[skey] = svalue.value
-        for item, val in result.items():
-            key = (
-                attribute_names[item]
-                if item in attribute_names
-                else "0xff01-" + str(item)
-            )
-            attributes[key] = val
+            try:
+                key = attribute_names[skey]
+            except KeyError:
+                key = attribute_names[skey] = f"0xff01-{skey}"
+            attributes[key] = svalue.value
 
         return attributes
 
@@ -733,6 +888,30 @@ class OnOffCluster(OnOff, CustomCluster):
         )
 
 
+# model -> (registry state, quick init quirks)
+_QUICK_INIT_QUIRKS: dict[
+    str, tuple[tuple[int, type | None], tuple[type[XiaomiQuickInitDevice], ...]]
+] = {}
+
+
+def _get_quick_init_quirks(model: str) -> tuple[type[XiaomiQuickInitDevice], ...]:
+    """Return the quick init quirks of a model, cached until its quirk list changes."""
+    quirks = zigpy.quirks.get_quirk_list(LUMI, model)
+
+    # Quirks are added to the front of the list, so its length and first entry
+    # change with every registration and removal
+    state = (len(quirks), quirks[0] if quirks else None)
+    cached = _QUICK_INIT_QUIRKS.get(model)
+    if cached is not None and cached[0] == state:
+        return cached[1]
+
+    quick_init_quirks = tuple(
+        quirk for quirk in quirks if issubclass(quirk, XiaomiQuickInitDevice)
+    )
+    _QUICK_INIT_QUIRKS[model] = (state, quick_init_quirks)
+    return quick_init_quirks
+
+
 def handle_quick_init(
     sender: zigpy.device.Device,
     profile: int,
@@ -742,7 +921,9 @@ def handle_quick_init(
     message: bytes,
 ) -> bool | None:
     """Handle message from an uninitialized device which could be a xiaomi."""
-    if src_ep == 0:
+    # Only the model reported by the Basic cluster is of interest, so other traffic of
+    # joining devices is dropped before anything is deserialized
+    if src_ep == 0 or cluster != Basic.cluster_id or not _is_attr_report(message):
         return
 
     hdr, data = foundation.ZCLHeader.deserialize(message)
@@ -754,12 +935,6 @@ def handle_quick_init(
         hdr,
         data,
     )
-    if hdr.frame_control.is_cluster:
-        return
-
-    if hdr.command_id not in foundation.COMMANDS:
-        sender.debug("Unknown ZCL global command: %s", hdr.command_id)
-        return
 
     try:
         params, data = foundation.COMMANDS[hdr.command_id].schema.deserialize(data)
@@ -769,12 +944,6 @@ def handle_quick_init(
 
     sender.debug("Uninitialized device command '%s' params: %s", hdr.command_id, params)
 
-    if (
-        hdr.command_id != foundation.GeneralCommand.Report_Attributes
-        or cluster != 0x0000
-    ):
-        return
-
     for attr_rec in params.attribute_reports:
         # model_name
         if attr_rec.attrid == 0x0005:
@@ -787,10 +956,7 @@ def handle_quick_init(
     if not model:
         return
 
-    for quirk in zigpy.quirks.get_quirk_list(LUMI, model):
-        if not issubclass(quirk, XiaomiQuickInitDevice):
-            continue
-
+    for quirk in _get_quick_init_quirks(model):
         sender.debug("Found '%s' quirk for '%s' model", quirk.__name__, model)
 
         try:
@@ -29,6 +29,7 @@ from zhaquirks.const import (
     PROFILE_ID,
 )
 from zhaquirks.xiaomi import XiaomiAqaraE1Cluster, XiaomiCustomDevice
+from zhaquirks.xiaomi.codec import Layout
 
 # 32 bit signed integer values that are encoded in FEEDER_ATTR = 0xFFF1
 FEEDING = 0x04150055
@@ -79,6 +80,21 @@ ZCL_TO_AQARA: dict[int, int] = {
     ZCL_ERROR_DETECTED: ERROR_DETECTED,
 }
 
+# FEEDER_ATTR payload: header, attribute and the length of the value that follows
+FEEDER_HEADER = Layout(
+    "FeederHeader",
+    (("prefix", "H"), ("sequence", "B"), ("attribute", "i"), ("length", "B")),
+)
+FEEDER_COMMAND = Layout(
+    "FeederCommand", (("prefix", "H"), ("sequence", "B"), ("attribute", "i"))
+)
+FEEDER_VALUES = {
+    1: Layout("FeederValue8", (("value", "B"),)),
+    2: Layout("FeederValue16", (("value", "H"),)),
+    4: Layout("FeederValue32", (("value", "I"),)),
+}
+FEEDER_COMMAND_PREFIX = 0x0002
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -145,11 +161,12 @@ class OppleCluster(XiaomiAqaraE1Cluster):
 
     def _parse_feeder_attribute(self, value: bytes) -> None:
         """Parse the feeder attribute."""
-        attribute, _ = types.int32s_be.deserialize(value[3:7])
+        header = FEEDER_HEADER.parse(value)
+        attribute = header.attribute
         LOGGER.debug("OppleCluster._parse_feeder_attribute: attribute: %s", attribute)
-        length, _ = types.uint8_t.deserialize(value[7:8])
+        length = header.length
         LOGGER.debug("OppleCluster._parse_feeder_attribute: length: %s", length)
-        attribute_value = value[8 : (length + 8)]
+        attribute_value = value[FEEDER_HEADER.size : FEEDER_HEADER.size + length]
         LOGGER.debug("OppleCluster._parse_feeder_attribute: value: %s", attribute_value)
 
         if attribute in AQARA_TO_ZCL:
@@ -163,10 +180,10 @@ class OppleCluster(XiaomiAqaraE1Cluster):
             )
             self._update_attribute(ZCL_LAST_FEEDING_SIZE, int(feeding_size, base=16))
         elif attribute == PORTIONS_DISPENSED:
-            portions_per_day, _ = types.uint16_t_be.deserialize(attribute_value)
+            portions_per_day = FEEDER_VALUES[2].parse(attribute_value).value
             self._update_attribute(ZCL_PORTIONS_DISPENSED, portions_per_day)
         elif attribute == WEIGHT_DISPENSED:
-            weight_per_day, _ = types.uint32_t_be.deserialize(attribute_value)
+            weight_per_day = FEEDER_VALUES[4].parse(attribute_value).value
             self._update_attribute(ZCL_WEIGHT_DISPENSED, weight_per_day)
         elif attribute == SCHEDULING_STRING:
             LOGGER.debug(
@@ -192,18 +209,17 @@ class OppleCluster(XiaomiAqaraE1Cluster):
             length,
         )
         self._send_sequence = ((self._send_sequence or 0) + 1) % 256
-        val = bytes([0x00, 0x02, self._send_sequence])
+        sequence = self._send_sequence
         self._send_sequence += 1
-        val += types.int32s_be(attribute_id).serialize()
         if length is not None and value is not None:
-            val += types.uint8_t(length).serialize()
+            val = FEEDER_HEADER.build(
+                FEEDER_COMMAND_PREFIX, sequence, attribute_id, length
+            )
+        else:
+            val = FEEDER_COMMAND.build(FEEDER_COMMAND_PREFIX, sequence, attribute_id)
         if value is not None:
-            if length == 1:
-                val += types.uint8_t(value).serialize()
-            elif length == 2:
-                val += types.uint16_t_be(value).serialize()
-            elif length == 4:
-                val += types.uint32_t_be(value).serialize()
+            if length in FEEDER_VALUES:
+                val += FEEDER_VALUES[length].build(value)
             else:
                 val += value
         LOGGER.debug(
@@ -27,6 +27,7 @@ from zhaquirks.const import (
     OUTPUT_CLUSTERS,
     PROFILE_ID,
 )
+from zhaquirks.tasks import DeviceTaskMixin
 from zhaquirks.xiaomi import (
     LUMI,
     AnalogInputCluster,
@@ -54,7 +55,7 @@ async def remove_from_ep(dev: zigpy.device.Device) -> None:
         dev.debug("Removed endpoint 1 from group 0")
 
 
-class OppleCluster(XiaomiAqaraE1Cluster):
+class OppleCluster(DeviceTaskMixin, XiaomiAqaraE1Cluster):
     """Opple cluster."""
 
     attributes = {
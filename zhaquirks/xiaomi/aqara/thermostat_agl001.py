@@ -4,7 +4,6 @@ from __future__ import annotations
 
 from functools import reduce
 import math
-import struct
 from typing import Any
 
 from zigpy.profiles import zha
@@ -27,6 +26,7 @@ from zhaquirks.xiaomi import (
     XiaomiCustomDevice,
     XiaomiPowerConfiguration,
 )
+from zhaquirks.xiaomi.codec import Layout
 
 ZCL_SYSTEM_MODE = Thermostat.attributes_by_name["system_mode"].id
 
@@ -61,6 +61,14 @@ DAYS_MAP = {
     "sun": 0x80,
 }
 NEXT_DAY_FLAG = 1 << 15
+SCHEDULE_SETTINGS_MAGIC = 0x04
+
+SCHEDULE_SETTINGS_HEADER = Layout(
+    "ScheduleSettingsHeader", (("magic", "B"), ("day_selection", "B"))
+)
+SCHEDULE_EVENT = Layout(
+    "ScheduleEventRecord", (("time", "H"), ("reserved", "H"), ("temperature", "H"))
+)
 
 
 class ThermostatCluster(CustomCluster, Thermostat):
@@ -145,11 +153,14 @@ class ScheduleEvent:
     _is_next_day = False
 
     def __init__(self, value, is_next_day=False):
-        """Create ScheduleEvent object from bytes or string."""
+        """Create ScheduleEvent object from bytes, a parsed record or string."""
         if isinstance(value, bytes):
             self._verify_buffer_len(value)
-            self._time = self._read_time_from_buf(value)
-            self._temp = self._read_temp_from_buf(value)
+            value = SCHEDULE_EVENT.parse(value)
+
+        if isinstance(value, SCHEDULE_EVENT.record):
+            self._time = value.time & ~NEXT_DAY_FLAG
+            self._temp = value.temperature / 100
             self._validate_time(self._time)
             self._validate_temp(self._temp)
         elif isinstance(value, str):
@@ -168,14 +179,8 @@ class ScheduleEvent:
 
     @staticmethod
     def _verify_buffer_len(buf):
-        if len(buf) != 6:
-            raise ValueError("Buffer size must equal 6")
-
-    @staticmethod
-    def _read_time_from_buf(buf):
-        time = struct.unpack_from(">H", buf, offset=0)[0]
-        time &= ~NEXT_DAY_FLAG
-        return time
+        if len(buf) != SCHEDULE_EVENT.size:
+            raise ValueError(f"Buffer size must equal {SCHEDULE_EVENT.size}")
 
     @staticmethod
     def _parse_time(string):
@@ -188,10 +193,6 @@ class ScheduleEvent:
 
         return hours * 60 + minutes
 
-    @staticmethod
-    def _read_temp_from_buf(buf):
-        return struct.unpack_from(">H", buf, offset=4)[0] / 100
-
     @staticmethod
     def _parse_temp(string):
         return float(string)
@@ -212,15 +213,6 @@ class ScheduleEvent:
         if (temp * 10) % 5 != 0:
             raise ValueError("Temperature must be whole or half degrees")
 
-    def _write_time_to_buf(self, buf):
-        time = self._time
-        if self._is_next_day:
-            time |= NEXT_DAY_FLAG
-        struct.pack_into(">H", buf, 0, time)
-
-    def _write_temp_to_buf(self, buf):
-        struct.pack_into(">H", buf, 4, int(self._temp * 100))
-
     def is_next_day(self):
         """Return if event is on the next day."""
         return self._is_next_day
@@ -239,10 +231,10 @@ class ScheduleEvent:
 
     def serialize(self):
         """Serialize event to bytes."""
-        result = bytearray(6)
-        self._write_time_to_buf(result)
-        self._write_temp_to_buf(result)
-        return result
+        time = self._time
+        if self._is_next_day:
+            time |= NEXT_DAY_FLAG
+        return SCHEDULE_EVENT.build(time, 0, int(self._temp * 100))
 
 
 class ScheduleSettings(t.LVBytes):
@@ -274,20 +266,22 @@ class ScheduleSettings(t.LVBytes):
                 events[i].set_next_day(True)
         ScheduleSettings._verify_event_durations(events)
 
-        result = bytearray(b"\x04")
-        result.append(ScheduleSettings._get_day_selection_byte(day_selection))
-        for e in events:
-            result.extend(e.serialize())
-        return super().__new__(cls, bytes(result))
+        result = SCHEDULE_SETTINGS_HEADER.build(
+            SCHEDULE_SETTINGS_MAGIC,
+            ScheduleSettings._get_day_selection_byte(day_selection),
+        )
+        result += b"".join(e.serialize() for e in events)
+        return super().__new__(cls, result)
 
     @staticmethod
     def _verify_buffer_len(buf):
-        if len(buf) != 26:
-            raise ValueError("Buffer size must equal 26")
+        size = SCHEDULE_SETTINGS_HEADER.size + 4 * SCHEDULE_EVENT.size
+        if len(buf) != size:
+            raise ValueError(f"Buffer size must equal {size}")
 
     @staticmethod
     def _verify_magic_byte(buf):
-        if struct.unpack_from("c", buf, offset=0)[0][0] != 0x04:
+        if SCHEDULE_SETTINGS_HEADER.parse(buf).magic != SCHEDULE_SETTINGS_MAGIC:
             raise ValueError("Magic byte must be equal to 0x04")
 
     @staticmethod
@@ -313,7 +307,7 @@ class ScheduleSettings(t.LVBytes):
     def _read_day_selection(value):
         day_selection = []
         if isinstance(value, bytes):
-            byte = struct.unpack_from("c", value, offset=1)[0][0]
+            byte = SCHEDULE_SETTINGS_HEADER.parse(value).day_selection
             if byte & 0x01:
                 raise ValueError("Incorrect day selected")
             for i, v in DAYS_MAP.items():
@@ -328,8 +322,8 @@ class ScheduleSettings(t.LVBytes):
     @staticmethod
     def _read_event(value, index):
         if isinstance(value, bytes):
-            event_buf = value[2 + index * 6 : 8 + index * 6]
-            return ScheduleEvent(event_buf)
+            offset = SCHEDULE_SETTINGS_HEADER.size + index * SCHEDULE_EVENT.size
+            return ScheduleEvent(SCHEDULE_EVENT.parse(value, offset))
         elif isinstance(value, str):
             return ScheduleEvent(value)
 
@@ -1,10 +1,7 @@
 """Xiaomi aqara smart motion sensor device."""
 
-import math
-
 from zigpy import types
 from zigpy.profiles import zha
-from zigpy.quirks import CustomCluster
 from zigpy.zcl.clusters.closures import DoorLock
 from zigpy.zcl.clusters.general import (
     Basic,
@@ -17,6 +14,7 @@ from zigpy.zcl.clusters.general import (
 from zigpy.zcl.clusters.security import IasZone
 
 from zhaquirks import Bus, LocalDataCluster, MotionOnEvent
+from zhaquirks.accelerometer import AccelerometerStreamCluster, tilt_angles
 from zhaquirks.const import (
     CLUSTER_ID,
     COMMAND,
@@ -83,16 +81,23 @@ class VibrationAQ1(XiaomiQuickInitDevice):
         attributes = BasicCluster.attributes.copy()
         attributes[0xFF0D] = ("sensitivity", types.uint8_t, True)
 
-    class MultistateInputCluster(CustomCluster, MultistateInput):
+    class MultistateInputCluster(AccelerometerStreamCluster, MultistateInput):
         """Multistate input cluster."""
 
         cluster_id = DoorLock.cluster_id
+        stream_event = "current_orientation"
 
         def __init__(self, *args, **kwargs):
             """Init."""
             self._current_state = {}
             super().__init__(*args, **kwargs)
 
+        def send_stream_summary(self, summary):
+            """Send a summary of the buffered orientation reports."""
+            self.endpoint.device.motion_bus.listener_event(
+                SEND_EVENT, self.stream_event, summary
+            )
+
         def _update_attribute(self, attrid, value):
             super()._update_attribute(attrid, value)
             if attrid == STATUS_TYPE_ATTR:
@@ -109,12 +114,11 @@ class VibrationAQ1(XiaomiQuickInitDevice):
                 x = value & 0xFFFF
                 y = (value >> 16) & 0xFFFF
                 z = (value >> 32) & 0xFFFF
-                X = 0.0 + x
-                Y = 0.0 + y
-                Z = 0.0 + z
-                angleX = round(math.atan(X / math.sqrt(Z * Z + Y * Y)) * 180 / math.pi)
-                angleY = round(math.atan(Y / math.sqrt(X * X + Z * Z)) * 180 / math.pi)
-                angleZ = round(math.atan(Z / math.sqrt(X * X + Y * Y)) * 180 / math.pi)
+                if self.stream is not None:
+                    self.stream.append(x, y, z)
+                    return
+
+                ((angleX, angleY, angleZ),) = tilt_angles([(x, y, z)])
 
                 self.endpoint.device.motion_bus.listener_event(
                     SEND_EVENT,
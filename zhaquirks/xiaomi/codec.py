@@ -0,0 +1,47 @@
+"""Binary layouts of the payloads of Aqara opple-cluster attributes."""
+
+from __future__ import annotations
+
+from collections import namedtuple
+from collections.abc import Callable, Sequence
+import struct
+from typing import Any
+
+
+class Layout:
+    """Fixed binary layout compiled to struct based parse and build functions.
+
+    Fields are declared as (name, struct format) pairs. Parsing returns a named
+    tuple of the field values and works on bytes as well as memoryviews, so a
+    payload can be parsed at an offset without slicing it first.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fields: Sequence[tuple[str, str]],
+        *,
+        byte_order: str = ">",
+    ) -> None:
+        """Init."""
+        compiled = struct.Struct(byte_order + "".join(fmt for _, fmt in fields))
+
+        self.name = name
+        self.size: int = compiled.size
+        self.record: type[tuple] = namedtuple(name, [field for field, _ in fields])
+        self.build: Callable[..., bytes] = compiled.pack
+        self._unpack_from = compiled.unpack_from
+        self._make = self.record._make
+
+    def parse(self, data: bytes | memoryview, offset: int = 0) -> Any:
+        """Parse the layout at `offset` of the data."""
+        try:
+            return self._make(self._unpack_from(data, offset))
+        except struct.error as exc:
+            raise ValueError(
+                f"{self.name} needs {self.size} bytes at offset {offset}: {bytes(data)!r}"
+            ) from exc
+
+    def __repr__(self) -> str:
+        """Return the layout name and its fields."""
+        return f"<Layout {self.name} {self.record._fields}>"